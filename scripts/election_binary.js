@@ -0,0 +1,106 @@
+// Decoder for data/mn_county_elections.bin (written by tools/election_binary.py).
+// Every array in the file is 4-byte aligned and little-endian, so on
+// little-endian hosts the per-county columns are typed-array views straight
+// onto the fetched buffer, with no parsing or copying.
+
+const ELECTION_BINARY_MAGIC = 'MNEB';
+const ELECTION_BINARY_VERSION = 1;
+
+// Same order as COLUMNS in tools/election_binary.py
+const ELECTION_BINARY_COLUMNS = [
+    ['dem_votes', Int32Array],
+    ['rep_votes', Int32Array],
+    ['other_votes', Int32Array],
+    ['total_votes', Int32Array],
+    ['margin_pct', Float32Array],   // signed, positive = Republican lead
+    ['rating', Int32Array],         // tier rating, 0 = no result
+    ['dem_candidates', Int32Array], // string indexes, -1 = no result
+    ['rep_candidates', Int32Array]
+];
+
+const ELECTION_BINARY_CONTEST_FIELDS = 7;
+
+const HOST_IS_LITTLE_ENDIAN = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+
+function electionBinaryArray(buffer, view, Type, offset, length) {
+    if (HOST_IS_LITTLE_ENDIAN) {
+        return new Type(buffer, offset, length);
+    }
+    // Big-endian hosts get a byte-swapped copy
+    const out = new Type(length);
+    for (let i = 0; i < length; i++) {
+        out[i] = Type === Float32Array
+            ? view.getFloat32(offset + 4 * i, true)
+            : view.getInt32(offset + 4 * i, true);
+    }
+    return out;
+}
+
+function decodeElectionBinary(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    const version = view.getUint16(4, true);
+    const columns = view.getUint16(6, true);
+    if (magic !== ELECTION_BINARY_MAGIC || version !== ELECTION_BINARY_VERSION
+        || columns !== ELECTION_BINARY_COLUMNS.length) {
+        throw new Error(`Not a version ${ELECTION_BINARY_VERSION} election results file`);
+    }
+
+    const featureCount = view.getUint32(8, true);
+    const contestCount = view.getUint32(12, true);
+    const stringsOffset = view.getUint32(16, true);
+    const contestsOffset = view.getUint32(20, true);
+    const featuresOffset = view.getUint32(24, true);
+    if (view.getUint32(28, true) !== buffer.byteLength) {
+        throw new Error('Election results file is truncated');
+    }
+
+    // String table: count, byte offsets[count + 1], UTF-8 text
+    const stringCount = view.getUint32(stringsOffset, true);
+    const textStart = stringsOffset + 4 + 4 * (stringCount + 1);
+    const utf8 = new TextDecoder('utf-8');
+    const strings = new Array(stringCount);
+    for (let i = 0; i < stringCount; i++) {
+        const start = view.getUint32(stringsOffset + 4 + 4 * i, true);
+        const end = view.getUint32(stringsOffset + 8 + 4 * i, true);
+        strings[i] = utf8.decode(new Uint8Array(buffer, textStart + start, end - start));
+    }
+    const label = index => (index >= 0 ? strings[index] : null);
+
+    const featureIds = electionBinaryArray(buffer, view, Int32Array, featuresOffset, featureCount);
+    const nameIndexes = electionBinaryArray(buffer, view, Int32Array, featuresOffset + 4 * featureCount, featureCount);
+    const featureNames = Array.from(nameIndexes, label);
+
+    const contests = [];
+    for (let c = 0; c < contestCount; c++) {
+        const row = contestsOffset + 4 * ELECTION_BINARY_CONTEST_FIELDS * c;
+        const field = k => view.getInt32(row + 4 * k, true);
+        const contest = {
+            year: field(0),
+            office: label(field(1)),
+            contest_id: label(field(2)),
+            contest_name: label(field(3)),
+            dem_candidate: label(field(5)),
+            rep_candidate: label(field(6))
+        };
+        const dataOffset = field(4);
+        ELECTION_BINARY_COLUMNS.forEach(([name, Type], k) => {
+            contest[name] = electionBinaryArray(buffer, view, Type, dataOffset + 4 * featureCount * k, featureCount);
+        });
+        contests.push(contest);
+    }
+
+    return { strings, featureIds, featureNames, contests };
+}
+
+async function loadElectionBinary(path) {
+    const response = await fetch(path);
+    if (!response.ok) {
+        throw new Error(`Failed to load ${path}: ${response.status}`);
+    }
+    return decodeElectionBinary(await response.arrayBuffer());
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = { decodeElectionBinary, loadElectionBinary, ELECTION_BINARY_COLUMNS };
+}
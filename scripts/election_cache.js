@@ -0,0 +1,102 @@
+// Cached election data with patch updates (manifest written by tools/publish_delta.py).
+// The last downloaded build is kept in IndexedDB with its version. On load the
+// manifest is checked: a current cache is used as-is, an older one is brought
+// up to date by applying the patch chain, and only a cache that is missing or
+// too old for the chain downloads the full file.
+
+const ELECTION_CACHE_DB = 'mn-realignment';
+const ELECTION_CACHE_STORE = 'election-data';
+
+function openElectionCache() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(ELECTION_CACHE_DB, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(ELECTION_CACHE_STORE);
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function electionCacheRequest(mode, action) {
+    const db = await openElectionCache();
+    return new Promise((resolve, reject) => {
+        const request = action(db.transaction(ELECTION_CACHE_STORE, mode).objectStore(ELECTION_CACHE_STORE));
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+// Same steps as apply_patch in tools/publish_delta.py
+function applyElectionPatch(doc, patch) {
+    patch.ops.forEach(op => {
+        const parents = op.path.slice(0, -1);
+        const key = op.path[op.path.length - 1];
+        let node = doc;
+        parents.forEach(parent => {
+            if (typeof node[parent] !== 'object' || node[parent] === null) node[parent] = {};
+            node = node[parent];
+        });
+        if (op.op === 'delete') {
+            delete node[key];
+        } else {
+            node[key] = op.value;
+        }
+    });
+    return doc;
+}
+
+async function fetchElectionJSON(url) {
+    const response = await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`${url} fetch failed: ${response.status}`);
+    return response.json();
+}
+
+// Resolve the election document for a manifest, using and refreshing the cache
+async function loadCachedElectionData(manifestPath, key = 'aggregated') {
+    const base = manifestPath.slice(0, manifestPath.lastIndexOf('/') + 1);
+    const manifest = await fetchElectionJSON(manifestPath);
+
+    let cached = null;
+    try {
+        cached = await electionCacheRequest('readonly', store => store.get(key));
+    } catch (e) {
+        console.warn('Election cache unavailable:', e.message);
+    }
+    if (cached && cached.version === manifest.version) {
+        console.log('Election data from cache:', manifest.version);
+        return cached.data;
+    }
+
+    let data = null;
+    if (cached) {
+        // Follow the patch chain from the cached version
+        let version = cached.version;
+        let doc = cached.data;
+        const applied = new Set();
+        try {
+            while (version !== manifest.version && manifest.patches[version]) {
+                // A manifest whose chain loops back would otherwise be followed forever
+                if (applied.has(version)) throw new Error(`patch chain loops back to ${version}`);
+                applied.add(version);
+                const step = manifest.patches[version];
+                const patch = await fetchElectionJSON(base + step.file);
+                if (patch.from !== version) throw new Error(`patch ${step.file} does not start at ${version}`);
+                doc = applyElectionPatch(doc, patch);
+                version = patch.to;
+                console.log(`Applied election patch ${patch.from} -> ${patch.to} (${step.size} bytes)`);
+            }
+            if (version === manifest.version) data = doc;
+        } catch (e) {
+            console.warn('Election patch failed, downloading full data:', e.message);
+        }
+    }
+    if (!data) {
+        data = await fetchElectionJSON(base + manifest.file);
+    }
+
+    try {
+        await electionCacheRequest('readwrite', store => store.put({ version: manifest.version, data }, key));
+    } catch (e) {
+        console.warn('Could not cache election data:', e.message);
+    }
+    return data;
+}
@@ -0,0 +1,43 @@
+"""District contests: each vote column reaches the precinct tally once, and partitions add up"""
+
+from collections import defaultdict
+
+import pytest
+
+from convert_outliers import COLUMNS_2010, PRECINCT_SPECS
+from county_lookup import resolve_county
+from create_county_election_json import add_party_votes, check_district_totals, new_entry
+from tally import tally_columns
+from vote_parsing import ParseLedger
+
+# 2010 precinct rows: State Senate is both a county column and a district contest
+ROWS_2010 = [
+    {'County': 'Aitkin', 'Precinct Code': '0005', 'Precinct Name': 'Aitkin', 'CG': '8', 'LEG': '10B',
+     'MNSENR': '300', 'MNSENDFL': '200', 'MNSENIP': '10', 'MNSENWI': '1', 'GOVR': '250', 'GOVDFL': '240'},
+    {'County': 'Anoka', 'Precinct Code': '0010', 'Precinct Name': 'Andover P-1', 'CG': '6', 'LEG': '49A',
+     'MNSENR': '700', 'MNSENDFL': '650', 'MNSENIP': '30', 'MNSENWI': '2', 'GOVR': '690', 'GOVDFL': '600'},
+]
+
+
+def test_2010_state_senate_is_read_once():
+    tally = tally_columns(ROWS_2010, lambda row: resolve_county(row['County']), COLUMNS_2010,
+                          ParseLedger().parser('2010'), PRECINCT_SPECS[2010])
+    senate = tally.precincts.columns()['offices']['State Senate']
+    assert {party: int(votes.sum()) for party, votes in senate.items()} == {
+        'R': 1000, 'DFL': 850, 'IND': 40, 'WI': 3}
+
+
+def test_district_totals_match_county_totals():
+    districts = defaultdict(lambda: defaultdict(new_entry))
+    add_party_votes(districts['State Senate']['10'], 'R', 'A', 300)
+    add_party_votes(districts['State Senate']['49'], 'R', 'B', 700)
+    add_party_votes(districts['State Senate']['49'], 'WI', '', 2)
+    assert check_district_totals(2010, districts, {'State Senate': {'R': 1000}}) == []
+
+
+@pytest.mark.parametrize('county_total', [2000, 500])
+def test_district_totals_flag_a_mismatch(county_total):
+    districts = defaultdict(lambda: defaultdict(new_entry))
+    add_party_votes(districts['State Senate']['10'], 'R', 'A', 1000)
+    problems = check_district_totals(2010, districts, {'State Senate': {'R': county_total}})
+    assert problems == [f"2010 State Senate R: districts total 1,000, county CSV {county_total:,}"]
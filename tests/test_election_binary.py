@@ -0,0 +1,134 @@
+"""Round trip of the binary results container against the JSON it is written from"""
+
+from county_lookup import COUNTIES
+from election_binary import ElectionBinaryWriter, read_binary
+from tiers import COLORBLIND_COLORS, COMPETITIVENESS_TIERS, NO_RESULT_COLOR, PALETTES, get_competitiveness
+
+# Republican-minus-DFL margins reaching every tier, strongest Republican first, plus a tie
+MARGINS = [45, 35, 25, 15, 7, 3, 0.7, 0, -0.8, -3, -7, -15, -25, -35, -45]
+
+
+def county_result(contest_name, year, margin, dem_candidate, rep_candidate, other_votes=123):
+    """A county result as create_county_election_json.py writes it, from 10,000 two-party votes"""
+    rep_votes = 5000 + int(margin * 50)
+    dem_votes = 10000 - rep_votes
+    return {
+        'contest': contest_name,
+        'year': str(year),
+        'dem_candidate': dem_candidate,
+        'rep_candidate': rep_candidate,
+        'dem_votes': dem_votes,
+        'rep_votes': rep_votes,
+        'other_votes': other_votes,
+        'total_votes': dem_votes + rep_votes + other_votes,
+        'two_party_total': dem_votes + rep_votes,
+        'margin': abs(rep_votes - dem_votes),
+        'margin_pct': abs(margin),
+        'winner': 'REP' if margin > 0 else 'DEM' if margin < 0 else 'TIE',
+        'competitiveness': get_competitiveness(margin),
+    }
+
+
+def source_document():
+    """Two years of contests; every tier appears, and the last counties have no result"""
+    results_by_year = {}
+    for year, office, contest_name, dem, rep in [
+        (2020, 'president', 'President of the United States', 'Joseph R. Biden', 'Donald J. Trump'),
+        (2020, 'us_senate', 'United States Senator', 'Tina Smith', 'Jason Lewis'),
+        (2022, 'governor', 'Governor', 'Tim Walz', 'Scott Jensen'),
+    ]:
+        contest_id = f"{office}_{year}"
+        results = {}
+        for i, county in enumerate(COUNTIES[:80]):
+            margin = MARGINS[i % len(MARGINS)] * (1 if year == 2020 else -1)
+            # A write-in heavy county names a different candidate than the rest
+            candidate = f"{dem} Jr." if i == 3 else dem
+            results[county.name] = county_result(contest_name, year, margin, candidate, rep, other_votes=i)
+        results_by_year.setdefault(str(year), {}).setdefault(office, {})[contest_id] = {
+            'contest_name': contest_name, 'results': results}
+    return {'results_by_year': results_by_year}
+
+
+def decoded_document(decoded):
+    """Rebuild results_by_year from a decoded container"""
+    strings = decoded['strings']
+    results_by_year = {}
+    for contest in decoded['contests']:
+        results = {}
+        for i, name in enumerate(decoded['feature_names']):
+            rating = int(contest['rating'][i])
+            if rating == 0:
+                continue
+            margin = float(contest['margin_pct'][i])
+            dem_votes, rep_votes = int(contest['dem_votes'][i]), int(contest['rep_votes'][i])
+            _, _, _, category, party, code, color = COMPETITIVENESS_TIERS[rating - 1]
+            results[name] = {
+                'contest': contest['contest_name'],
+                'year': str(contest['year']),
+                'dem_candidate': strings[contest['dem_candidates'][i]],
+                'rep_candidate': strings[contest['rep_candidates'][i]],
+                'dem_votes': dem_votes,
+                'rep_votes': rep_votes,
+                'other_votes': int(contest['other_votes'][i]),
+                'total_votes': int(contest['total_votes'][i]),
+                'two_party_total': dem_votes + rep_votes,
+                'margin': abs(rep_votes - dem_votes),
+                'margin_pct': round(abs(margin), 2),
+                'winner': 'REP' if margin > 0 else 'DEM' if margin < 0 else 'TIE',
+                'competitiveness': {'category': category, 'party': party, 'code': code, 'color': color},
+            }
+        year = results_by_year.setdefault(str(contest['year']), {})
+        year.setdefault(contest['office'], {})[contest['contest_id']] = {
+            'contest_name': contest['contest_name'], 'results': results}
+    return {'results_by_year': results_by_year}
+
+
+def write_source(tmp_path):
+    doc = source_document()
+    path = str(tmp_path / 'mn_county_elections.bin')
+    writer = ElectionBinaryWriter(path)
+    for year, block in doc['results_by_year'].items():
+        writer.add_year(year, block)
+    writer.close()
+    return doc, read_binary(path)
+
+
+def test_round_trip_equals_source(tmp_path):
+    doc, decoded = write_source(tmp_path)
+    assert decoded_document(decoded) == doc
+
+
+def test_every_tier_round_trips(tmp_path):
+    doc, decoded = write_source(tmp_path)
+    codes = {result['competitiveness']['code']
+             for offices in doc['results_by_year'].values() for contests in offices.values()
+             for contest in contests.values() for result in contest['results'].values()}
+    assert codes == {tier[5] for tier in COMPETITIVENESS_TIERS}
+    ratings = {int(rating) for contest in decoded['contests'] for rating in contest['rating']}
+    assert ratings == set(range(len(COMPETITIVENESS_TIERS) + 1))
+
+
+def test_palette_by_rating(tmp_path):
+    doc, decoded = write_source(tmp_path)
+    contest = decoded['contests'][0]
+    results = doc['results_by_year']['2020']['president']['president_2020']['results']
+    for i, name in enumerate(decoded['feature_names']):
+        rating = int(contest['rating'][i])
+        if name not in results:
+            assert rating == 0
+            assert PALETTES['standard'][rating] == PALETTES['colorblind'][rating] == NO_RESULT_COLOR
+            continue
+        competitiveness = results[name]['competitiveness']
+        assert PALETTES['standard'][rating] == competitiveness['color']
+        assert PALETTES['colorblind'][rating] == COLORBLIND_COLORS[competitiveness['code']]
+
+
+def test_contest_table(tmp_path):
+    _, decoded = write_source(tmp_path)
+    assert [(c['year'], c['office'], c['contest_id']) for c in decoded['contests']] == [
+        (2020, 'president', 'president_2020'), (2020, 'us_senate', 'us_senate_2020'),
+        (2022, 'governor', 'governor_2022')]
+    president = decoded['contests'][0]
+    # The contest-level candidate is the one most counties name
+    assert (president['dem_candidate'], president['rep_candidate']) == ('Joseph R. Biden', 'Donald J. Trump')
+    assert list(decoded['feature_names']) == [county.name for county in COUNTIES]
@@ -0,0 +1,215 @@
+"""fetch_sources.py against a local HTTP/1.1 server: downloads, revalidation, resume and redirects"""
+
+import asyncio
+import hashlib
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetch_sources
+from fetch_sources import STATE_FILE, fetch_all
+
+RESULTS = b'county,office,party,votes\n' + b''.join(b'Aitkin,President,DFL,%d\n' % i for i in range(5000))
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves server.files with ETags, conditional GETs, If-Range ranges and /redir/ redirects"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        if self.path.startswith('/redir/'):
+            self.send_response(302)
+            self.send_header('Location', '/' + self.path[len('/redir/'):])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        data = server.files.get(self.path)
+        if data is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = '"%s"' % hashlib.sha256(data).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get('Range') and self.headers.get('If-Range') == etag:
+            start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.path in server.truncate:
+            # Drop the connection halfway through the body
+            server.truncate.discard(self.path)
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.files, httpd.truncate, httpd.requests = {}, set(), []
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class RawHandler(socketserver.StreamRequestHandler):
+    """Answers any request with server.reply as is, then holds the connection for server.stall seconds"""
+
+    def handle(self):
+        while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+            pass
+        self.wfile.write(self.server.reply)
+        self.wfile.flush()
+        time.sleep(self.server.stall)
+
+
+@pytest.fixture
+def raw_server():
+    tcp = socketserver.ThreadingTCPServer(('127.0.0.1', 0), RawHandler)
+    tcp.daemon_threads = True
+    tcp.reply, tcp.stall = b'', 0
+    threading.Thread(target=tcp.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    tcp.url = f'http://127.0.0.1:{tcp.server_address[1]}'
+    yield tcp
+    tcp.shutdown()
+    tcp.server_close()
+
+
+def fetch(sources, data_dir, per_host=4):
+    return asyncio.run(fetch_all(sources, str(data_dir), per_host))
+
+
+def test_download_then_unchanged(server, tmp_path):
+    server.files['/results.csv'] = RESULTS
+    sources = [{'file': 'results.csv', 'url': server.url + '/results.csv'}]
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'] == ('downloaded', len(RESULTS))
+    assert (tmp_path / 'results.csv').read_bytes() == RESULTS
+    assert not (tmp_path / 'results.csv.part').exists()
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'] == ('unchanged', 0)
+    assert 'If-None-Match' in server.requests[-1][1]
+
+
+def test_changed_file_is_downloaded_again(server, tmp_path):
+    server.files['/results.csv'] = RESULTS
+    sources = [{'file': 'results.csv', 'url': server.url + '/results.csv'}]
+    fetch(sources, tmp_path)
+
+    server.files['/results.csv'] = RESULTS + b'Anoka,President,R,1\n'
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'][0] == 'downloaded'
+    assert (tmp_path / 'results.csv').read_bytes() == server.files['/results.csv']
+
+
+def test_interrupted_download_resumes(server, tmp_path):
+    server.files['/results.csv'] = RESULTS
+    server.truncate.add('/results.csv')
+    sources = [{'file': 'results.csv', 'url': server.url + '/results.csv'}]
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'][0].startswith('failed')
+    assert not (tmp_path / 'results.csv').exists()
+    received = (tmp_path / 'results.csv.part').stat().st_size
+    assert received == len(RESULTS) // 2
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'] == ('resumed', len(RESULTS) - received)
+    headers = server.requests[-1][1]
+    assert headers['Range'] == f'bytes={received}-'
+    assert headers['If-Range'] == json.loads((tmp_path / STATE_FILE).read_text())['results.csv']['etag']
+    # The 206 body was appended to the .part file, which then replaced the file
+    assert (tmp_path / 'results.csv').read_bytes() == RESULTS
+    assert not (tmp_path / 'results.csv.part').exists()
+
+
+def test_resume_starts_over_when_the_file_changed(server, tmp_path):
+    server.files['/results.csv'] = RESULTS
+    server.truncate.add('/results.csv')
+    sources = [{'file': 'results.csv', 'url': server.url + '/results.csv'}]
+    fetch(sources, tmp_path)
+
+    # If-Range no longer matches, so the server sends the whole new file
+    server.files['/results.csv'] = RESULTS.replace(b'Aitkin', b'Anoka ')
+    results, _ = fetch(sources, tmp_path)
+    assert results['results.csv'] == ('downloaded', len(RESULTS))
+    assert (tmp_path / 'results.csv').read_bytes() == server.files['/results.csv']
+
+
+def test_redirect_is_followed(server, tmp_path):
+    server.files['/files/results.csv'] = RESULTS
+    sources = [{'file': 'results.csv', 'url': server.url + '/redir/files/results.csv'}]
+
+    results, opened = fetch(sources, tmp_path)
+    assert results['results.csv'] == ('downloaded', len(RESULTS))
+    assert [path for path, _ in server.requests] == ['/redir/files/results.csv', '/files/results.csv']
+    # The redirect body was read, so the same connection carried the second request
+    assert opened == 1
+    # Validators are kept under the url in sources.json, not the redirect target
+    assert json.loads((tmp_path / STATE_FILE).read_text())['results.csv']['url'] == sources[0]['url']
+
+
+def test_missing_file_fails_without_stopping_others(server, tmp_path):
+    server.files['/results.csv'] = RESULTS
+    sources = [{'file': 'missing.csv', 'url': server.url + '/missing.csv'},
+               {'file': 'results.csv', 'url': server.url + '/results.csv'}]
+
+    results, _ = fetch(sources, tmp_path, per_host=1)
+    assert results['missing.csv'][0] == 'failed: HTTP 404 from ' + sources[0]['url']
+    assert results['results.csv'][0] == 'downloaded'
+    assert not (tmp_path / 'missing.csv').exists()
+
+
+@pytest.mark.parametrize('reply', [
+    b'garbage\r\n\r\n',
+    b'HTTP/1.1 OK\r\n\r\n',
+    b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n',
+    b'HTTP/1.1 200 OK\r\nContent-Length: many\r\n\r\n',
+])
+def test_malformed_response_fails_only_its_source(server, raw_server, tmp_path, reply):
+    server.files['/results.csv'] = RESULTS
+    raw_server.reply = reply
+    sources = [{'file': 'bad.csv', 'url': raw_server.url + '/bad.csv'},
+               {'file': 'results.csv', 'url': server.url + '/results.csv'}]
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['bad.csv'][0].startswith('failed: malformed')
+    assert results['results.csv'] == ('downloaded', len(RESULTS))
+    assert not (tmp_path / 'bad.csv').exists()
+
+
+def test_stalled_body_times_out(raw_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_sources, 'TIMEOUT_SECONDS', 0.2)
+    raw_server.reply, raw_server.stall = b'HTTP/1.1 200 OK\r\nETag: "a"\r\nContent-Length: 100\r\n\r\nabc', 2
+    sources = [{'file': 'slow.csv', 'url': raw_server.url + '/slow.csv'}]
+
+    results, _ = fetch(sources, tmp_path)
+    assert results['slow.csv'] == ('failed: TimeoutError', 0)
+    # What arrived is kept for a resume
+    assert (tmp_path / 'slow.csv.part').read_bytes() == b'abc'
@@ -0,0 +1,28 @@
+"""PrecinctTally: columns summed per VTD id, each file's column read once"""
+
+import pytest
+
+from precincts import PrecinctTally
+
+
+def tally(ids, votes, office='Governor', party='R'):
+    precincts = PrecinctTally()
+    precincts.add_column(precincts.rows(ids, ids), office, party, votes)
+    return precincts
+
+
+def test_lines_sharing_an_id_are_summed():
+    columns = tally(['270010005', '270030010', '270010005'], [5, 7, 2]).columns()
+    assert columns['vtd'] == ['270010005', '270030010']
+    assert columns['offices']['Governor']['R'].tolist() == [7, 7]
+
+
+def test_column_read_twice_is_an_error():
+    precincts = tally(['270010005'], [5])
+    with pytest.raises(ValueError, match='Governor / R'):
+        precincts.add_column(precincts.rows(['270010005'], ['x']), 'Governor', 'R', [5])
+
+
+def test_merged_parts_are_summed():
+    merged = tally(['270010005'], [5]).merge(tally(['270010005', '270030010'], [2, 3]))
+    assert merged.columns()['offices']['Governor']['R'].tolist() == [7, 3]
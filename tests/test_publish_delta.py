@@ -0,0 +1,23 @@
+"""Patch chains kept in the publish manifest"""
+
+from publish_delta import MAX_CHAIN, prune_chain
+
+
+def chain(versions):
+    return {a: {'to': b, 'file': f'patches/{a}-{b}.json'} for a, b in zip(versions, versions[1:])}
+
+
+def test_chains_reaching_the_version_are_kept():
+    patches = chain(['v1', 'v2', 'v3'])
+    assert prune_chain(patches, 'v3') == patches
+
+
+def test_chains_longer_than_max_chain_are_dropped():
+    versions = [f'v{i}' for i in range(MAX_CHAIN + 2)]
+    kept = prune_chain(chain(versions), versions[-1])
+    assert sorted(kept) == sorted(versions[1:-1])
+
+
+def test_looping_chain_ends_and_is_dropped():
+    patches = {**chain(['a', 'b', 'a']), **chain(['v1', 'v2'])}
+    assert prune_chain(patches, 'v2') == chain(['v1', 'v2'])
@@ -0,0 +1,94 @@
+"""QueryAPI.handle over a real socket: keep-alive, revalidation and malformed requests"""
+
+import asyncio
+import json
+
+from query_api import QueryAPI, ResultsIndex
+
+
+def result(dem, rep, dem_candidate='Amy Klobuchar', rep_candidate='Jim Newberger'):
+    return {'dem_candidate': dem_candidate, 'rep_candidate': rep_candidate, 'dem_votes': dem, 'rep_votes': rep,
+            'other_votes': 10, 'total_votes': dem + rep + 10, 'margin_pct': round(abs(rep - dem) / (dem + rep) * 100, 2),
+            'winner': 'REP' if rep > dem else 'DEM'}
+
+
+DOC = {'results_by_year': {'2018': {'us_senate': {'us_senate_2018': {
+    'contest_name': 'United States Senator',
+    'results': {'Aitkin': result(3000, 4500), 'Anoka': result(80000, 75000)}}}}}}
+
+
+async def exchange(requests):
+    """Send raw requests on one connection; returns everything the server wrote before closing"""
+    api = QueryAPI(ResultsIndex(DOC))
+    server = await asyncio.start_server(api.handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b''.join(requests))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return data
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def responses(data):
+    """(status, headers, body) of each response in a byte stream"""
+    parsed = []
+    while data:
+        head, _, data = data.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        headers = dict(line.split(': ', 1) for line in lines[1:])
+        length = int(headers.get('Content-Length', 0))
+        parsed.append((int(lines[0].split()[1]), headers, data[:length]))
+        data = data[length:]
+    return parsed
+
+
+def get(path, *headers):
+    return ('\r\n'.join([f'GET {path} HTTP/1.1', 'Host: test', *headers]) + '\r\n\r\n').encode('latin-1')
+
+
+def test_keep_alive_serves_several_requests():
+    replies = responses(asyncio.run(exchange([get('/contests'), get('/year/2018'), get('/nope', 'Connection: close')])))
+    assert [status for status, _, _ in replies] == [200, 200, 404]
+    assert [headers['Connection'] for _, headers, _ in replies] == ['keep-alive', 'keep-alive', 'close']
+    assert json.loads(replies[0][2])[0]['contest_id'] == 'us_senate_2018'
+
+
+def test_if_none_match_gets_304():
+    (_, headers, _), = responses(asyncio.run(exchange([get('/contest/us_senate_2018', 'Connection: close')])))
+    replies = responses(asyncio.run(exchange([
+        get('/contest/us_senate_2018', f"If-None-Match: {headers['ETag']}"),
+        get('/contest/us_senate_2018', 'If-None-Match: "stale"', 'Connection: close'),
+    ])))
+    assert [status for status, _, _ in replies] == [304, 200]
+    assert replies[0][2] == b'' and 'Content-Length' not in replies[0][1]
+    assert replies[1][1]['ETag'] == headers['ETag']
+
+
+def test_request_with_body_gets_405_and_close():
+    # Without the close, the body would be read as the next request line
+    post = b'POST /contests HTTP/1.1\r\nHost: test\r\nContent-Length: 16\r\n\r\nGET /contests\r\n\r\n'
+    replies = responses(asyncio.run(exchange([post, get('/contests')])))
+    assert len(replies) == 1
+    status, headers, _ = replies[0]
+    assert status == 405
+    assert headers['Allow'] == 'GET, HEAD' and headers['Connection'] == 'close'
+
+
+def test_overlong_request_line_gets_400():
+    replies = responses(asyncio.run(exchange([get('/contest/' + 'x' * 100_000)])))
+    assert [(status, headers['Connection']) for status, headers, _ in replies] == [(400, 'close')]
+
+
+def test_overlong_header_line_gets_400():
+    replies = responses(asyncio.run(exchange([get('/contests', 'X-Padding: ' + 'x' * 100_000)])))
+    assert [status for status, _, _ in replies] == [400]
+
+
+def test_candidate_keeps_its_spelling():
+    replies = responses(asyncio.run(exchange([get('/candidate/KLOBUCHAR', 'Connection: close')])))
+    assert [match['candidate'] for match in json.loads(replies[0][2])] == ['Amy Klobuchar']
@@ -0,0 +1,20 @@
+"""Scenario simulation: turnout draws and the vote matrices they scale"""
+
+import numpy as np
+
+from scenario_sim import simulate, turnout_draws
+
+
+def test_turnout_draws_keep_mean_and_sd():
+    draws = turnout_draws(np.random.default_rng(0), 0.1, 200_000)
+    assert abs(draws.mean() - 1) < 0.002
+    assert abs(draws.std() - 0.1) < 0.002
+
+
+def test_wide_turnout_draws_never_go_negative():
+    # With sd 0.5 a normal draw would fall below 0 in about 2% of counties
+    draws = turnout_draws(np.random.default_rng(0), 0.5, (1000, 87))
+    assert (draws > 0).all()
+    votes = np.full((87, 3), 1000.0)
+    result = simulate(votes, turnout=draws)
+    assert all((result[key] >= 0).all() for key in ('dem', 'rep', 'other'))
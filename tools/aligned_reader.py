@@ -0,0 +1,217 @@
+"""
+Memory-mapped reader for the column-aligned ("-aligned") precinct files
+Column byte offsets are found once from the header, the file is mmapped and
+numeric columns are decoded for every line at once with numpy straight out of
+the buffer. Lines whose commas are not at the expected offsets (quoted names,
+repeated headers) fall back to csv parsing so nothing is lost.
+"""
+
+import csv
+
+import numpy as np
+
+from county_lookup import COUNTY_ALIASES
+from precincts import PrecinctTally, district_contest_columns, vtd_ids
+from source_io import close_buffer, map_source
+from tally import Tally, tally_columns
+
+NEWLINE, CR, SPACE, COMMA = (ord(c) for c in '\n\r ,')
+ZERO, NINE = ord('0'), ord('9')
+
+# int64 holds 18 decimal digits safely
+MAX_DIGITS = 18
+
+
+class AlignedFile:
+    """Column layout and line index of one aligned file
+
+    `skip` physical lines are ignored before the header record (the 2002 file
+    has two title lines). `fieldnames` replaces the header names, for files
+    whose header is unusable (the 2006 file wraps quoted names over lines).
+    """
+
+    def __init__(self, path, fieldnames=None, skip=0):
+        self.path = path
+        # mmap for plain files; compressed sources are decompressed into memory
+        self._buffer = map_source(path)
+        self.data = np.frombuffer(self._buffer, dtype=np.uint8)
+
+        # Line index: start and end (without \r\n) of every physical line
+        newlines = np.flatnonzero(self.data == NEWLINE)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(self.data)]))
+        if starts[-1] >= len(self.data):
+            starts, ends = starts[:-1], ends[:-1]
+        has_cr = (ends > starts) & (self.data[np.maximum(ends - 1, 0)] == CR)
+        ends = ends - has_cr
+
+        # Header record: physical lines until the quotes balance
+        first = skip
+        last = first
+        while self._buffer[starts[first]:ends[last]].count(b'"') % 2:
+            last += 1
+        header = self._buffer[starts[first]:ends[last]].decode('utf-8')
+        names = [name.strip() for name in next(csv.reader([header.replace('\n', ' ')]))]
+        self.fieldnames = list(fieldnames) if fieldnames else names
+
+        self.starts = starts[last + 1:]
+        self.lengths = ends[last + 1:] - self.starts
+        nonblank = self.lengths > 0
+        self.starts, self.lengths = self.starts[nonblank], self.lengths[nonblank]
+
+        # Comma offsets from a one-line header, otherwise from the first data line
+        if first == last and header.count(',') == len(names) - 1:
+            layout = header.encode('utf-8')
+        else:
+            layout = bytes(self._buffer[self.starts[0]:self.starts[0] + self.lengths[0]])
+        self.commas = np.array([i for i, byte in enumerate(layout) if byte == COMMA], dtype=np.int64)
+        bounds = np.concatenate(([-1], self.commas))
+        self.spans = {}
+        for i, name in enumerate(self.fieldnames[:len(bounds)]):
+            end = int(self.commas[i]) if i < len(self.commas) else None
+            self.spans.setdefault(name, (int(bounds[i]) + 1, end))
+
+        # A line is aligned when every expected comma is where the layout says
+        aligned = np.ones(len(self.starts), dtype=bool)
+        for offset in self.commas:
+            inside = self.lengths > offset
+            at = np.minimum(self.starts + offset, len(self.data) - 1)
+            aligned &= inside & (self.data[at] == COMMA)
+        self.aligned = aligned
+
+    def close(self):
+        self.data = None
+        close_buffer(self._buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _cells(self, name):
+        """(aligned lines x field width) byte matrix for a column; padding past a short line reads as spaces"""
+        start, end = self.spans[name]
+        starts = self.starts[self.aligned]
+        lengths = self.lengths[self.aligned]
+        if end is None:
+            end = start + int(max(lengths.max(initial=start) - start, 0))
+        positions = np.arange(start, end)
+        index = np.minimum(starts[:, None] + positions, len(self.data) - 1)
+        cells = self.data[index]
+        cells[positions >= lengths[:, None]] = SPACE
+        return cells
+
+    def has(self, name):
+        return name in self.spans
+
+    def int_column(self, name, parser):
+        """Vote counts for a column over the aligned lines
+
+        Cells of spaces and one run of digits are decoded in bulk; anything
+        else (signs, stray text) goes through `parser`, which records it.
+        """
+        cells = self._cells(name)
+        if not cells.shape[1]:
+            return np.zeros(len(cells), dtype=np.int64)
+        digit = (cells >= ZERO) & (cells <= NINE)
+        clean = (digit | (cells == SPACE)).all(axis=1)
+        runs = digit[:, 0].astype(np.int64) + (digit[:, 1:] & ~digit[:, :-1]).sum(axis=1)
+        clean &= (runs <= 1) & (digit.sum(axis=1) <= MAX_DIGITS)
+
+        # Place value of each digit is the number of digits to its right
+        place = np.cumsum(digit[:, ::-1], axis=1)[:, ::-1] - 1
+        powers = np.power(10, np.clip(place, 0, MAX_DIGITS), dtype=np.int64)
+        values = np.where(digit, (cells - ZERO).astype(np.int64) * powers, 0).sum(axis=1)
+
+        for row in np.flatnonzero(~clean):
+            values[row] = parser.parse(cells[row].tobytes().decode('utf-8', 'replace').strip(), name)
+        return values
+
+    def text_column(self, name):
+        """Stripped text of a column over the aligned lines"""
+        cells = self._cells(name)
+        if not cells.shape[1]:
+            return np.full(len(cells), '')
+        raw = np.ascontiguousarray(cells).view(f'S{cells.shape[1]}').ravel()
+        return np.char.strip(np.char.decode(raw, 'utf-8', 'replace'))
+
+    def county_index(self, name):
+        """County index per aligned line from a code/FIPS/name column, -1 when unknown"""
+        cells = self._cells(name)
+        width = cells.shape[1]
+        if not width:
+            return np.full(len(cells), -1, dtype=np.intp)
+        raw = np.ascontiguousarray(cells).view(f'S{width}').ravel()
+        unique, inverse = np.unique(raw, return_inverse=True)
+        lookup = []
+        for value in unique:
+            county = COUNTY_ALIASES.get(value.decode('utf-8', 'replace').strip())
+            lookup.append(county.index if county is not None else -1)
+        return np.array(lookup, dtype=np.intp)[inverse]
+
+    def fallback_rows(self):
+        """Misaligned lines parsed with csv, as dicts keyed by fieldnames"""
+        for start, length in zip(self.starts[~self.aligned].tolist(), self.lengths[~self.aligned].tolist()):
+            line = self._buffer[start:start + length].decode('utf-8', 'replace')
+            values = next(csv.reader([line]), [])
+            yield dict(zip(self.fieldnames, (value.strip() for value in values)))
+
+
+def tally_aligned(input_file, county_fields, office_columns, parser, fieldnames=None, skip=0,
+                  precinct_spec=None):
+    """Tally an aligned file column by column; misaligned lines go through csv
+
+    `county_fields` lists the county columns in order of preference (e.g. CC,
+    then FIPS); the first one the file has is used. With a `precinct_spec`
+    (precincts.PrecinctSpec) the same columns, plus the spec's district,
+    turnout and district contest columns, are also kept per precinct in
+    tally.precincts.
+    """
+    with AlignedFile(input_file, fieldnames=fieldnames, skip=skip) as aligned:
+        county_field = next((name for name in county_fields if aligned.has(name)), None)
+        if county_field is None:
+            return Tally()
+
+        county_idx = aligned.county_index(county_field)
+        known = county_idx >= 0
+
+        tally = Tally(offices=[office for office, _ in office_columns])
+        if precinct_spec is not None:
+            tally.precincts = PrecinctTally()
+            districts = {key: aligned.text_column(column)[known].tolist()
+                         for key, column in precinct_spec.districts if aligned.has(column)}
+            precinct_rows = tally.precincts.rows(
+                vtd_ids(county_idx[known], aligned.text_column(precinct_spec.code)[known]).tolist(),
+                aligned.text_column(precinct_spec.name)[known].tolist(), districts)
+            for key, cols in precinct_spec.turnout:
+                present = [col for col in cols if aligned.has(col)]
+                if present:
+                    counts = sum(aligned.int_column(col, parser)[known] for col in present)
+                    tally.precincts.add_turnout(precinct_rows, key, counts)
+
+        for office, parties in office_columns:
+            for party, col in parties:
+                if aligned.has(col):
+                    votes = aligned.int_column(col, parser)[known]
+                    tally.add_column(county_idx[known], office, party, votes)
+                    if tally.precincts is not None:
+                        tally.precincts.add_column(precinct_rows, office, party, votes)
+
+        # District contests are only meaningful per precinct
+        if precinct_spec is not None:
+            for office, party, col in district_contest_columns(precinct_spec, office_columns):
+                if aligned.has(col):
+                    tally.precincts.add_column(precinct_rows, office, party, aligned.int_column(col, parser)[known])
+
+        fallback = list(aligned.fallback_rows())
+        aligned_lines = int(aligned.aligned.sum())
+
+    if fallback:
+        def county_of(row):
+            value = row.get(county_field)
+            return COUNTY_ALIASES.get(value) if value is not None else None
+        tally.merge(tally_columns(fallback, county_of, office_columns, parser, precinct_spec))
+
+    print(f"  {aligned_lines} aligned lines, {len(fallback)} parsed with csv")
+    return tally
@@ -0,0 +1,124 @@
+"""
+Single-pass consistency checker for OpenElections county CSV files
+Reports duplicate rows, missing counties, unexpected candidate counts per office
+and row-count expectations together, from one read of each file
+"""
+
+import csv
+import glob
+import os
+import sys
+from collections import Counter, defaultdict
+
+from county_lookup import COUNTY_NAMES
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+# An office reported by at least this share of counties is treated as statewide,
+# so missing counties and row-count expectations are only checked for those
+STATEWIDE_COVERAGE = 0.8
+
+
+def scan_csv(csv_file):
+    """Read the file once and build every count the checks need"""
+    row_keys = Counter()                   # (office, district, county, party, candidate) -> rows
+    contest_rows = Counter()               # (office, district, county) -> rows
+    counties_by_contest = defaultdict(set)  # (office, district) -> counties
+    total_rows = 0
+
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            total_rows += 1
+            office = row['office']
+            district = row.get('district') or ''
+            county = row['county']
+            row_keys[(office, district, county, row['party'], row.get('candidate') or '')] += 1
+            contest_rows[(office, district, county)] += 1
+            counties_by_contest[(office, district)].add(county)
+
+    return total_rows, row_keys, contest_rows, counties_by_contest
+
+
+def check_election_csv(csv_file, expected_counties=COUNTY_NAMES, expected_rows=None):
+    """Run all checks on one OpenElections county CSV; returns the number of issues"""
+    print(f"\n{'='*80}")
+    print(f"FILE: {os.path.basename(csv_file)}")
+    print(f"{'='*80}")
+
+    total_rows, row_keys, contest_rows, counties_by_contest = scan_csv(csv_file)
+    expected_set = set(expected_counties)
+    issues = 0
+
+    # Duplicate rows: the same candidate listed twice for one county and contest
+    duplicates = [(key, count) for key, count in row_keys.items() if count > 1]
+    for (office, district, county, party, candidate), count in sorted(duplicates):
+        label = f"{office} {district}".strip()
+        print(f"  ERROR duplicate: {county} / {label} / {party} {candidate} x{count}")
+    issues += len(duplicates)
+
+    # Candidates per county, grouped once per contest so the mode is linear to compute
+    rows_per_county = defaultdict(dict)
+    for (office, district, county), count in contest_rows.items():
+        rows_per_county[(office, district)][county] = count
+
+    statewide_rows = 0
+    expected_statewide_rows = 0
+    min_counties = STATEWIDE_COVERAGE * len(expected_set)
+
+    for contest in sorted(counties_by_contest):
+        office, district = contest
+        label = f"{office} {district}".strip()
+        counties = counties_by_contest[contest]
+        if len(counties) < min_counties:
+            continue
+
+        per_county = rows_per_county[contest]
+        mode, _ = Counter(per_county.values()).most_common(1)[0]
+
+        statewide_rows += sum(per_county.values())
+        expected_statewide_rows += mode * len(expected_set)
+
+        missing = sorted(expected_set - counties)
+        unknown = sorted(counties - expected_set)
+        wrong_count = sorted((c, n) for c, n in per_county.items() if n != mode)
+
+        status = 'OK' if not (missing or unknown or wrong_count) else 'WARN'
+        print(f"  {status} {label}: {len(counties)}/{len(expected_set)} counties, {mode} candidates per county")
+        for county in missing:
+            print(f"    missing county: {county}")
+        for county in unknown:
+            print(f"    unknown county: {county}")
+        for county, count in wrong_count:
+            print(f"    {county}: {count} candidates (expected {mode})")
+        issues += len(missing) + len(unknown) + len(wrong_count)
+
+    # Row-count expectations
+    print(f"\n  Total rows: {total_rows}")
+    print(f"  Statewide rows: {statewide_rows} (expected {expected_statewide_rows})")
+    if statewide_rows != expected_statewide_rows:
+        issues += 1
+    if expected_rows is not None:
+        status = 'OK MATCH' if total_rows == expected_rows else 'ERROR MISMATCH'
+        print(f"  Expected total rows: {expected_rows} - {status}")
+        if total_rows != expected_rows:
+            issues += 1
+
+    print(f"  Issues: {issues}")
+    return issues
+
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or sorted(glob.glob(os.path.join(DATA_DIR, '*__general__county.csv')))
+
+    print("=" * 80)
+    print("OPENELECTIONS COUNTY CSV CHECK")
+    print("=" * 80)
+
+    total_issues = sum(check_election_csv(path) for path in files)
+
+    print(f"\n{'='*80}")
+    print(f"Files checked: {len(files)}")
+    print(f"Total issues found: {total_issues}")
+    print("=" * 80)
+
+    sys.exit(1 if total_issues else 0)
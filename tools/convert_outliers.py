@@ -8,805 +8,404 @@ Handle the outlier election files that need special parsing
 
 import csv
 import os
-from collections import defaultdict
+import sys
+from functools import partial
+from aligned_reader import tally_aligned
 from candidate_lookup import get_candidate_name
+from county_lookup import COUNTY_ALIASES, resolve_county
+from parallel_csv import parallel_tally
+from precincts import PrecinctSpec, write_precincts
+from source_io import find_source, open_source, source_name
+from tally import tally_columns, tally_precinct_rows
+from vote_parsing import ParseLedger
 
-# County codes mapping
-COUNTY_CODES = {
-    'Aitkin': '01', 'Anoka': '02', 'Becker': '03', 'Beltrami': '04',
-    'Benton': '05', 'Big Stone': '06', 'Blue Earth': '07', 'Brown': '08',
-    'Carlton': '09', 'Carver': '10', 'Cass': '11', 'Chippewa': '12',
-    'Chisago': '13', 'Clay': '14', 'Clearwater': '15', 'Cook': '16',
-    'Cottonwood': '17', 'Crow Wing': '18', 'Dakota': '19', 'Dodge': '20',
-    'Douglas': '21', 'Faribault': '22', 'Fillmore': '23', 'Freeborn': '24',
-    'Goodhue': '25', 'Grant': '26', 'Hennepin': '27', 'Houston': '28',
-    'Hubbard': '29', 'Isanti': '30', 'Itasca': '31', 'Jackson': '32',
-    'Kanabec': '33', 'Kandiyohi': '34', 'Kittson': '35', 'Koochiching': '36',
-    'Lac qui Parle': '37', 'Lake': '38', 'Lake of the Woods': '39',
-    'Le Sueur': '40', 'Lincoln': '41', 'Lyon': '42', 'McLeod': '43',
-    'Mahnomen': '44', 'Marshall': '45', 'Martin': '46', 'Mille Lacs': '47',
-    'Morrison': '48', 'Mower': '49', 'Murray': '50', 'Nicollet': '51',
-    'Nobles': '52', 'Norman': '53', 'Olmsted': '54', 'Otter Tail': '55',
-    'Pennington': '56', 'Pine': '57', 'Pipestone': '58', 'Polk': '59',
-    'Pope': '60', 'Meeker': '61', 'Ramsey': '62', 'Red Lake': '63',
-    'Redwood': '64', 'Renville': '65', 'Rice': '66', 'Rock': '67',
-    'Roseau': '68', 'St. Louis': '69', 'Scott': '70', 'Sherburne': '71',
-    'Sibley': '72', 'Stearns': '73', 'Steele': '74', 'Stevens': '75',
-    'Swift': '76', 'Todd': '77', 'Traverse': '78', 'Wabasha': '79',
-    'Wadena': '80', 'Waseca': '81', 'Washington': '82', 'Watonwan': '83',
-    'Wilkin': '84', 'Winona': '85', 'Wright': '86', 'Yellow Medicine': '87'
+# Rejected vote cells from every file converted in this run
+LEDGER = ParseLedger()
+
+# Worker processes for large precinct CSVs; None uses every core
+WORKERS = None
+
+# Offices reported with the same prefix + party suffix column names in the 1990s files
+STATEWIDE_PREFIXES = [
+    ('Secretary of State', 'SOS'),
+    ('Attorney General', 'AG'),
+    ('State Auditor', 'Aud'),
+    ('State Treasurer', 'Treas')
+]
+
+# (office, [(party, column), ...]) for each aligned 1990s precinct file
+ALIGNED_COLUMNS = {
+    1992: [
+        ('President', [('R', 'PresIR'), ('DFL', 'PresDFL'), ('Other', 'PresOther')]),
+    ],
+    1994: [
+        ('Governor', [('R', 'GovIR'), ('DFL', 'GovDFL'), ('Other', 'GovOther')]),
+        ('U.S. Senate', [('R', 'USSenIR'), ('DFL', 'USSenDFL'), ('Other', 'USSenOther')]),
+    ] + [
+        (office, [(party, prefix + suffix) for party, suffix in [('R', 'IR'), ('DFL', 'DFL'), ('Other', 'Other')]])
+        for office, prefix in STATEWIDE_PREFIXES
+    ],
+    1996: [
+        ('President', [('RP', 'PresRP'), ('R', 'PresIR'), ('DFL', 'PresDFL'), ('Other', 'PresOther')]),
+        ('U.S. Senate', [('R', 'USSenIR'), ('DFL', 'USSenDFL'), ('Other', 'USSenOther')]),
+    ],
+    1998: [
+        ('Governor', [('R', 'GovIR'), ('DFL', 'GovDFL'), ('RP', 'GovRP'), ('Other', 'GovOther')]),
+    ] + [
+        (office, [(party, prefix + suffix) for party, suffix in
+                  [('R', 'IR'), ('DFL', 'DFL'), ('RP', 'RP'), ('MTP', 'MTP'), ('Other', 'Other')]])
+        for office, prefix in STATEWIDE_PREFIXES
+    ],
 }
 
-FIPS_TO_COUNTY = {v: k for k, v in COUNTY_CODES.items()}
+COLUMNS_2000 = [
+    ('President', [('R', 'R_PREZ'), ('DFL', 'DFL_PREZ'), ('GP', 'GREEN_PREZ'),
+                   ('LIB', 'LIB_PREZ'), ('RP', 'RP_PREZ')]),
+    ('U.S. Senate', [('R', 'R_USSEN'), ('DFL', 'DFL_USSEN'), ('IND', 'IND_USSEN')]),
+]
 
-def normalize_county(name):
-    """Normalize county name variations"""
-    name = name.strip().title()
-    for suffix in [' Twp', ' Township', ' City', ' Unorganized']:
-        if name.endswith(suffix):
-            name = name[:-len(suffix)].strip()
-    
-    replacements = {
-        'Saint Louis': 'St. Louis', 'St Louis': 'St. Louis',
-        'Bigstone': 'Big Stone', 'Blueearth': 'Blue Earth',
-        'Crowwing': 'Crow Wing', 'Lacquiparle': 'Lac Qui Parle',
-        'Lac Qui Parle': 'Lac qui Parle',  # Fix capitalization
-        'Lakeofthewoods': 'Lake Of The Woods', 'Lake Of The Woods': 'Lake of the Woods',  # Fix capitalization
-        'Lesueur': 'Le Sueur',
-        'Millelacs': 'Mille Lacs', 'Ottertail': 'Otter Tail',
-        'Redlake': 'Red Lake', 'Yellowmedicine': 'Yellow Medicine',
-        'Mcleod': 'McLeod'  # Fix capitalization
-    }
-    
-    for old, new in replacements.items():
-        if name.lower() == old.lower():
-            return new
-    return name
+# According to Fields.csv:
+# USSenGP, USSenIP, USSenR, Wellstone (DFL), USSenDFL, USSenCP, USSenWI
+# GovGP, GovIP, GovR, GovDFL, GovCP, GovI, GovSW, GovWI
+COLUMNS_2002 = [
+    ('U.S. Senate', [('GP', 'USSenGP'), ('IND', 'USSenIP'), ('R', 'USSenR'),
+                     ('DFL', 'USSenDFL'), ('CP', 'USSenCP')]),
+    ('Governor', [('GP', 'GovGP'), ('IND', 'GovIP'), ('R', 'GovR'),
+                  ('DFL', 'GovDFL'), ('CP', 'GovCP'), ('I', 'GovI')]),
+    ('Secretary of State', [('GP', 'SOSGP'), ('IND', 'SOSIP'), ('R', 'SOSR'), ('DFL', 'SOSDFL')]),
+    ('Attorney General', [('IND', 'AGIP'), ('R', 'AGR'), ('DFL', 'AGDFL')]),
+    ('State Auditor', [('GP', 'AudGP'), ('IND', 'AudIP'), ('R', 'AudR'), ('DFL', 'AudDFL')]),
+]
+
+# President: USPresGP, USPresR, USPresDFL, USPresSE, USPresSW, USPresCF, USPresBL, USPresC, USPresL
+COLUMNS_2004 = [
+    ('President', [('R', 'USPresR'), ('DFL', 'USPresDFL'), ('GP', 'USPresGP'),
+                   ('SE', 'USPresSE'), ('SWP', 'USPresSW'), ('CF', 'USPresCF'),
+                   ('BL', 'USPresBL'), ('C', 'USPresC'), ('LIB', 'USPresL')]),
+]
+
+# According to Fields.csv: <office>R, <office>DFL, <office>IP, <office>WI
+COLUMNS_2006 = [
+    ('U.S. Senate', [('R', 'USSenR'), ('DFL', 'USSenDFL'), ('IND', 'USSenIP')]),
+    ('Governor', [('R', 'GovR'), ('DFL', 'GovDFL'), ('IND', 'GovIP')]),
+    ('Attorney General', [('R', 'AttGenR'), ('DFL', 'AttGenDFL'), ('IND', 'AttGenIP')]),
+    ('Secretary of State', [('R', 'SOSR'), ('DFL', 'SOSDFL'), ('IND', 'SOSIP')]),
+    ('State Auditor', [('R', 'STAUDR'), ('DFL', 'STAUDDFL'), ('IND', 'STAUDIP')]),
+]
+
+# U.S. Senate: USSENIP is Dean Barkley
+COLUMNS_2008 = [
+    ('President', [('R', 'USPRESR'), ('DFL', 'USPRESDFL'), ('GP', 'USPRESGP'),
+                   ('IND', 'USPRESIND'), ('SWP', 'USPRESSWP'), ('LIB', 'USPRESLIB'),
+                   ('CP', 'USPRESCP')]),
+    ('U.S. Senate', [('R', 'USSENR'), ('DFL', 'USSENDFL'), ('IND', 'USSENIP'),
+                     ('LIB', 'USSENLIB'), ('CP', 'USSENCP')]),
+]
+
+COLUMNS_2010 = [
+    ('Governor', [('R', 'GOVR'), ('DFL', 'GOVDFL'), ('IND', 'GOVIP'), ('GP', 'GOVGP'),
+                  ('TRP', 'GOVTRP'), ('GR', 'GOVGR'), ('EDP', 'GOVEDP')]),
+    ('State Senate', [('R', 'MNSENR'), ('DFL', 'MNSENDFL'), ('IND', 'MNSENIP')]),
+    ('Attorney General', [('R', 'ATGENR'), ('DFL', 'ATGENDFL'), ('IND', 'ATGENIP'), ('TRP', 'ATGENTRP')]),
+    ('Secretary of State', [('R', 'SOSR'), ('DFL', 'SOSDFL'), ('IND', 'SOSIP')]),
+    ('State Auditor', [('R', 'STAUDR'), ('DFL', 'STAUDDFL'), ('IND', 'STAUDIP')]),
+]
+
+COLUMNS_2024 = [
+    ('President', [('R', 'USPRSR'), ('DFL', 'USPRSDFL'), ('LIB', 'USPRSLIB'),
+                   ('WTP', 'USPRSWTP'), ('G', 'USPRSG'), ('SLP', 'USPRSSLP'),
+                   ('SWP', 'USPRSSWP'), ('JFA', 'USPRSJFA'), ('IND', 'USPRSIND')]),
+    ('U.S. Senate', [('R', 'USSENR'), ('DFL', 'USSENDFL'), ('LIB', 'USSENLIB'), ('IA', 'USSENIA')]),
+]
+
+# Turnout columns as (key, (columns summed, ...)): registered at 7am, election-day
+# registrations, roster signatures, absentee ballots (regular, federal-only and
+# presidential-only) and ballots cast
+def turnout_columns(registered, edr, signatures, absentee, ballots):
+    columns = [('registered', registered), ('edr', edr), ('signatures', signatures),
+               ('absentee', absentee), ('ballots', ballots)]
+    return tuple((key, tuple(cols)) for key, cols in columns if cols)
+
+TURNOUT_1990S = turnout_columns(['7am'], ['EDR'], ['Signatures'], ['AB-Reg', 'AB-Fed', 'AB-Pres'], ['Ballots'])
+TURNOUT_2000S = turnout_columns(['7AM'], ['EDR'], ['Signatures'], ['RegMilAB', 'FedAB', 'PresAB'], ['TotVoters'])
+
+# District contests of each precinct file, kept per precinct only: (office, [(party, column), ...])
+def district_contests(house=None, senate=None, congress=None):
+    contests = [('U.S. House', congress), ('State Senate', senate), ('State House', house)]
+    return tuple((office, tuple(parties)) for office, parties in contests if parties)
+
+def ir_columns(prefix):
+    """The 1990s files' <prefix>IR / <prefix>DFL / <prefix>Other columns"""
+    return [('R', prefix + 'IR'), ('DFL', prefix + 'DFL'), ('Other', prefix + 'Other')]
+
+# The 1992, 1996 and 1998 files have no congressional district column, so their
+# U.S. House votes cannot be placed in a district
+DISTRICT_CONTESTS = {
+    1992: district_contests(house=ir_columns('MNLeg'), senate=ir_columns('MNSen')),
+    1994: district_contests(house=ir_columns('MNLeg'), congress=ir_columns('Cong')),
+    1996: district_contests(house=ir_columns('MNLeg'), senate=ir_columns('MNSen')),
+    1998: district_contests(house=ir_columns('MNLeg')),
+    2000: district_contests(
+        house=[('R', 'R_HSE'), ('DFL', 'DFL_HSE'), ('IND', 'IND_HSE'), ('CP', 'CP_HSE'),
+               ('LIB', 'LIB_HSE'), ('GP', 'GREEN_HSE')],
+        senate=[('R', 'R_SEN'), ('DFL', 'DFL_SEN'), ('IND', 'IND_SEN'), ('CP', 'CP_SEN'), ('NP', 'NP_SEN')],
+        congress=[('R', 'R_CONG'), ('DFL', 'DFL_CONG'), ('IND', 'IND_CONG'), ('Other', 'OTHER_CONG'),
+                  ('CP', 'CP_CONG'), ('LIB', 'LIB_CONG')]),
+    2004: district_contests(
+        house=[('R', 'MnLegR'), ('DFL', 'MnLegDFL'), ('GP', 'MNLegGr'), ('IND', 'MNLegI'), ('WI', 'MnLegWI')],
+        congress=[('R', 'USCongR'), ('DFL', 'USCongDFL'), ('GP', 'USCongGr'), ('IND', 'USCongI'),
+                  ('WI', 'USCongWI')]),
+    2006: district_contests(
+        house=[('R', 'StateHouseR'), ('DFL', 'StateHouseDFL'), ('IND', 'StateHouseIP'), ('WI', 'StateHouseWI')],
+        senate=[('R', 'StateSenR'), ('DFL', 'StateSenDFL'), ('IND', 'StateSenIP'), ('WI', 'StateSenWI')],
+        congress=[('R', 'CongR'), ('DFL', 'CongDFL'), ('IND', 'CongIP'), ('WI', 'CongWI')]),
+    2008: district_contests(
+        house=[('R', 'MNLEGR'), ('DFL', 'MNLEGDFL'), ('IND', 'MNLEGIP'), ('WI', 'MNLEGWI')],
+        senate=[('R', 'MNSENR'), ('DFL', 'MNSENDFL'), ('WI', 'MNSENWI')],
+        congress=[('R', 'CONGR'), ('DFL', 'CONGDFL'), ('IND', 'CONGIP'), ('WI', 'CONGWI')]),
+    2010: district_contests(
+        house=[('R', 'MNLEGR'), ('DFL', 'MNLEGDFL'), ('IND', 'MNLEGIP'), ('WI', 'MNLEGWI')],
+        senate=[('R', 'MNSENR'), ('DFL', 'MNSENDFL'), ('IND', 'MNSENIP'), ('WI', 'MNSENWI')],
+        congress=[('R', 'CONGR'), ('DFL', 'CONGDFL'), ('IND', 'CONGIP'), ('WI', 'CONGWI')]),
+    2024: district_contests(
+        house=[('R', 'MNLEGR'), ('DFL', 'MNLEGDFL'), ('WI', 'MNLEGWI')],
+        senate=[('R', 'MNSENR'), ('DFL', 'MNSENDFL'), ('WI', 'MNSENWI')],
+        congress=[('R', 'USREPR'), ('DFL', 'USREPDFL'), ('WI', 'USREPWI')]),
+}
+
+# Precinct code and name, district and turnout columns of each year's precinct
+# file, for the VTD-keyed precinct output written next to the county CSV
+PRECINCT_SPECS = {
+    1992: PrecinctSpec('PRCT', 'Precinct Name', (('legislative', 'LEG'),), TURNOUT_1990S),
+    1994: PrecinctSpec('PRCT', 'Precinct Name', (('congressional', 'CG'), ('legislative', 'LEG')), TURNOUT_1990S),
+    1996: PrecinctSpec('PRCT', 'Precinct Name', (('legislative', 'LEG'),), TURNOUT_1990S),
+    1998: PrecinctSpec('PRCT', 'Precinct Name', (('legislative', 'LEG'),), TURNOUT_1990S),
+    2000: PrecinctSpec('PRCT', 'PRECINCT NAME', (('congressional', 'CG'), ('legislative', 'LEG')),
+                       turnout_columns(['7am'], ['New'], ['Sign'], ['RegA', 'FedA', 'PrzA'], ['Totl'])),
+    2002: PrecinctSpec('PRCT', 'PRECINCT NAME', (('congressional', 'CG'), ('legislative', 'LEG'))),
+    2004: PrecinctSpec('PRCT', 'PrecinctName', (('congressional', 'CG'), ('legislative', 'LEG')),
+                       turnout_columns(['7AM'], ['EDR'], ['Sigs'], ['RegMilAb', 'FedAb', 'PresAb'], ['TotVoters'])),
+    2006: PrecinctSpec('PRCT', 'PrecinctName', (('congressional', 'CG'), ('legislative', 'LEG')),
+                       turnout_columns(['Registered'], ['EDR'], ['Signature'], ['RegMilAB', 'FEDAB', 'PresAB'],
+                                       ['TotVoters'])),
+    2008: PrecinctSpec('PRCT', 'Precinct Name', (('congressional', 'CG'), ('legislative', 'LEG')), TURNOUT_2000S),
+    2010: PrecinctSpec('Precinct Code', 'Precinct Name', (('congressional', 'CG'), ('legislative', 'LEG')),
+                       TURNOUT_2000S),
+    2024: PrecinctSpec('PCTCODE', 'PCTNAME', (('congressional', 'CONGDIST'), ('state_senate', 'MNSENDIST'),
+                                              ('legislative', 'MNLEGDIST')),
+                       turnout_columns(['REG7AM'], ['EDR'], ['SIGNATURES'], ['AB_MB', 'FEDONLYAB', 'PRESONLYAB'],
+                                       ['TOTVOTING'])),
+}
+PRECINCT_SPECS = {year: spec._replace(contests=DISTRICT_CONTESTS.get(year, ()))
+                  for year, spec in PRECINCT_SPECS.items()}
+
+# Custom headers for the messy 2006 aligned file
+HEADERS_2006_ALIGNED = [
+    'PrecinctName','WD','CG','LEG','CM','SW','MCDName','JD','StateMCD','PRCT','County_ID','Fips',
+    'Registered','EDR','Signature','RegMilAB','FEDAB','PresAB','TotVoters','VSCode','EquipmentModel',
+    'USSenR','USSenDFL','USSenIP','USSenWI','USSenTOT',
+    'GovR','GovDFL','GovIP','GovWI','GovTOT',
+    'AttGenR','AttGenDFL','AttGenIP','AttGenWI','AttGenTOT',
+    'SOSR','SOSDFL','SOSIP','SOSWI','SOSTOT',
+    'STAUDR','STAUDDFL','STAUDIP','STAUDWI','STAUDTOT',
+    'CongR','CongDFL','CongIP','CongWI','CongTOT',
+    'StateSenR','StateSenDFL','StateSenIP','StateSenWI','StateSenTOT',
+    'StateHouseR','StateHouseDFL','StateHouseIP','StateHouseWI','StateHouseTOT'
+]
+
+def county_from_codes(fields, row):
+    """County from the first of `fields` present in the row (county code or FIPS)"""
+    for field in fields:
+        value = row.get(field)
+        if value is not None:
+            return COUNTY_ALIASES.get(value.strip())
+    return None
+
+def county_by_code(*fields):
+    """Row -> County from the first present code column (county code or FIPS)
+
+    Returned as a partial rather than a closure so it can be sent to worker processes.
+    """
+    return partial(county_from_codes, fields)
+
+def county_by_name(field):
+    """Row -> County from a county/MCD name column"""
+    return lambda row: resolve_county(row.get(field) or '')
 
 def convert_aligned_precinct_file(input_file, year, output_file):
     """Convert aligned precinct files (1992, 1994, 1996) to county level"""
-    print(f"\nProcessing {year}: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    # Increase CSV field size limit
-    import csv, sys
-    maxInt = sys.maxsize
-    while True:
-        try:
-            csv.field_size_limit(maxInt)
-            break
-        except OverflowError:
-            maxInt = int(maxInt/10)
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        # Strip leading/trailing spaces from column names
-        reader.fieldnames = [name.strip() if name else name for name in reader.fieldnames]
-        
-        for row in reader:
-            # Use CC or FIPS column
-            county_code = row.get('CC', row.get('FIPS', '')).strip()
-            if not county_code:
-                continue
-            
-            # Handle 3-digit FIPS codes (Minnesota uses odd numbers: 001, 003, 005...)
-            # Convert to sequential county code: FIPS = (CountyCode × 2) - 1
-            if len(county_code) == 3:
-                county_code = str((int(county_code) + 1) // 2).zfill(2)
-            else:
-                county_code = county_code.zfill(2)
-            
-            if county_code not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # Different years have different column names
-            if year == 1992:
-                # President: PresIR, PresDFL, PresOther
-                for party, col in [('R', 'PresIR'), ('DFL', 'PresDFL'), ('Other', 'PresOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['President'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-            
-            elif year == 1994:
-                # Governor: GovIR, GovDFL, GovOther
-                for party, col in [('R', 'GovIR'), ('DFL', 'GovDFL'), ('Other', 'GovOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['Governor'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-                
-                # U.S. Senate: USSenIR, USSenDFL, USSenOther
-                for party, col in [('R', 'USSenIR'), ('DFL', 'USSenDFL'), ('Other', 'USSenOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['U.S. Senate'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-                
-                # All statewide offices
-                for office, prefix in [
-                    ('Secretary of State', 'SOS'),
-                    ('Attorney General', 'AG'),
-                    ('State Auditor', 'Aud'),
-                    ('State Treasurer', 'Treas')
-                ]:
-                    for party, suffix in [('R', 'IR'), ('DFL', 'DFL'), ('Other', 'Other')]:
-                        col = f'{prefix}{suffix}'
-                        try:
-                            votes = int(row.get(col, '0').strip() or '0')
-                            if votes > 0:
-                                county_results[county][office][party] += votes
-                        except (ValueError, KeyError):
-                            continue
-            
-            elif year == 1996:
-                # President: PresRP, PresIR, PresDFL, PresOther
-                for party, col in [('RP', 'PresRP'), ('R', 'PresIR'), ('DFL', 'PresDFL'), ('Other', 'PresOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['President'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-                
-                # U.S. Senate: USSenIR, USSenDFL, USSenOther
-                for party, col in [('R', 'USSenIR'), ('DFL', 'USSenDFL'), ('Other', 'USSenOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['U.S. Senate'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-            
-            elif year == 1998:
-                # Governor: GovIR, GovDFL, GovRP, GovOther
-                for party, col in [('R', 'GovIR'), ('DFL', 'GovDFL'), ('RP', 'GovRP'), ('Other', 'GovOther')]:
-                    try:
-                        votes = int(row.get(col, '0').strip() or '0')
-                        if votes > 0:
-                            county_results[county]['Governor'][party] += votes
-                    except (ValueError, KeyError):
-                        continue
-                
-                # All statewide offices
-                for office, prefix in [
-                    ('Secretary of State', 'SOS'),
-                    ('Attorney General', 'AG'),
-                    ('State Auditor', 'Aud'),
-                    ('State Treasurer', 'Treas')
-                ]:
-                    for party, suffix in [('R', 'IR'), ('DFL', 'DFL'), ('RP', 'RP'), ('MTP', 'MTP'), ('Other', 'Other')]:
-                        col = f'{prefix}{suffix}'
-                        try:
-                            votes = int(row.get(col, '0').strip() or '0')
-                            if votes > 0:
-                                county_results[county][office][party] += votes
-                        except (ValueError, KeyError):
-                            continue
-    
-    write_results(county_results, year, output_file)
+    print(f"\nProcessing {year}: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Use CC or FIPS column (2-digit county code or 3-digit FIPS)
+    tally = tally_aligned(input_file, ['CC', 'FIPS'], ALIGNED_COLUMNS.get(year, []), parser,
+                          precinct_spec=PRECINCT_SPECS[year])
+
+    write_results(tally, year, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2000(input_file, output_file):
     """Convert 2000 election data from aligned precinct file"""
-    print(f"\nProcessing 2000: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        # Strip column names to remove leading/trailing spaces
-        reader.fieldnames = [name.strip() if name else name for name in reader.fieldnames]
-        
-        for row in reader:
-            # Use CC (county code) column from aligned file
-            county_code = row.get('CC', '').strip()
-            if not county_code or county_code not in FIPS_TO_COUNTY:
-                # Try zero-padding if needed
-                if county_code:
-                    county_code = county_code.zfill(2)
-                if not county_code or county_code not in FIPS_TO_COUNTY:
-                    continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # President
-            for party, col in [('R', 'R_PREZ'), ('DFL', 'DFL_PREZ'), ('GP', 'GREEN_PREZ'), 
-                              ('LIB', 'LIB_PREZ'), ('RP', 'RP_PREZ')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['President'][party] += votes
-                except ValueError:
-                    continue
-            
-            # U.S. Senate
-            for party, col in [('R', 'R_USSEN'), ('DFL', 'DFL_USSEN'), ('IND', 'IND_USSEN')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except ValueError:
-                    continue
-    
-    write_results(county_results, 2000, output_file)
+    print(f"\nProcessing 2000: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Use CC (county code) column from aligned file
+    tally = tally_aligned(input_file, ['CC'], COLUMNS_2000, parser, precinct_spec=PRECINCT_SPECS[2000])
+
+    write_results(tally, 2000, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2002_aligned(input_file, output_file):
     """Convert 2002 aligned precinct file to county level"""
-    print(f"\nProcessing 2002 aligned: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        # Skip first 2 rows, row 3 has headers
-        next(f)
-        next(f)
-        reader = csv.DictReader(f)
-        # Strip column names
-        reader.fieldnames = [name.strip() if name else name for name in reader.fieldnames]
-        
-        for row in reader:
-            county_code = (row.get('CC') or '').strip()
-            if not county_code:
-                continue
-            
-            county_code = county_code.zfill(2)
-            if county_code not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # U.S. Senate
-            for party, col in [('GP', 'USSenGP'), ('IND', 'USSenIP'), ('R', 'USSenR'), 
-                              ('DFL', 'USSenDFL'), ('CP', 'USSenCP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Governor
-            for party, col in [('GP', 'GovGP'), ('IND', 'GovIP'), ('R', 'GovR'), 
-                              ('DFL', 'GovDFL'), ('CP', 'GovCP'), ('I', 'GovI')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Governor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Secretary of State
-            for party, col in [('GP', 'SOSGP'), ('IND', 'SOSIP'), ('R', 'SOSR'), ('DFL', 'SOSDFL')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Secretary of State'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Attorney General
-            for party, col in [('IND', 'AGIP'), ('R', 'AGR'), ('DFL', 'AGDFL')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Attorney General'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # State Auditor
-            for party, col in [('GP', 'AudGP'), ('IND', 'AudIP'), ('R', 'AudR'), ('DFL', 'AudDFL')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['State Auditor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-    
-    write_results(county_results, 2002, output_file)
+    print(f"\nProcessing 2002 aligned: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Skip first 2 rows, row 3 has headers
+    tally = tally_aligned(input_file, ['CC'], COLUMNS_2002, parser, skip=2, precinct_spec=PRECINCT_SPECS[2002])
+
+    write_results(tally, 2002, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2002(input_file, output_file):
     """Convert 2002 election data using Fields.csv for column mapping"""
-    print(f"\nProcessing 2002: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
+    print(f"\nProcessing 2002: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
     # Read using the actual data row (row 3) as headers
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open_source(input_file) as f:
         lines = f.readlines()
-        # Row 3 (index 2) has the actual field names
-        headers = [h.strip() for h in lines[2].split(',')]
-        
-        for line in lines[3:]:
-            parts = [p.strip() for p in line.split(',')]
-            if len(parts) < len(headers):
-                parts.extend([''] * (len(headers) - len(parts)))
-            
-            row = dict(zip(headers, parts))
-            mcd_name = row.get('MCD NAME', '').strip()
-            county = normalize_county(mcd_name)
-            
-            if county not in COUNTY_CODES:
-                continue
-            
-            # According to Fields.csv:
-            # USSenGP, USSenIP, USSenR, Wellstone (DFL), USSenDFL, USSenCP, USSenWI
-            # GovGP, GovIP, GovR, GovDFL, GovCP, GovI, GovSW, GovWI
-            
-            # U.S. Senate
-            for party, col in [('GP', 'USSenGP'), ('IND', 'USSenIP'), ('R', 'USSenR'), 
-                              ('DFL', 'USSenDFL'), ('CP', 'USSenCP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Governor
-            for party, col in [('GP', 'GovGP'), ('IND', 'GovIP'), ('R', 'GovR'), 
-                              ('DFL', 'GovDFL'), ('CP', 'GovCP'), ('I', 'GovI')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Governor'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Secretary of State
-            for party, col in [('GP', 'SOSGP'), ('IND', 'SOSIP'), ('R', 'SOSR'), ('DFL', 'SOSDFL')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Secretary of State'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Attorney General
-            for party, col in [('IND', 'AGIP'), ('R', 'AGR'), ('DFL', 'AGDFL')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Attorney General'][party] += votes
-                except ValueError:
-                    continue
-            
-            # State Auditor
-            for party, col in [('GP', 'AudGP'), ('IND', 'AudIP'), ('R', 'AudR'), ('DFL', 'AudDFL')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['State Auditor'][party] += votes
-                except ValueError:
-                    continue
-    
-    write_results(county_results, 2002, output_file)
+
+    # Row 3 (index 2) has the actual field names
+    headers = [h.strip() for h in lines[2].split(',')]
+    rows = (dict(zip(headers, [p.strip() for p in line.split(',')])) for line in lines[3:])
+    tally = tally_columns(rows, county_by_name('MCD NAME'), COLUMNS_2002, parser,
+                          precinct_spec=PRECINCT_SPECS[2002])
+
+    write_results(tally, 2002, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2004(input_file, output_file):
     """Convert 2004 election data from precinct-level Results.csv format"""
-    print(f"\nProcessing 2004: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            # Use CC (County Code) column - it's already in the right format (01, 02, etc.)
-            county_code = row.get('CC', '').strip().zfill(2)
-            if not county_code or county_code not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # President: USPresGP, USPresR, USPresDFL, USPresSE, USPresSW, USPresCF, USPresBL, USPresC, USPresL
-            for party, col in [('R', 'USPresR'), ('DFL', 'USPresDFL'), ('GP', 'USPresGP'), 
-                              ('SE', 'USPresSE'), ('SWP', 'USPresSW'), ('CF', 'USPresCF'), 
-                              ('BL', 'USPresBL'), ('C', 'USPresC'), ('LIB', 'USPresL')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['President'][party] += votes
-                except (ValueError, TypeError):
-                    continue
-    
-    write_results(county_results, 2004, output_file)
+    print(f"\nProcessing 2004: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    with open_source(input_file) as f:
+        # Use CC (County Code) column - it's already in the right format (01, 02, etc.)
+        tally = tally_columns(csv.DictReader(f), county_by_code('CC'), COLUMNS_2004, parser,
+                              precinct_spec=PRECINCT_SPECS[2004])
+
+    write_results(tally, 2004, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2008(input_file, output_file):
     """Convert 2008 election data from Results.csv format"""
-    print(f"\nProcessing 2008: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            # Get county ID and map to county name (needs zero-padding: "1" -> "01")
-            county_id = row.get('CountyID', '').strip().zfill(2)
-            if not county_id or county_id not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_id]
-            
-            # President: USPRESR, USPRESDFL, USPRESGP, USPRESIND, etc.
-            for party, col in [('R', 'USPRESR'), ('DFL', 'USPRESDFL'), ('GP', 'USPRESGP'), 
-                              ('IND', 'USPRESIND'), ('SWP', 'USPRESSWP'), ('LIB', 'USPRESLIB'), 
-                              ('CP', 'USPRESCP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['President'][party] += votes
-                except (ValueError, TypeError):
-                    continue
-            
-            # U.S. Senate: USSENR, USSENDFL, USSENIP (Dean Barkley), USSENLIB, USSENCP
-            for party, col in [('R', 'USSENR'), ('DFL', 'USSENDFL'), ('IND', 'USSENIP'), 
-                              ('LIB', 'USSENLIB'), ('CP', 'USSENCP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except (ValueError, TypeError):
-                    continue
-    
-    write_results(county_results, 2008, output_file)
+    print(f"\nProcessing 2008: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    with open_source(input_file) as f:
+        # CountyID is unpadded ("1"); both "1" and "01" are known codes
+        tally = tally_columns(csv.DictReader(f), county_by_code('CountyID'), COLUMNS_2008, parser,
+                              precinct_spec=PRECINCT_SPECS[2008])
+
+    write_results(tally, 2008, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2006(input_file, output_file):
     """Convert 2006 election data using Fields.csv for column mapping"""
-    print(f"\nProcessing 2006: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            mcd_name = row.get('MCDName', '').strip()
-            county = normalize_county(mcd_name)
-            
-            if county not in COUNTY_CODES:
-                continue
-            
-            # According to Fields.csv:
-            # U.S. Senate: USSenR, USSenDFL, USSenIP, USSenWI
-            for party, col in [('R', 'USSenR'), ('DFL', 'USSenDFL'), ('IND', 'USSenIP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Governor: GovR, GovDFL, GovIP, GovWI
-            for party, col in [('R', 'GovR'), ('DFL', 'GovDFL'), ('IND', 'GovIP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Governor'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Attorney General: AttGenR, AttGenDFL, AttGenIP, AttGenWI
-            for party, col in [('R', 'AttGenR'), ('DFL', 'AttGenDFL'), ('IND', 'AttGenIP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Attorney General'][party] += votes
-                except ValueError:
-                    continue
-            
-            # Secretary of State: SOSR, SOSDFL, SOSIP, SOSWI
-            for party, col in [('R', 'SOSR'), ('DFL', 'SOSDFL'), ('IND', 'SOSIP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['Secretary of State'][party] += votes
-                except ValueError:
-                    continue
-            
-            # State Auditor: STAUDR, STAUDDFL, STAUDIP, STAUDWI
-            for party, col in [('R', 'STAUDR'), ('DFL', 'STAUDDFL'), ('IND', 'STAUDIP')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county]['State Auditor'][party] += votes
-                except ValueError:
-                    continue
-    
-    write_results(county_results, 2006, output_file)
+    print(f"\nProcessing 2006: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    with open_source(input_file) as f:
+        tally = tally_columns(csv.DictReader(f), county_by_name('MCDName'), COLUMNS_2006, parser)
+
+    write_results(tally, 2006, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2006_aligned(input_file, output_file):
     """Convert 2006 aligned precinct file to county level"""
-    print(f"\nProcessing 2006 aligned: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    # Custom headers for the messy 2006 file
-    headers = ['PrecinctName','WD','CG','LEG','CM','SW','MCDName','JD','StateMCD','PRCT','County_ID','Fips',
-               'Registered','EDR','Signature','RegMilAB','FEDAB','PresAB','TotVoters','VSCode','EquipmentModel',
-               'USSenR','USSenDFL','USSenIP','USSenWI','USSenTOT',
-               'GovR','GovDFL','GovIP','GovWI','GovTOT',
-               'AttGenR','AttGenDFL','AttGenIP','AttGenWI','AttGenTOT',
-               'SOSR','SOSDFL','SOSIP','SOSWI','SOSTOT',
-               'STAUDR','STAUDDFL','STAUDIP','STAUDWI','STAUDTOT',
-               'CongR','CongDFL','CongIP','CongWI','CongTOT',
-               'StateSenR','StateSenDFL','StateSenIP','StateSenWI','StateSenTOT',
-               'StateHouseR','StateHouseDFL','StateHouseIP','StateHouseWI','StateHouseTOT']
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        # Skip the messy header row and use custom fieldnames
-        next(f)
-        reader = csv.DictReader(f, fieldnames=headers)
-        
-        for row in reader:
-            if row is None:
-                continue
-            
-            county_code = (row.get('County_ID') or '').strip()
-            if not county_code:
-                continue
-            
-            # Handle 3-digit FIPS codes
-            if len(county_code) == 3:
-                county_code = str((int(county_code) + 1) // 2).zfill(2)
-            else:
-                county_code = county_code.zfill(2)
-            
-            if county_code not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # U.S. Senate
-            for party, col in [('R', 'USSenR'), ('DFL', 'USSenDFL'), ('IND', 'USSenIP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['U.S. Senate'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Governor
-            for party, col in [('R', 'GovR'), ('DFL', 'GovDFL'), ('IND', 'GovIP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Governor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Attorney General
-            for party, col in [('R', 'AttGenR'), ('DFL', 'AttGenDFL'), ('IND', 'AttGenIP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Attorney General'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Secretary of State
-            for party, col in [('R', 'SOSR'), ('DFL', 'SOSDFL'), ('IND', 'SOSIP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Secretary of State'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # State Auditor
-            for party, col in [('R', 'STAUDR'), ('DFL', 'STAUDDFL'), ('IND', 'STAUDIP')]:
-                try:
-                    votes = int((row.get(col) or '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['State Auditor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-    
-    write_results(county_results, 2006, output_file)
+    print(f"\nProcessing 2006 aligned: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Replace the messy multi-line header with custom fieldnames
+    # County_ID is either the county code or the 3-digit FIPS code
+    tally = tally_aligned(input_file, ['County_ID'], COLUMNS_2006, parser, fieldnames=HEADERS_2006_ALIGNED,
+                          precinct_spec=PRECINCT_SPECS[2006])
+
+    write_results(tally, 2006, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2010_aligned(input_file, output_file):
     """Convert 2010 aligned precinct file to county level"""
-    print(f"\nProcessing 2010 aligned: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        # Strip column names
-        reader.fieldnames = [name.strip() if name else name for name in reader.fieldnames]
-        
-        for row in reader:
-            county_code = row.get('CountyID', '').strip()
-            if not county_code:
-                continue
-            
-            # Handle 3-digit FIPS codes
-            if len(county_code) == 3:
-                county_code = str((int(county_code) + 1) // 2).zfill(2)
-            else:
-                county_code = county_code.zfill(2)
-            
-            if county_code not in FIPS_TO_COUNTY:
-                continue
-            
-            county = FIPS_TO_COUNTY[county_code]
-            
-            # Governor
-            for party, col in [('R', 'GOVR'), ('DFL', 'GOVDFL'), ('IND', 'GOVIP'), ('GP', 'GOVGP'), ('TRP', 'GOVTRP'), ('GR', 'GOVGR'), ('EDP', 'GOVEDP')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Governor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # MN State Senate
-            for party, col in [('R', 'MNSENR'), ('DFL', 'MNSENDFL'), ('IND', 'MNSENIP')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['State Senate'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Attorney General
-            for party, col in [('R', 'ATGENR'), ('DFL', 'ATGENDFL'), ('IND', 'ATGENIP'), ('TRP', 'ATGENTRP')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Attorney General'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # Secretary of State
-            for party, col in [('R', 'SOSR'), ('DFL', 'SOSDFL'), ('IND', 'SOSIP')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['Secretary of State'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-            
-            # State Auditor
-            for party, col in [('R', 'STAUDR'), ('DFL', 'STAUDDFL'), ('IND', 'STAUDIP')]:
-                try:
-                    votes = int(row.get(col, '0').strip() or '0')
-                    if votes > 0:
-                        county_results[county]['State Auditor'][party] += votes
-                except (ValueError, KeyError):
-                    continue
-    
-    write_results(county_results, 2010, output_file)
+    print(f"\nProcessing 2010 aligned: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # CountyID is either the county code or the 3-digit FIPS code
+    tally = tally_aligned(input_file, ['CountyID'], COLUMNS_2010, parser, precinct_spec=PRECINCT_SPECS[2010])
+
+    write_results(tally, 2010, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def convert_2024(input_file, output_file):
     """Convert 2024 which has a wide format with vote totals in columns"""
-    print(f"\nProcessing 2024: {os.path.basename(input_file)}")
-    
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            county_code = row['COUNTYCODE'].zfill(2)
-            county_name = row['COUNTYNAME']
-            
-            # President columns: USPRSR, USPRSDFL, USPRSLIB, USPRSWTP, USPRSG, USPRSSLP, USPRSSWP, USPRSJFA, USPRSIND
-            for party, col in [('R', 'USPRSR'), ('DFL', 'USPRSDFL'), ('LIB', 'USPRSLIB'),
-                              ('WTP', 'USPRSWTP'), ('G', 'USPRSG'), ('SLP', 'USPRSSLP'),
-                              ('SWP', 'USPRSSWP'), ('JFA', 'USPRSJFA'), ('IND', 'USPRSIND')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county_name]['President'][party] += votes
-                except ValueError:
-                    continue
-            
-            # U.S. Senate columns: USSENR, USSENDFL, USSENLIB, USSENIA
-            for party, col in [('R', 'USSENR'), ('DFL', 'USSENDFL'), ('LIB', 'USSENLIB'), ('IA', 'USSENIA')]:
-                try:
-                    votes = int(row.get(col, '0') or '0')
-                    if votes > 0:
-                        county_results[county_name]['U.S. Senate'][party] += votes
-                except ValueError:
-                    continue
-    
-    write_results(county_results, 2024, output_file)
+    print(f"\nProcessing 2024: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Statewide precinct file; large enough to be worth splitting across cores
+    tally_rows = partial(tally_columns, county_of=county_by_code('COUNTYCODE'), office_columns=COLUMNS_2024,
+                         precinct_spec=PRECINCT_SPECS[2024])
+    tally = parallel_tally(input_file, tally_rows, parser, workers=WORKERS)
+
+    write_results(tally, 2024, output_file)
     print(f"  ✓ Created: {output_file}")
+    LEDGER.report(parser.source)
 
 def aggregate_precinct_to_county(input_file, output_file):
     """Aggregate precinct-level OpenElections format to county level"""
-    print(f"\nAggregating precinct data: {os.path.basename(input_file)}")
-    
-    county_data = {}
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            county = row.get('county', '').strip()
-            office = row.get('office', '').strip()
-            district = row.get('district', '').strip()
-            party = row.get('party', '').strip()
-            candidate = row.get('candidate', '').strip()
-            votes = int(row.get('votes', 0))
-            
-            key = (county, office, district, party, candidate)
-            if key in county_data:
-                county_data[key] += votes
-            else:
-                county_data[key] = votes
-    
-    # Write aggregated results
+    print(f"\nAggregating precinct data: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
+
+    # Offices are keyed by (office, district) and parties by (party, candidate)
+    tally = parallel_tally(input_file, tally_precinct_rows, parser, workers=WORKERS)
+
+    # Write aggregated results; zero-vote rows from the source are kept
     results = []
-    for (county, office, district, party, candidate), votes in sorted(county_data.items()):
-        normalized_county = normalize_county(county)
-        county_code = COUNTY_CODES.get(normalized_county, '')
-        results.append([county_code, normalized_county, office, district, party, candidate, str(votes), ''])
-    
-    # Calculate percentages
-    office_totals = {}
-    for row in results:
-        county_code, county, office, district = row[0], row[1], row[2], row[3]
-        votes = int(row[6])
-        key = (county_code, office, district)
-        if key in office_totals:
-            office_totals[key] += votes
-        else:
-            office_totals[key] = votes
-    
-    for row in results:
-        county_code, county, office, district = row[0], row[1], row[2], row[3]
-        votes = int(row[6])
-        key = (county_code, office, district)
-        total = office_totals[key]
+    for county, (office, district), (party, candidate), votes, total in tally.rows():
         pct = (votes / total * 100) if total > 0 else 0
-        row[7] = f'{pct:.2f}'
-    
+        results.append([county.code, county.name, office, district, party, candidate, str(votes), f'{pct:.2f}'])
+
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['county_code', 'county', 'office', 'district', 'party', 'candidate', 'votes', 'pct'])
         writer.writerows(results)
-    
+
     print(f"  ✓ Created: {output_file} ({len(results)} rows)")
+    LEDGER.report(parser.source)
+
+def write_results(tally, year, output_file):
+    """Write county results to OpenElections format, plus the precinct columns when the tally kept them"""
+    if tally.precincts is not None:
+        write_precincts(tally.precincts, year, os.path.join(os.path.dirname(output_file), f'mn_precincts_{year}.json'),
+                        candidate_of=get_candidate_name)
 
-def write_results(county_results, year, output_file):
-    """Write county results to OpenElections format"""
     results = []
-    
-    for county in sorted(county_results.keys()):
-        county_code = COUNTY_CODES[county]
-        for office in sorted(county_results[county].keys()):
-            party_votes = county_results[county][office]
-            total = sum(party_votes.values())
-            
-            for party, votes in sorted(party_votes.items()):
-                if votes > 0:
-                    candidate = get_candidate_name(year, office, party)
-                    pct = (votes / total * 100) if total > 0 else 0
-                    results.append([
-                        county_code, county, office, '',
-                        party, candidate, str(votes), f'{pct:.2f}'
-                    ])
-    
+
+    for county, office, party, votes, total in tally.rows():
+        candidate = get_candidate_name(year, office, party)
+        pct = (votes / total * 100) if total > 0 else 0
+        results.append([
+            county.code, county.name, office, '',
+            party, candidate, str(votes), f'{pct:.2f}'
+        ])
+
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['county_code', 'county', 'office', 'district', 'party', 'candidate', 'votes', 'pct'])
@@ -815,18 +414,26 @@ def write_results(county_results, year, output_file):
 if __name__ == "__main__":
     data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
     
+    # --max-rejects N: fail the run when more than N vote cells could not be parsed
+    if '--max-rejects' in sys.argv:
+        LEDGER.max_rejects = int(sys.argv[sys.argv.index('--max-rejects') + 1])
+    
+    # --workers N: processes used to parse one large precinct CSV
+    if '--workers' in sys.argv:
+        WORKERS = int(sys.argv[sys.argv.index('--workers') + 1])
+    
     print("="*60)
     print("Converting Outlier Election Files")
     print("="*60)
     
     # 1992, 1994, 1996, 1998 with aligned files
     for year, filename in [
-        (1992, '1992_Vote_Stats.csv'),
-        (1994, '1994_Vote_Stats.csv'),
+        (1992, '1992_Vote_Stats-aligned.csv'),
+        (1994, '1994_Vote_Stats-aligned.csv'),
         (1996, '1996_Vote_Stats-aligned.csv'),
         (1998, '1998_Vote_Stats-aligned.csv')
     ]:
-        input_path = os.path.join(data_dir, filename)
+        input_path = find_source(data_dir, filename)
         output_name = {
             1992: '19921103__mn__general__county.csv',
             1994: '19941108__mn__general__county.csv',
@@ -835,56 +442,64 @@ if __name__ == "__main__":
         }[year]
         output_path = os.path.join(data_dir, output_name)
         
-        if os.path.exists(input_path):
+        if input_path:
             convert_aligned_precinct_file(input_path, year, output_path)
     
     # 2000
-    if os.path.exists(os.path.join(data_dir, 'full_00results-aligned.csv')):
+    source = find_source(data_dir, 'full_00results-aligned.csv')
+    if source:
         convert_2000(
-            os.path.join(data_dir, 'full_00results-aligned.csv'),
+            source,
             os.path.join(data_dir, '20001107__mn__general__county.csv')
         )
     
     # 2002
-    if os.path.exists(os.path.join(data_dir, '2002_general_results - Aligned Results.csv')):
+    source = find_source(data_dir, '2002_general_results - Aligned Results.csv')
+    if source:
         convert_2002_aligned(
-            os.path.join(data_dir, '2002_general_results - Aligned Results.csv'),
+            source,
             os.path.join(data_dir, '20021105__mn__general__county.csv')
         )
     
     # 2004
-    if os.path.exists(os.path.join(data_dir, '2004_general_results.csv')):
+    source = find_source(data_dir, '2004_general_results.csv')
+    if source:
         convert_2004(
-            os.path.join(data_dir, '2004_general_results.csv'),
+            source,
             os.path.join(data_dir, '20041102__mn__general__county.csv')
         )
     
     # 2006
-    if os.path.exists(os.path.join(data_dir, '2006_general_results - Aligned Results.csv')):
+    source = find_source(data_dir, '2006_general_results - Aligned Results.csv')
+    if source:
         convert_2006_aligned(
-            os.path.join(data_dir, '2006_general_results - Aligned Results.csv'),
+            source,
             os.path.join(data_dir, '20061107__mn__general__county.csv')
         )
     
     # 2008
-    if os.path.exists(os.path.join(data_dir, '2008_general_results - Results.csv')):
+    source = find_source(data_dir, '2008_general_results - Results.csv')
+    if source:
         convert_2008(
-            os.path.join(data_dir, '2008_general_results - Results.csv'),
+            source,
             os.path.join(data_dir, '20081104__mn__general__county.csv')
         )
     
     # 2010
-    if os.path.exists(os.path.join(data_dir, '2010_general_results_final - Aligned Results.csv')):
+    source = find_source(data_dir, '2010_general_results_final - Aligned Results.csv')
+    if source:
         convert_2010_aligned(
-            os.path.join(data_dir, '2010_general_results_final - Aligned Results.csv'),
+            source,
             os.path.join(data_dir, '20101102__mn__general__county.csv')
         )
     
     # 2024 special format
-    convert_2024(
-        os.path.join(data_dir, '2024-general-federal-state-results-by-precinct-official - Precinct-Results.csv'),
-        os.path.join(data_dir, '20241105__mn__general__county.csv')
-    )
+    source = find_source(data_dir, '2024-general-federal-state-results-by-precinct-official - Precinct-Results.csv')
+    if source:
+        convert_2024(
+            source,
+            os.path.join(data_dir, '20241105__mn__general__county.csv')
+        )
     
     # 2020-2022 precinct aggregation
     precinct_files = [
@@ -893,11 +508,16 @@ if __name__ == "__main__":
     ]
     
     for input_name, output_name in precinct_files:
-        input_path = os.path.join(data_dir, input_name)
+        input_path = find_source(data_dir, input_name)
         output_path = os.path.join(data_dir, output_name)
-        if os.path.exists(input_path):
+        if input_path:
             aggregate_precinct_to_county(input_path, output_path)
     
     print("\n" + "="*60)
     print("All outlier files converted!")
     print("="*60)
+    
+    LEDGER.report()
+    if LEDGER.exceeded():
+        print(f"  ✗ More than {LEDGER.max_rejects} rejected vote cells")
+        sys.exit(1)
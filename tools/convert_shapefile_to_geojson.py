@@ -4,23 +4,37 @@ Convert Minnesota county shapefile to GeoJSON format
 
 import geopandas as gpd
 import json
+import os
+from source_io import gdal_path, source_name
+
+def write_geojson(gdf, output_path, id_column='GEOID20'):
+    """
+    Write a GeoDataFrame as GeoJSON with an integer top-level feature id
+    (the GEOID as a number, e.g. 27001). Mapbox feature-state needs numeric ids,
+    and the results JSON carries the same value as each county's feature_id
+    """
+    collection = json.loads(gdf.to_json())
+    for feature in collection['features']:
+        feature['id'] = int(feature['properties'][id_column])
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(collection, f)
 
 def convert_shapefile_to_geojson():
     """Convert the MN county shapefile to GeoJSON"""
     
-    # Input shapefile path
-    shapefile_path = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data\tl_2020_27_county20\tl_2020_27_county20.shp"
+    data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
+    
+    # Input shapefile, read straight out of the TIGER zip (no extract step)
+    shapefile_path = os.path.join(data_dir, "tl_2020_27_county20.zip", "tl_2020_27_county20.shp")
     
     # Output GeoJSON path - use same base name as shapefile
-    import os
-    base_name = os.path.splitext(os.path.basename(shapefile_path))[0]
-    data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
+    base_name = os.path.splitext(source_name(shapefile_path))[0]
     output_path = os.path.join(data_dir, f"{base_name}.geojson")
     
     print(f"Reading shapefile: {shapefile_path}")
     
     # Read the shapefile
-    gdf = gpd.read_file(shapefile_path)
+    gdf = gpd.read_file(gdal_path(shapefile_path))
     
     # Display information about the data
     print(f"\nShapefile loaded successfully!")
@@ -36,8 +50,8 @@ def convert_shapefile_to_geojson():
     print(f"\nConverting to GeoJSON (EPSG:4326)...")
     gdf_wgs84 = gdf.to_crs(epsg=4326)
     
-    # Save as GeoJSON
-    gdf_wgs84.to_file(output_path, driver='GeoJSON')
+    # Save as GeoJSON, with GEOID20 as the integer feature id
+    write_geojson(gdf_wgs84, output_path)
     
     print(f"\n✓ GeoJSON saved to: {output_path}")
     print(f"  - {len(gdf_wgs84)} counties")
@@ -58,7 +72,7 @@ def convert_shapefile_to_geojson():
         'GEOID20': 'geoid'
     })
     
-    gdf_simplified.to_file(simplified_output, driver='GeoJSON')
+    write_geojson(gdf_simplified, simplified_output, id_column='geoid')
     print(f"\n✓ Simplified GeoJSON saved to: {simplified_output}")
     
     return output_path
@@ -6,115 +6,70 @@ OpenElections format: county_code,county,office,district,party,candidate,votes,p
 
 import csv
 import os
-from collections import defaultdict
+import sys
+from county_lookup import COUNTY_ALIASES, resolve_county
+from parallel_csv import parallel_tally
+from source_io import find_source, open_source, source_name
+from tally import tally_columns, tally_precinct_rows
+from vote_parsing import ParseLedger
 
-# County codes mapping
-COUNTY_CODES = {
-    'Aitkin': '01', 'Anoka': '02', 'Becker': '03', 'Beltrami': '04',
-    'Benton': '05', 'Big Stone': '06', 'Blue Earth': '07', 'Brown': '08',
-    'Carlton': '09', 'Carver': '10', 'Cass': '11', 'Chippewa': '12',
-    'Chisago': '13', 'Clay': '14', 'Clearwater': '15', 'Cook': '16',
-    'Cottonwood': '17', 'Crow Wing': '18', 'Dakota': '19', 'Dodge': '20',
-    'Douglas': '21', 'Faribault': '22', 'Fillmore': '23', 'Freeborn': '24',
-    'Goodhue': '25', 'Grant': '26', 'Hennepin': '27', 'Houston': '28',
-    'Hubbard': '29', 'Isanti': '30', 'Itasca': '31', 'Jackson': '32',
-    'Kanabec': '33', 'Kandiyohi': '34', 'Kittson': '35', 'Koochiching': '36',
-    'Lac qui Parle': '37', 'Lake': '38', 'Lake of the Woods': '39',
-    'Le Sueur': '40', 'Lincoln': '41', 'Lyon': '42', 'McLeod': '43',
-    'Mahnomen': '44', 'Marshall': '45', 'Martin': '46', 'Mille Lacs': '47',
-    'Morrison': '48', 'Mower': '49', 'Murray': '50', 'Nicollet': '51',
-    'Nobles': '52', 'Norman': '53', 'Olmsted': '54', 'Otter Tail': '55',
-    'Pennington': '56', 'Pine': '57', 'Pipestone': '58', 'Polk': '59',
-    'Pope': '60', 'Meeker': '61', 'Ramsey': '62', 'Red Lake': '63',
-    'Redwood': '64', 'Renville': '65', 'Rice': '66', 'Rock': '67',
-    'Roseau': '68', 'St. Louis': '69', 'Scott': '70', 'Sherburne': '71',
-    'Sibley': '72', 'Stearns': '73', 'Steele': '74', 'Stevens': '75',
-    'Swift': '76', 'Todd': '77', 'Traverse': '78', 'Wabasha': '79',
-    'Wadena': '80', 'Waseca': '81', 'Washington': '82', 'Watonwan': '83',
-    'Wilkin': '84', 'Winona': '85', 'Wright': '86', 'Yellow Medicine': '87'
-}
+# Rejected vote cells from every file converted in this run
+LEDGER = ParseLedger()
 
-# FIPS to County mapping
-FIPS_TO_COUNTY = {v: k for k, v in COUNTY_CODES.items()}
+# Worker processes for large precinct CSVs; None uses every core
+WORKERS = None
 
-def get_county_from_fips(fips):
-    """Convert FIPS code to county name"""
-    fips_str = str(fips).zfill(3)[-2:]  # Get last 2 digits
-    return FIPS_TO_COUNTY.get(fips_str, None)
-
-def normalize_county_name(county):
-    """Normalize county name variations"""
-    county = county.strip().title()
-    
-    # Remove "Twp", "Township", "City" suffixes
-    for suffix in [' Twp', ' Township', ' City']:
-        if county.endswith(suffix):
-            county = county[:-len(suffix)].strip()
-    
-    # Handle specific variations
-    replacements = {
-        'Saint Louis': 'St. Louis',
-        'St Louis': 'St. Louis',
-        'Bigstone': 'Big Stone',
-        'Blueearth': 'Blue Earth',
-        'Crowwing': 'Crow Wing',
-        'Lacquiparle': 'Lac Qui Parle',
-        'Lakeofthewoods': 'Lake Of The Woods',
-        'Lesueur': 'Le Sueur',
-        'Millelacs': 'Mille Lacs',
-        'Ottertail': 'Otter Tail',
-        'Redlake': 'Red Lake',
-        'Yellowmedicine': 'Yellow Medicine'
-    }
-    
-    for old, new in replacements.items():
-        if county.lower() == old.lower():
-            county = new
-    
-    return county
+# (candidate columns, office, party); the first column present in a file is used
+RACE_MAPPING = [
+    # President
+    (['PresRP', 'PresIR', 'PresR'], 'President', 'R'),
+    (['PresDFL'], 'President', 'DFL'),
+    (['PresOther', 'PresG', 'PresGP'], 'President', 'Other'),
+    
+    # U.S. Senate
+    (['USSenIR', 'USSenR'], 'U.S. Senate', 'R'),
+    (['USSenDFL'], 'U.S. Senate', 'DFL'),
+    (['USSenOther', 'USSenGP', 'USSenG'], 'U.S. Senate', 'Other'),
+    
+    # Governor
+    (['GovIR', 'GovR'], 'Governor', 'R'),
+    (['GovDFL'], 'Governor', 'DFL'),
+    (['GovRP', 'GovGP', 'GovOther'], 'Governor', 'Other'),
+    
+    # Secretary of State
+    (['SOSIR', 'SOSR'], 'Secretary of State', 'R'),
+    (['SOSDFL'], 'Secretary of State', 'DFL'),
+    (['SOSRP', 'SOSGP', 'SOSOther'], 'Secretary of State', 'Other'),
+    
+    # Attorney General
+    (['AGIR', 'AGR'], 'Attorney General', 'R'),
+    (['AGDFL'], 'Attorney General', 'DFL'),
+    (['AGRP', 'AGGP', 'AGOther'], 'Attorney General', 'Other'),
+    
+    # State Auditor
+    (['AudIR', 'AudR'], 'State Auditor', 'R'),
+    (['AudDFL'], 'State Auditor', 'DFL'),
+    (['AudRP', 'AudMTP', 'AudGP', 'AudOther'], 'State Auditor', 'Other'),
+    
+    # State Treasurer (where applicable)
+    (['TreasIR', 'TreasR'], 'State Treasurer', 'R'),
+    (['TreasDFL'], 'State Treasurer', 'DFL'),
+    (['TreasRP', 'TreasGP', 'TreasOther'], 'State Treasurer', 'Other'),
+]
 
 def aggregate_precinct_to_county(input_file, output_file):
     """Aggregate precinct-level OpenElections format to county level"""
-    print(f"\nAggregating precinct data: {os.path.basename(input_file)}")
+    print(f"\nAggregating precinct data: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
     
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    # Offices are keyed by (office, district) and parties by (party, candidate)
+    tally = parallel_tally(input_file, tally_precinct_rows, parser, workers=WORKERS)
     
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            county = row.get('county', '').strip()
-            office = row.get('office', '').strip()
-            district = row.get('district', '').strip()
-            party = row.get('party', '').strip()
-            candidate = row.get('candidate', '').strip()
-            votes = int(row.get('votes', 0))
-            
-            key = (office, district, party, candidate)
-            county_results[county][key] += votes
-    
-    # Write aggregated results
+    # Write aggregated results with percentages of each county/contest total
     results = []
-    for county in sorted(county_results.keys()):
-        county_code = COUNTY_CODES.get(county, '')
-        for (office, district, party, candidate), votes in sorted(county_results[county].items()):
-            results.append([county_code, county, office, district, party, candidate, str(votes), ''])
-    
-    # Calculate percentages
-    office_totals = defaultdict(lambda: defaultdict(int))
-    for row in results:
-        county_code, county, office, district = row[0], row[1], row[2], row[3]
-        votes = int(row[6])
-        key = (county_code, office, district)
-        office_totals[key] += votes
-    
-    for row in results:
-        county_code, county, office, district = row[0], row[1], row[2], row[3]
-        votes = int(row[6])
-        key = (county_code, office, district)
-        total = office_totals[key]
+    for county, (office, district), (party, candidate), votes, total in tally.rows():
         pct = (votes / total * 100) if total > 0 else 0
-        row[7] = f'{pct:.2f}'
+        results.append([county.code, county.name, office, district, party, candidate, str(votes), f'{pct:.2f}'])
     
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
@@ -123,16 +78,16 @@ def aggregate_precinct_to_county(input_file, output_file):
     
     print(f"  ✓ Created: {output_file}")
     print(f"    {len(results)} rows from precinct data")
+    LEDGER.report(parser.source)
     return len(results)
 
 def aggregate_to_county(input_file, year, output_file):
     """Aggregate precinct-level data to county level"""
     
-    print(f"\nProcessing {year}: {os.path.basename(input_file)}")
+    print(f"\nProcessing {year}: {source_name(input_file)}")
+    parser = LEDGER.parser(source_name(input_file))
     
-    county_results = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
+    with open_source(input_file) as f:
         reader = csv.DictReader(f)
         headers = reader.fieldnames
         
@@ -159,96 +114,42 @@ def aggregate_to_county(input_file, year, output_file):
             print(f"  ⚠ Warning: No county column found. Skipping.")
             return None
         
-        # Process each row
-        for row in reader:
-            # Get county
+        def county_of(row):
             if county_col and row.get(county_col):
-                county = normalize_county_name(row[county_col])
-            elif fips_col and row.get(fips_col):
-                county = get_county_from_fips(row[fips_col])
-            else:
-                continue
-            
-            # Skip if not a valid county
-            if county not in COUNTY_CODES:
-                continue
-            
-            # Define race mapping for statewide offices
-            race_mapping = [
-                # President
-                (['PresRP', 'PresIR', 'PresR'], 'President', 'R'),
-                (['PresDFL'], 'President', 'DFL'),
-                (['PresOther', 'PresG', 'PresGP'], 'President', 'Other'),
-                
-                # U.S. Senate
-                (['USSenIR', 'USSenR'], 'U.S. Senate', 'R'),
-                (['USSenDFL'], 'U.S. Senate', 'DFL'),
-                (['USSenOther', 'USSenGP', 'USSenG'], 'U.S. Senate', 'Other'),
-                
-                # Governor
-                (['GovIR', 'GovR'], 'Governor', 'R'),
-                (['GovDFL'], 'Governor', 'DFL'),
-                (['GovRP', 'GovGP', 'GovOther'], 'Governor', 'Other'),
-                
-                # Secretary of State
-                (['SOSIR', 'SOSR'], 'Secretary of State', 'R'),
-                (['SOSDFL'], 'Secretary of State', 'DFL'),
-                (['SOSRP', 'SOSGP', 'SOSOther'], 'Secretary of State', 'Other'),
-                
-                # Attorney General
-                (['AGIR', 'AGR'], 'Attorney General', 'R'),
-                (['AGDFL'], 'Attorney General', 'DFL'),
-                (['AGRP', 'AGGP', 'AGOther'], 'Attorney General', 'Other'),
-                
-                # State Auditor
-                (['AudIR', 'AudR'], 'State Auditor', 'R'),
-                (['AudDFL'], 'State Auditor', 'DFL'),
-                (['AudRP', 'AudMTP', 'AudGP', 'AudOther'], 'State Auditor', 'Other'),
-                
-                # State Treasurer (where applicable)
-                (['TreasIR', 'TreasR'], 'State Treasurer', 'R'),
-                (['TreasDFL'], 'State Treasurer', 'DFL'),
-                (['TreasRP', 'TreasGP', 'TreasOther'], 'State Treasurer', 'Other'),
-            ]
-            
-            # Extract votes for each race mapping
-            for col_names, office, party in race_mapping:
-                for col in col_names:
-                    if col in headers:
-                        votes_str = row.get(col, '0')
-                        try:
-                            votes = int(votes_str) if votes_str else 0
-                            if votes > 0:
-                                county_results[county][office][party] += votes
-                        except ValueError:
-                            continue
-                        break  # Found the column, no need to check other variants
+                return resolve_county(row[county_col])
+            if fips_col and row.get(fips_col):
+                return COUNTY_ALIASES.get(row[fips_col].strip())
+            return None
+        
+        # Resolve each race to the first of its columns this file has
+        office_columns = []
+        for col_names, office, party in RACE_MAPPING:
+            for col in col_names:
+                if col in headers:
+                    office_columns.append((office, [(party, col)]))
+                    break
+        
+        tally = tally_columns(reader, county_of, office_columns, parser)
     
     # Write results
-    if not county_results:
+    counties = tally.counties()
+    if not counties:
         print(f"  ⚠ No valid data extracted")
         return None
     
     results = []
-    for county in sorted(county_results.keys()):
-        county_code = COUNTY_CODES[county]
-        for office in sorted(county_results[county].keys()):
-            party_votes = county_results[county][office]
-            total = sum(party_votes.values())
-            
-            for party, votes in sorted(party_votes.items()):
-                if votes > 0:
-                    pct = (votes / total * 100) if total > 0 else 0
-                    results.append([
-                        county_code,
-                        county,
-                        office,
-                        '',  # district
-                        party,
-                        '',  # candidate - would need lookup
-                        str(votes),
-                        f'{pct:.2f}'
-                    ])
+    for county, office, party, votes, total in tally.rows():
+        pct = (votes / total * 100) if total > 0 else 0
+        results.append([
+            county.code,
+            county.name,
+            office,
+            '',  # district
+            party,
+            '',  # candidate - would need lookup
+            str(votes),
+            f'{pct:.2f}'
+        ])
     
     # Write to CSV
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
@@ -257,13 +158,22 @@ def aggregate_to_county(input_file, year, output_file):
         writer.writerows(results)
     
     print(f"  ✓ Created: {output_file}")
-    print(f"    {len(results)} rows, {len(county_results)} counties")
+    print(f"    {len(results)} rows, {len(counties)} counties")
+    LEDGER.report(parser.source)
     
     return len(results)
 
 if __name__ == "__main__":
     data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
     
+    # --max-rejects N: fail the run when more than N vote cells could not be parsed
+    if '--max-rejects' in sys.argv:
+        LEDGER.max_rejects = int(sys.argv[sys.argv.index('--max-rejects') + 1])
+    
+    # --workers N: processes used to parse one large precinct CSV
+    if '--workers' in sys.argv:
+        WORKERS = int(sys.argv[sys.argv.index('--workers') + 1])
+    
     # Files to convert from raw MN format
     conversions = [
         ('1992_Vote_Stats-aligned.csv', '1992', '19921103__mn__general__county.csv'),
@@ -290,10 +200,10 @@ if __name__ == "__main__":
     print("="*60)
     
     for input_name, year, output_name in conversions:
-        input_file = os.path.join(data_dir, input_name)
+        input_file = find_source(data_dir, input_name)
         output_file = os.path.join(data_dir, output_name)
         
-        if os.path.exists(input_file):
+        if input_file:
             if not os.path.exists(output_file):
                 aggregate_to_county(input_file, year, output_file)
             else:
@@ -306,10 +216,10 @@ if __name__ == "__main__":
     print("-"*60)
     
     for input_name, output_name in precinct_conversions:
-        input_file = os.path.join(data_dir, input_name)
+        input_file = find_source(data_dir, input_name)
         output_file = os.path.join(data_dir, output_name)
         
-        if os.path.exists(input_file):
+        if input_file:
             if not os.path.exists(output_file):
                 aggregate_precinct_to_county(input_file, output_file)
             else:
@@ -321,3 +231,8 @@ if __name__ == "__main__":
     print("Conversion complete!")
     print("All files now in OpenElections county format")
     print("="*60)
+    
+    LEDGER.report()
+    if LEDGER.exceeded():
+        print(f"  ✗ More than {LEDGER.max_rejects} rejected vote cells")
+        sys.exit(1)
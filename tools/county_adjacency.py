@@ -0,0 +1,71 @@
+"""
+Build the county adjacency graph from the TIGER county polygons
+Neighbour candidates come from the GeoDataFrame's spatial index (an STRtree)
+in one bulk query, so only polygons whose boxes overlap are ever compared.
+Counties are neighbours when they share a boundary segment (rook contiguity);
+corner-only contacts are dropped. The graph is saved as a CSR matrix in
+mn_county_adjacency.npz, rows in feature-id (GEOID) order:
+  indptr, indices  CSR structure (neighbours of row i: indices[indptr[i]:indptr[i + 1]])
+  feature_ids      GEOID of each row
+"""
+
+import os
+
+import geopandas as gpd
+import numpy as np
+
+from source_io import gdal_path
+
+# Shared boundary shorter than this (in metres) is a corner contact, not a border
+MIN_SHARED_BORDER = 1.0
+
+
+def adjacency_pairs(gdf, min_border=MIN_SHARED_BORDER):
+    """(i, j) row index pairs of neighbouring polygons, each pair in both directions"""
+    left, right = gdf.sindex.query(gdf.geometry, predicate='intersects')
+    keep = left < right
+    left, right = left[keep], right[keep]
+
+    # Rook contiguity: the shared boundary must have length, not just touch at a point
+    shared = gdf.geometry.iloc[left].boundary.reset_index(drop=True).intersection(
+        gdf.geometry.iloc[right].boundary.reset_index(drop=True))
+    border = shared.length.to_numpy() >= min_border
+    left, right = left[border], right[border]
+    return np.concatenate([left, right]), np.concatenate([right, left])
+
+
+def to_csr(rows, cols, n):
+    """indptr and indices of an n x n 0/1 matrix with ones at (rows, cols)"""
+    order = np.lexsort((cols, rows))
+    rows, cols = rows[order], cols[order]
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols.astype(np.int32)
+
+
+def build_adjacency(shapefile_path, output_path):
+    gdf = gpd.read_file(gdal_path(shapefile_path))
+    gdf = gdf.sort_values('GEOID20').reset_index(drop=True)
+    # Measure shared borders in metres (UTM 15N covers Minnesota)
+    gdf = gdf.to_crs(epsg=26915)
+
+    rows, cols = adjacency_pairs(gdf)
+    indptr, indices = to_csr(rows, cols, len(gdf))
+    feature_ids = gdf['GEOID20'].astype(int).to_numpy(dtype=np.int32)
+    np.savez_compressed(output_path, indptr=indptr, indices=indices, feature_ids=feature_ids)
+
+    degree = np.diff(indptr)
+    print(f"✓ Adjacency saved to: {output_path}")
+    print(f"  - {len(gdf)} counties, {len(indices) // 2} shared borders")
+    print(f"  - neighbours per county: min {degree.min()}, mean {degree.mean():.1f}, max {degree.max()}")
+    return indptr, indices, feature_ids
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Building county adjacency graph")
+    print("=" * 60 + "\n")
+
+    data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
+    shapefile_path = os.path.join(data_dir, "tl_2020_27_county20.zip", "tl_2020_27_county20.shp")
+    build_adjacency(shapefile_path, os.path.join(data_dir, "mn_county_adjacency.npz"))
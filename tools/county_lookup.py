@@ -0,0 +1,105 @@
+"""
+County lookup table shared by every converter
+Maps every known spelling or code of a Minnesota county to one canonical record:
+names (spaced, unspaced, any case), PDF/OCR variants, the 2-digit sequential
+county code, the 3-digit odd FIPS code and the 5-digit GEOID (the VTDID prefix)
+"""
+
+from collections import namedtuple
+
+County = namedtuple('County', ['index', 'name', 'code', 'fips', 'geoid'])
+
+STATE_FIPS = '27'
+
+# All 87 Minnesota counties in FIPS order. The sequential county code used by the
+# Secretary of State is the position in this list and the FIPS code is 2 * code - 1.
+COUNTY_NAMES = [
+    'Aitkin', 'Anoka', 'Becker', 'Beltrami', 'Benton', 'Big Stone', 'Blue Earth', 'Brown',
+    'Carlton', 'Carver', 'Cass', 'Chippewa', 'Chisago', 'Clay', 'Clearwater', 'Cook',
+    'Cottonwood', 'Crow Wing', 'Dakota', 'Dodge', 'Douglas', 'Faribault', 'Fillmore', 'Freeborn',
+    'Goodhue', 'Grant', 'Hennepin', 'Houston', 'Hubbard', 'Isanti', 'Itasca', 'Jackson',
+    'Kanabec', 'Kandiyohi', 'Kittson', 'Koochiching', 'Lac qui Parle', 'Lake', 'Lake of the Woods', 'Le Sueur',
+    'Lincoln', 'Lyon', 'McLeod', 'Mahnomen', 'Marshall', 'Martin', 'Meeker', 'Mille Lacs',
+    'Morrison', 'Mower', 'Murray', 'Nicollet', 'Nobles', 'Norman', 'Olmsted', 'Otter Tail',
+    'Pennington', 'Pine', 'Pipestone', 'Polk', 'Pope', 'Ramsey', 'Red Lake', 'Redwood',
+    'Renville', 'Rice', 'Rock', 'Roseau', 'St. Louis', 'Scott', 'Sherburne', 'Sibley',
+    'Stearns', 'Steele', 'Stevens', 'Swift', 'Todd', 'Traverse', 'Wabasha', 'Wadena',
+    'Waseca', 'Washington', 'Watonwan', 'Wilkin', 'Winona', 'Wright', 'Yellow Medicine'
+]
+
+COUNTIES = tuple(
+    County(i, name, str(i + 1).zfill(2), str(2 * i + 1).zfill(3), STATE_FIPS + str(2 * i + 1).zfill(3))
+    for i, name in enumerate(COUNTY_NAMES)
+)
+
+# Spellings found in the source files that case and spacing variants don't cover
+EXTRA_SPELLINGS = {
+    'St. Louis': ['Saint Louis', 'St Louis', 'St.Louis', 'S1.Louis'],
+    'Lake of the Woods': ['Lakeof theWoods'],
+}
+
+# MCD-style suffixes dropped before a fallback lookup ("Aitkin Twp" -> "Aitkin")
+SUFFIXES = (' twp', ' township', ' city', ' unorganized')
+
+
+def alias_key(value):
+    """Loose form of a spelling: lowercase, no suffix, letters and digits only"""
+    key = value.strip().lower()
+    for suffix in SUFFIXES:
+        if key.endswith(suffix):
+            key = key[:-len(suffix)]
+    return ''.join(ch for ch in key if ch.isalnum())
+
+
+def _spellings(county):
+    """Every exact spelling and code a source file may use for this county"""
+    unspaced = county.name.replace(' ', '')
+    names = [county.name, unspaced] + EXTRA_SPELLINGS.get(county.name, [])
+    spellings = set()
+    for name in names:
+        spellings.update([name, name.upper(), name.lower(), name.title()])
+    spellings.update([county.code, str(county.index + 1), county.fips, county.geoid])
+    return spellings
+
+
+def _build_aliases():
+    aliases = {}
+    for county in COUNTIES:
+        for spelling in _spellings(county):
+            aliases[spelling] = county
+            aliases.setdefault(alias_key(spelling), county)
+    return aliases
+
+
+COUNTY_ALIASES = _build_aliases()
+
+# Lookups kept for scripts that only need a name -> code mapping
+COUNTY_CODES = {county.name: county.code for county in COUNTIES}
+
+# Line prefixes for the 1990 PDF text parsers, longest first so "Lake of the Woods"
+# wins over "Lake"; only mixed-case spellings so header lines never match
+TEXT_PREFIXES = sorted(
+    {name for county in COUNTIES
+     for name in [county.name, county.name.replace(' ', '')] + EXTRA_SPELLINGS.get(county.name, [])},
+    key=len, reverse=True
+)
+
+
+def resolve_county(value):
+    """Return the County record for any known spelling or code, or None"""
+    county = COUNTY_ALIASES.get(value)
+    if county is None and value:
+        county = COUNTY_ALIASES.get(alias_key(value))
+    return county
+
+
+def feature_id(county):
+    """Integer id of a county's map feature: its GEOID as a number (Aitkin = 27001)"""
+    return int(county.geoid)
+
+
+def county_from_vtd(vtd_id):
+    """Return the County for a VTDID (27 + FIPS + precinct) or FIPS_VTD (FIPS + precinct)"""
+    vtd_id = vtd_id.strip()
+    prefix = vtd_id[:5] if len(vtd_id) == 9 else vtd_id[:3]
+    return COUNTY_ALIASES.get(prefix)
@@ -1,127 +1,41 @@
 """
 Create comprehensive county election JSON with detailed results
+Each county CSV is parsed once into a per-year model; every output file is a
+view of that model, so mn_county_elections.json, mn_elections_aggregated.json
+and the ratings file cannot drift apart. Views are streamed to disk a year at
+a time, so memory is bounded by one year rather than the whole history.
+District contests (U.S. House, State Senate, State House) are kept in a
+district model from the same read, or from the year's precinct file when the
+county CSV has none, and written as one file per chamber and year in districts/
 """
 
 import csv
 import json
 import os
 from collections import defaultdict
+from functools import lru_cache
+import numpy as np
+from county_lookup import COUNTIES, feature_id, resolve_county
+from election_binary import ElectionBinaryWriter
+from json_stream import JSONObjectStream
+from precincts import DISTRICT_OFFICES, district_codes, district_number
+from regions import ROLLUP_COLUMNS, load_region_sets, rollup
+from tiers import PALETTES, get_competitiveness, get_tier
+from vote_parsing import ParseLedger
 
-def get_competitiveness(margin_pct):
-    """
-    Determine competitiveness category based on margin percentage
-    Matches the 15-category legend with Annihilation, Dominant, Stronghold, Safe, Likely, Lean, Tilt, and Tossup
-    """
-    abs_margin = abs(margin_pct)
-    
-    # Republican margins (positive)
-    if margin_pct >= 40:
-        return {
-            "category": "Annihilation Republican",
-            "party": "Republican",
-            "code": "R_ANNIHILATION",
-            "color": "#67000d"
-        }
-    elif margin_pct >= 30:
-        return {
-            "category": "Dominant Republican",
-            "party": "Republican",
-            "code": "R_DOMINANT",
-            "color": "#a50f15"
-        }
-    elif margin_pct >= 20:
-        return {
-            "category": "Stronghold Republican",
-            "party": "Republican",
-            "code": "R_STRONGHOLD",
-            "color": "#cb181d"
-        }
-    elif margin_pct >= 10:
-        return {
-            "category": "Safe Republican",
-            "party": "Republican",
-            "code": "R_SAFE",
-            "color": "#ef3b2c"
-        }
-    elif margin_pct >= 5.5:
-        return {
-            "category": "Likely Republican",
-            "party": "Republican",
-            "code": "R_LIKELY",
-            "color": "#fb6a4a"
-        }
-    elif margin_pct >= 1:
-        return {
-            "category": "Lean Republican",
-            "party": "Republican",
-            "code": "R_LEAN",
-            "color": "#fcae91"
-        }
-    elif margin_pct >= 0.5:
-        return {
-            "category": "Tilt Republican",
-            "party": "Republican",
-            "code": "R_TILT",
-            "color": "#fee8c8"
-        }
-    # Tossup
-    elif abs_margin < 0.5:
-        return {
-            "category": "Tossup",
-            "party": "Swing",
-            "code": "TOSSUP",
-            "color": "#f7f7f7"
-        }
-    # Democratic margins (negative)
-    elif margin_pct >= -1:
-        return {
-            "category": "Tilt Democratic",
-            "party": "Democratic",
-            "code": "D_TILT",
-            "color": "#e1f5fe"
-        }
-    elif margin_pct >= -5.5:
-        return {
-            "category": "Lean Democratic",
-            "party": "Democratic",
-            "code": "D_LEAN",
-            "color": "#c6dbef"
-        }
-    elif margin_pct >= -10:
-        return {
-            "category": "Likely Democratic",
-            "party": "Democratic",
-            "code": "D_LIKELY",
-            "color": "#9ecae1"
-        }
-    elif margin_pct >= -20:
-        return {
-            "category": "Safe Democratic",
-            "party": "Democratic",
-            "code": "D_SAFE",
-            "color": "#6baed6"
-        }
-    elif margin_pct >= -30:
-        return {
-            "category": "Stronghold Democratic",
-            "party": "Democratic",
-            "code": "D_STRONGHOLD",
-            "color": "#3182bd"
-        }
-    elif margin_pct >= -40:
-        return {
-            "category": "Dominant Democratic",
-            "party": "Democratic",
-            "code": "D_DOMINANT",
-            "color": "#08519c"
-        }
-    else:
-        return {
-            "category": "Annihilation Democratic",
-            "party": "Democratic",
-            "code": "D_ANNIHILATION",
-            "color": "#08306b"
-        }
+# Rejected vote cells from every file read in this run
+LEDGER = ParseLedger()
+
+# County groupings for the rollups view (regions.json), loaded by process_election_files
+REGION_SETS = {}
+
+# Offices kept in the model; President, U.S. Senate and statewide executive offices
+MODEL_OFFICES = ['President', 'U.S. Senate', 'Governor', 'Secretary of State',
+                 'Attorney General', 'State Auditor', 'State Treasurer']
+
+# Offices shown on the map (the county view has never included State Treasurer)
+COUNTY_VIEW_OFFICES = ['President', 'U.S. Senate', 'U.S. Senate Special', 'Governor',
+                       'Secretary of State', 'Attorney General', 'State Auditor']
 
 def normalize_office_name(office):
     """Normalize office names for consistent keys"""
@@ -133,10 +47,14 @@ def normalize_office_name(office):
         'Secretary of State': 'secretary_of_state',
         'Attorney General': 'attorney_general',
         'State Auditor': 'state_auditor',
-        'State Treasurer': 'state_treasurer'
+        'State Treasurer': 'state_treasurer',
+        'U.S. House': 'us_house',
+        'State Senate': 'state_senate',
+        'State House': 'state_house'
     }
     return office_map.get(office, office.lower().replace(' ', '_'))
 
+@lru_cache(maxsize=None)
 def normalize_candidate_name(name):
     """Normalize candidate names to proper title case"""
     if not name or not name.strip():
@@ -192,12 +110,366 @@ def get_contest_name(office, year):
         'Secretary of State': f'SECRETARY OF STATE',
         'Attorney General': f'ATTORNEY GENERAL',
         'State Auditor': f'STATE AUDITOR',
-        'State Treasurer': f'STATE TREASURER'
+        'State Treasurer': f'STATE TREASURER',
+        'U.S. House': f'UNITED STATES REPRESENTATIVE',
+        'State Senate': f'STATE SENATOR',
+        'State House': f'STATE REPRESENTATIVE'
     }
     return contest_map.get(office, office.upper())
 
+def new_entry():
+    return {'votes_by_party': {}, 'candidates_by_party': {}}
+
+def add_party_votes(entry, party, candidate, votes):
+    """Add one row's votes to a model entry, keeping the party's candidate name"""
+    # Aggregate votes for the same party
+    entry['votes_by_party'][party] = entry['votes_by_party'].get(party, 0) + votes
+    
+    # Store candidate name (prefer non-empty names, normalize to title case)
+    if party in entry['candidates_by_party']:
+        # If we already have a candidate name and this one is not empty, update
+        if candidate and candidate.strip():
+            entry['candidates_by_party'][party] = normalize_candidate_name(candidate)
+    else:
+        entry['candidates_by_party'][party] = normalize_candidate_name(candidate) if candidate else candidate
+
+def load_year_model(filepath, parser, districts=None, district_totals=None):
+    """
+    Parse one county CSV into the shared model:
+    office -> county -> votes and candidate names by party
+    
+    With a `districts` model (office -> district -> entry, see new_entry) the
+    U.S. House, State Senate and State House rows are summed into it by district.
+    With `district_totals` (office -> party -> votes) every row of those offices,
+    with or without a district, is also summed by party for check_district_totals.
+    """
+    year_data = defaultdict(lambda: defaultdict(lambda: {
+        'county': '',
+        'county_code': '',
+        'votes_by_party': {},
+        'candidates_by_party': {}
+    }))
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        
+        for row in reader:
+            county = row['county']
+            office = row['office']
+            district = row.get('district', '')  # Get district column if it exists
+            party = row['party']
+            candidate = row['candidate']
+            votes = parser.parse(row['votes'], 'votes')
+            
+            # Normalize office names
+            if 'Governor' in office and 'Lt' in office:
+                office = 'Governor'  # "Governor & Lt Governor" -> "Governor"
+            
+            # District contests span counties, so they are keyed by district instead
+            if office in DISTRICT_OFFICES:
+                party = 'R' if party == 'IR' else party
+                if districts is not None and district_number(district):
+                    add_party_votes(districts[office][district_number(district)], party, candidate, votes)
+                if district_totals is not None:
+                    district_totals[office][party] += votes
+                continue
+            
+            if office not in MODEL_OFFICES:
+                continue
+            
+            # Handle 2018 special Senate election (Unexpired Term)
+            # Treat it as a separate office so both contests appear
+            if office == 'U.S. Senate' and district == 'Unexpired Term':
+                office = 'U.S. Senate Special'
+            
+            # Normalize party names - IR (Independent-Republican) should be R
+            if party == 'IR':
+                party = 'R'
+            
+            entry = year_data[office][county]
+            entry['county'] = county
+            if not entry['county_code']:
+                entry['county_code'] = row.get('county_code', '').zfill(2)
+            
+            add_party_votes(entry, party, candidate, votes)
+    
+    return year_data
+
+def load_precinct_districts(filepath):
+    """District model (office -> district -> entry) from the district contests of a precinct file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        precincts = json.load(f)
+    codes = district_codes(precincts.get('districts', {}))
+    
+    districts = {}
+    for contest in precincts['contests']:
+        key = contest.get('district')
+        if key not in codes:
+            continue
+        # One grouped sum of every party column by the precincts' district
+        labels, inverse = np.unique(np.array(codes[key]), return_inverse=True)
+        sums = np.zeros((len(labels), len(contest['parties'])), dtype=np.int64)
+        np.add.at(sums, inverse, np.array(contest['votes'], dtype=np.int64).T)
+        
+        by_district = defaultdict(new_entry)
+        for label, row in zip(labels.tolist(), sums.tolist()):
+            if not label or not any(row):
+                continue
+            for party, candidate, votes in zip(contest['parties'], contest['candidates'], row):
+                add_party_votes(by_district[label], party, candidate, votes)
+        districts[contest['office']] = by_district
+    return districts
+
+def summarize_county(data):
+    """Two-party totals, margin and tier for one county in one contest"""
+    votes = data['votes_by_party']
+    
+    # Get DFL and Republican votes
+    dem_votes = votes.get('DFL', 0)
+    rep_votes = votes.get('R', 0)
+    two_party_total = dem_votes + rep_votes
+    
+    # Calculate margin (positive = Republican lead, negative = Democratic lead)
+    margin = rep_votes - dem_votes
+    margin_pct = round((margin / two_party_total * 100), 2) if two_party_total > 0 else 0
+    
+    return {
+        'dem_votes': dem_votes,
+        'rep_votes': rep_votes,
+        # Calculate other votes (everything except DFL and R)
+        'other_votes': sum(v for k, v in votes.items() if k not in ['DFL', 'R']),
+        'total_votes': sum(votes.values()),
+        'two_party_total': two_party_total,
+        'margin': margin,
+        'margin_pct': margin_pct,
+        'tier': get_tier(margin_pct)
+    }
+
+def contest_result(data, contest_name, year):
+    """Candidates, votes, margin, winner and competitiveness of one county or district"""
+    summary = summarize_county(data)
+    candidates = data['candidates_by_party']
+    
+    # Determine winner
+    if summary['dem_votes'] > summary['rep_votes']:
+        winner = "DEM"
+    elif summary['rep_votes'] > summary['dem_votes']:
+        winner = "REP"
+    else:
+        winner = "TIE"
+    
+    return {
+        'contest': contest_name,
+        'year': str(year),
+        'dem_candidate': candidates.get('DFL', ''),
+        'rep_candidate': candidates.get('R', ''),
+        'dem_votes': summary['dem_votes'],
+        'rep_votes': summary['rep_votes'],
+        'other_votes': summary['other_votes'],
+        'total_votes': summary['total_votes'],
+        'two_party_total': summary['two_party_total'],
+        'margin': abs(summary['margin']),
+        'margin_pct': abs(summary['margin_pct']),
+        'winner': winner,
+        'competitiveness': get_competitiveness(summary['margin_pct']),
+        'all_parties': dict(data['votes_by_party'])
+    }
+
+def county_view(year, year_data):
+    """Detailed per-county results, the document the map loads"""
+    year_results = {}
+    
+    for office, counties in year_data.items():
+        if office not in COUNTY_VIEW_OFFICES:
+            continue
+        office_key = normalize_office_name(office)
+        contest_id = f"{office_key}_{year}"
+        contest_name = get_contest_name(office, year)
+        
+        if office_key not in year_results:
+            year_results[office_key] = {}
+        
+        year_results[office_key][contest_id] = {
+            'contest_name': contest_name,
+            'results': {}
+        }
+        
+        for county, data in counties.items():
+            record = resolve_county(county)
+            county_result = {
+                'county': county,
+                # Same integer id as the county's feature in the map GeoJSON
+                'feature_id': feature_id(record) if record else None,
+                **contest_result(data, contest_name, year)
+            }
+            
+            year_results[office_key][contest_id]['results'][county] = county_result
+    
+    return year_results
+
+def ratings_view(year, year_data):
+    """1-15 rating per county code for each office, from the same tiers as the county view"""
+    year_ratings = {}
+    
+    for office in sorted(year_data):
+        office_key = normalize_office_name(office)
+        year_ratings[office_key] = {
+            data['county_code']: summarize_county(data)['tier'][2]
+            for data in year_data[office].values()
+        }
+    
+    return year_ratings
+
+def styles_view(year, year_data):
+    """
+    Map style indexes: for each county-view contest, the 1-15 rating of every
+    county in feature order (0 = no result), so the page restyles by lookup
+    """
+    year_styles = {}
+    
+    for office, counties in year_data.items():
+        if office not in COUNTY_VIEW_OFFICES:
+            continue
+        ratings = [0] * len(COUNTIES)
+        for county, data in counties.items():
+            record = resolve_county(county)
+            if record:
+                ratings[record.index] = summarize_county(data)['tier'][2]
+        year_styles[f"{normalize_office_name(office)}_{year}"] = ratings
+    
+    return year_styles
+
+def rollups_view(year, year_data):
+    """Statewide and regional totals plus county margin contributions for each county-view contest"""
+    year_rollups = {}
+    
+    for office, counties in year_data.items():
+        if office not in COUNTY_VIEW_OFFICES:
+            continue
+        votes = np.zeros((len(COUNTIES), len(ROLLUP_COLUMNS)), dtype=np.int64)
+        for county, data in counties.items():
+            record = resolve_county(county)
+            if record:
+                summary = summarize_county(data)
+                votes[record.index] = [summary[column] for column in ROLLUP_COLUMNS]
+        year_rollups[f"{normalize_office_name(office)}_{year}"] = rollup(votes, REGION_SETS)
+    
+    return year_rollups
+
+def check_district_totals(year, districts, district_totals):
+    """Problems where a district contest's party totals differ from the county CSV's
+    
+    Each party the county CSV has for a district office must total the same
+    over the districts, whichever file the districts came from; a column read
+    twice, or precincts missing a district, shows up here. Parties only the
+    precinct file has (write-ins) are not compared.
+    """
+    problems = []
+    for office, by_party in district_totals.items():
+        if not districts.get(office):
+            continue
+        summed = defaultdict(int)
+        for entry in districts[office].values():
+            for party, votes in entry['votes_by_party'].items():
+                summed[party] += votes
+        problems += [f"{year} {office} {party}: districts total {summed[party]:,}, county CSV {votes:,}"
+                     for party, votes in by_party.items() if summed[party] != votes]
+    return problems
+
+def district_view(year, districts):
+    """Per-district results of each district contest, one partition per chamber"""
+    partitions = {}
+    
+    for office in DISTRICT_OFFICES:
+        if not districts.get(office):
+            continue
+        office_key = normalize_office_name(office)
+        contest_name = get_contest_name(office, year)
+        results = {}
+        # Districts in numeric order: 1, 1A, 1B, 2, ... 10A
+        for district in sorted(districts[office], key=lambda d: (int(''.join(filter(str.isdigit, d))), d)):
+            results[district] = {'district': district, **contest_result(districts[office][district], contest_name, year)}
+        partitions[office_key] = {
+            'contest_id': f"{office_key}_{year}",
+            'contest_name': contest_name,
+            'year': str(year),
+            'results': results
+        }
+    
+    return partitions
+
+def write_district_partitions(district_dir, year, partitions, index):
+    """Write each chamber's partition for one year and record it in the index"""
+    for office_key, partition in partitions.items():
+        path = os.path.join(district_dir, f"{office_key}_{year}.json")
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(partition, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+        index.setdefault(office_key, []).append(year)
+
+# View name -> function(year, year_data) returning that view's block for one year
+VIEWS = {
+    'county': county_view,
+    'ratings': ratings_view,
+    'styles': styles_view,
+    'rollups': rollups_view,
+}
+
+# Output file -> view written to it; mn_elections_aggregated.json is the copy the page loads
+OUTPUTS = {
+    'mn_county_elections.json': 'county',
+    'mn_elections_aggregated.json': 'county',
+    'mn_county_ratings.json': 'ratings',
+    'mn_county_styles.json': 'styles',
+    'mn_rollups.json': 'rollups',
+}
+
+# Typed-array copy of the county view (see election_binary.py)
+BINARY_OUTPUT = 'mn_county_elections.bin'
+
+# District contest partitions (<chamber>_<year>.json) and their index
+DISTRICT_DIR = 'districts'
+DISTRICT_INDEX = 'index.json'
+
+# Keys each view's per-year blocks are nested under in its document
+VIEW_NESTING = {
+    'county': ('results_by_year',),
+    'ratings': (),
+    'styles': ('styles_by_year',),
+    'rollups': ('rollups_by_year',),
+}
+
+# Views written one member per line instead of indent=2
+COMPACT_VIEWS = ('styles', 'rollups')
+
+def build_styles_footer():
+    """Feature ids the style arrays are ordered by, and the palettes they index"""
+    return {
+        'feature_ids': [feature_id(county) for county in COUNTIES],
+        'palettes': PALETTES
+    }
+
+def build_rollups_footer():
+    """Column order of every rollup row and the region sets the rows follow"""
+    return {
+        'columns': ROLLUP_COLUMNS,
+        'feature_ids': [feature_id(county) for county in COUNTIES],
+        'region_sets': REGION_SETS
+    }
+
+def build_metadata(years):
+    """Metadata footer of the county document, written once every year is known"""
+    return {
+        'state': 'Minnesota',
+        'state_code': 'MN',
+        'total_counties': 87,
+        'years_covered': sorted(years),
+        'data_source': 'Minnesota Secretary of State',
+        'generated_date': '2026-02-01'
+    }
+
 def process_election_files():
-    """Process all election CSV files and create comprehensive JSON"""
+    """Process all election CSV files and write every view of them"""
     
     data_dir = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data"
     
@@ -223,7 +495,23 @@ def process_election_files():
         2024: '20241105__mn__general__county.csv',
     }
     
-    results_by_year = {}
+    REGION_SETS.clear()
+    # Every rollup set is required: the congressional set reads convert_outliers.py's mn_precincts_2024.json
+    REGION_SETS.update(load_region_sets(data_dir, required=True))
+    
+    # One stream per view; each year's block is written as soon as it is built
+    streams = {}
+    for view in dict.fromkeys(OUTPUTS.values()):
+        paths = [os.path.join(data_dir, name) for name, target in OUTPUTS.items() if target == view]
+        streams[view] = JSONObjectStream(paths, nest=VIEW_NESTING[view],
+                                         indent=None if view in COMPACT_VIEWS else 2)
+    binary = ElectionBinaryWriter(os.path.join(data_dir, BINARY_OUTPUT))
+    district_dir = os.path.join(data_dir, DISTRICT_DIR)
+    os.makedirs(district_dir, exist_ok=True)
+    district_index = {}
+    
+    years = []
+    total_contests = 0
     
     for year, filename in sorted(files.items()):
         filepath = os.path.join(data_dir, filename)
@@ -233,151 +521,55 @@ def process_election_files():
             continue
         
         print(f"Processing {year}...")
+        districts = defaultdict(lambda: defaultdict(new_entry))
+        district_totals = defaultdict(lambda: defaultdict(int))
+        year_data = load_year_model(filepath, LEDGER.parser(filename), districts, district_totals)
         
-        # Read the CSV file
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            # Organize by office and county
-            year_data = defaultdict(lambda: defaultdict(lambda: {
-                'county': '',
-                'votes_by_party': {},
-                'candidates_by_party': {}
-            }))
-            
-            for row in reader:
-                county = row['county']
-                office = row['office']
-                district = row.get('district', '')  # Get district column if it exists
-                party = row['party']
-                candidate = row['candidate']
-                votes = int(row['votes'])
-                
-                # Normalize office names
-                if 'Governor' in office and 'Lt' in office:
-                    office = 'Governor'  # "Governor & Lt Governor" -> "Governor"
-                
-                # Only include statewide executive offices, US Senate, and President
-                allowed_offices = ['President', 'U.S. Senate', 'Governor', 'Secretary of State', 
-                                 'Attorney General', 'State Auditor']
-                if office not in allowed_offices:
-                    continue
-                
-                # Handle 2018 special Senate election (Unexpired Term)
-                # Treat it as a separate office so both contests appear
-                if office == 'U.S. Senate' and district == 'Unexpired Term':
-                    office = 'U.S. Senate Special'
-                
-                # Normalize party names - IR (Independent-Republican) should be R
-                if party == 'IR':
-                    party = 'R'
-                
-                year_data[office][county]['county'] = county
-                
-                # Aggregate votes for the same party
-                if party in year_data[office][county]['votes_by_party']:
-                    year_data[office][county]['votes_by_party'][party] += votes
-                else:
-                    year_data[office][county]['votes_by_party'][party] = votes
-                
-                # Store candidate name (prefer non-empty names, normalize to title case)
-                if party in year_data[office][county]['candidates_by_party']:
-                    # If we already have a candidate name and this one is not empty, update
-                    if candidate and candidate.strip():
-                        year_data[office][county]['candidates_by_party'][party] = normalize_candidate_name(candidate)
-                else:
-                    year_data[office][county]['candidates_by_party'][party] = normalize_candidate_name(candidate) if candidate else candidate
-        
-        # Process each office for this year
-        year_results = {}
+        # Offices the county CSV has no district rows for come from the precinct file
+        precinct_path = os.path.join(data_dir, f'mn_precincts_{year}.json')
+        if os.path.exists(precinct_path):
+            for office, by_district in load_precinct_districts(precinct_path).items():
+                if not districts.get(office):
+                    districts[office] = by_district
+        problems = check_district_totals(year, districts, district_totals)
+        if problems:
+            raise ValueError("District contests do not add up to the county CSV:\n  " + "\n  ".join(problems))
+        write_district_partitions(district_dir, year, district_view(year, districts), district_index)
         
-        for office, counties in year_data.items():
-            office_key = normalize_office_name(office)
-            contest_id = f"{office_key}_{year}"
-            contest_name = get_contest_name(office, year)
-            
-            if office_key not in year_results:
-                year_results[office_key] = {}
-            
-            year_results[office_key][contest_id] = {
-                'contest_name': contest_name,
-                'results': {}
-            }
-            
-            for county, data in counties.items():
-                votes = data['votes_by_party']
-                candidates = data['candidates_by_party']
-                
-                # Get DFL and Republican votes
-                dem_votes = votes.get('DFL', 0)
-                rep_votes = votes.get('R', 0)
-                
-                # Calculate other votes (everything except DFL and R)
-                other_votes = sum(v for k, v in votes.items() if k not in ['DFL', 'R'])
-                
-                total_votes = sum(votes.values())
-                two_party_total = dem_votes + rep_votes
-                
-                # Calculate margin (positive = Republican lead, negative = Democratic lead)
-                margin = rep_votes - dem_votes
-                margin_pct = round((margin / two_party_total * 100), 2) if two_party_total > 0 else 0
-                
-                # Determine winner
-                if dem_votes > rep_votes:
-                    winner = "DEM"
-                elif rep_votes > dem_votes:
-                    winner = "REP"
-                else:
-                    winner = "TIE"
-                
-                # Get competitiveness
-                competitiveness = get_competitiveness(margin_pct)
-                
-                county_result = {
-                    'county': county,
-                    'contest': contest_name,
-                    'year': str(year),
-                    'dem_candidate': candidates.get('DFL', ''),
-                    'rep_candidate': candidates.get('R', ''),
-                    'dem_votes': dem_votes,
-                    'rep_votes': rep_votes,
-                    'other_votes': other_votes,
-                    'total_votes': total_votes,
-                    'two_party_total': two_party_total,
-                    'margin': abs(margin),
-                    'margin_pct': abs(margin_pct),
-                    'winner': winner,
-                    'competitiveness': competitiveness,
-                    'all_parties': dict(votes)
-                }
-                
-                year_results[office_key][contest_id]['results'][county] = county_result
-        
-        results_by_year[str(year)] = year_results
-    
-    # Create final JSON structure
-    output = {
-        'metadata': {
-            'state': 'Minnesota',
-            'state_code': 'MN',
-            'total_counties': 87,
-            'years_covered': sorted([int(y) for y in results_by_year.keys()]),
-            'data_source': 'Minnesota Secretary of State',
-            'generated_date': '2026-02-01'
-        },
-        'results_by_year': results_by_year
-    }
+        for view, stream in streams.items():
+            block = VIEWS[view](year, year_data)
+            stream.add(str(year), block)
+            if view == 'county':
+                binary.add_year(year, block)
+                total_contests += len(block)
+        years.append(year)
     
-    # Write to file
-    output_file = r"C:\Users\Shama\OneDrive\Documents\Course_Materials\CPT-236\Side_Projects\MNRealignment\data\mn_county_elections.json"
+    # Metadata depends on every year, so it is the county document's footer
+    footers = {
+        'county': {'metadata': build_metadata(years)},
+        'styles': build_styles_footer(),
+        'rollups': build_rollups_footer(),
+    }
+    for view, stream in streams.items():
+        stream.close(footers.get(view))
+        for path in stream.paths:
+            print(f"\n✓ Created: {path}")
+    binary.close()
+    print(f"\n✓ Created: {binary.path}")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2)
+    index_path = os.path.join(district_dir, DISTRICT_INDEX)
+    with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({
+            office_key: {'name': office, 'years': district_index[office_key]}
+            for office, office_key in ((office, normalize_office_name(office)) for office in DISTRICT_OFFICES)
+            if office_key in district_index
+        }, f, indent=2)
+    os.replace(index_path + '.tmp', index_path)
+    print(f"\n✓ Created: {index_path} ({sum(len(y) for y in district_index.values())} district partitions)")
     
-    print(f"\n✓ Created: {output_file}")
-    print(f"  Years: {len(results_by_year)}")
-    total_contests = sum(len(year_data) for year_data in results_by_year.values())
+    print(f"  Years: {len(years)}")
     print(f"  Total contests: {total_contests}")
+    LEDGER.report()
 
 if __name__ == "__main__":
     print("="*60)
@@ -0,0 +1,129 @@
+"""
+Structural diff of two builds of the county election JSON
+Compares records by hash (see election_index.py), so key order and formatting
+are ignored, and prints only what changed: field-level before/after for each
+changed county result and how many counties changed tier in each contest.
+Exits 1 when the builds differ, so it can gate a data change
+
+Usage: python diff_election_json.py OLD.json [NEW.json]
+(NEW defaults to data/mn_county_elections.json)
+"""
+
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+from election_index import RECORD_DEPTH, diff_indexes, index_document, load_document, outermost_missing
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+# County result fields shown before/after, in this order; other changed fields are listed by name
+SHOWN_FIELDS = ['dem_votes', 'rep_votes', 'other_votes', 'total_votes', 'margin_pct', 'winner']
+
+# Changed records printed in full before the rest are only counted
+MAX_PRINTED = 200
+
+
+def _tier(result):
+    return (result.get('competitiveness') or {}).get('code')
+
+
+def _is_county(path):
+    return len(path) == RECORD_DEPTH and path[0] == 'results_by_year' and path[4] == 'results'
+
+
+def _label(path):
+    if _is_county(path):
+        return f"{path[3]} {path[5]}"
+    return '/'.join(str(key) for key in path) or '(document)'
+
+
+def describe_change(before, after):
+    """Field-level before -> after lines for one changed county result"""
+    lines = []
+    for field in SHOWN_FIELDS:
+        if before.get(field) != after.get(field):
+            old, new = before.get(field), after.get(field)
+            delta = f" ({new - old:+,})" if isinstance(old, int) and isinstance(new, int) else ''
+            lines.append(f"{field}: {old!r} -> {new!r}{delta}")
+    if _tier(before) != _tier(after):
+        lines.append(f"rating: {_tier(before)} -> {_tier(after)}")
+    others = sorted(key for key in set(before) | set(after)
+                    if key not in SHOWN_FIELDS and key != 'competitiveness' and before.get(key) != after.get(key))
+    if others:
+        lines.append(f"also changed: {', '.join(others)}")
+    return lines
+
+
+def diff_documents(old_doc, new_doc):
+    """Print the differences between two documents; returns the number of changed records"""
+    old, new = index_document(old_doc), index_document(new_doc)
+    added, removed, changed = diff_indexes(old, new)
+
+    printed = 0
+    tier_moves = defaultdict(Counter)
+    counties_changed = Counter()
+
+    # A whole year or contest that appears or disappears is one line
+    added = Counter(outermost_missing(path, old_doc) for path in added)
+    removed = Counter(outermost_missing(path, new_doc) for path in removed)
+
+    for title, paths in (("Added", added), ("Removed", removed), ("Changed", changed)):
+        if not paths:
+            continue
+        print(f"\n{title} ({len(paths)}):")
+        for path in paths:
+            if title == "Changed" and _is_county(path):
+                before, after = old[path][1], new[path][1]
+                counties_changed[path[3]] += 1
+                if _tier(before) != _tier(after):
+                    tier_moves[path[3]][(_tier(before), _tier(after))] += 1
+            if printed >= MAX_PRINTED:
+                continue
+            printed += 1
+            if title == "Changed":
+                before, after = old[path][1], new[path][1]
+                if _is_county(path) and isinstance(before, dict) and isinstance(after, dict):
+                    print(f"  ~ {_label(path)}")
+                    for line in describe_change(before, after):
+                        print(f"      {line}")
+                else:
+                    print(f"  ~ {_label(path)}: {before!r} -> {after!r}")
+            else:
+                records = paths[path]
+                print(f"  {'+' if title == 'Added' else '-'} {_label(path)}"
+                      + (f" ({records} records)" if records > 1 else ''))
+    total = sum(added.values()) + sum(removed.values()) + len(changed)
+    shown = len(added) + len(removed) + len(changed)
+    if printed < shown:
+        print(f"\n  ... {shown - printed} more entries not shown")
+
+    if counties_changed:
+        print("\nCounties changed per contest:")
+        for contest_id, count in counties_changed.items():
+            moves = sum(tier_moves[contest_id].values())
+            print(f"  {contest_id}: {count} changed, {moves} changed tier")
+            for (before, after), n in tier_moves[contest_id].most_common():
+                print(f"      {before} -> {after}: {n}")
+    return total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    old_path = sys.argv[1]
+    new_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA_DIR, 'mn_county_elections.json')
+
+    start = time.perf_counter()
+    print("=" * 60)
+    print(f"{old_path}\n  -> {new_path}")
+    print("=" * 60)
+    differences = diff_documents(load_document(old_path), load_document(new_path))
+    elapsed = time.perf_counter() - start
+
+    if differences:
+        print(f"\n✗ {differences} records differ ({elapsed:.2f}s)")
+        sys.exit(1)
+    print(f"\n✓ No differences ({elapsed:.2f}s)")
@@ -0,0 +1,242 @@
+"""
+Binary county results container (mn_county_elections.bin)
+Little-endian, with every array 4-byte aligned so the page can wrap it in
+Int32Array/Float32Array views without copying or parsing anything. Written
+by create_county_election_json.py next to the JSON; scripts/election_binary.js
+is the browser decoder. Run with --verify to decode the file and check it
+against mn_county_elections.json
+
+Layout:
+  header    32 bytes: magic "MNEB", u16 version, u16 columns, u32 features,
+            u32 contests, u32 strings offset, u32 contests offset,
+            u32 features offset, u32 file size
+  data      one block per contest: COLUMNS arrays of `features` 4-byte values
+  strings   u32 count, u32 byte offsets[count + 1], UTF-8 text (padded to 4)
+  contests  per contest 7 x i32: year, office, contest id, contest name
+            (string indexes), data offset, dem candidate, rep candidate
+            (string index of the candidate in most counties, -1 if none)
+  features  i32 feature ids (GEOID, e.g. 27001), then i32 name string indexes
+"""
+
+import json
+import os
+import struct
+import sys
+from collections import Counter
+
+import numpy as np
+
+from county_lookup import COUNTIES, feature_id, resolve_county
+from tiers import COMPETITIVENESS_TIERS, TIER_RATINGS
+
+MAGIC = b'MNEB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIII')
+
+# Per-feature arrays of every contest block, in file order. margin_pct is
+# signed (positive = Republican lead); rating 0 and candidate -1 mean no result.
+# The candidate columns hold string indexes of each county's candidate names.
+COLUMNS = [
+    ('dem_votes', '<i4'),
+    ('rep_votes', '<i4'),
+    ('other_votes', '<i4'),
+    ('total_votes', '<i4'),
+    ('margin_pct', '<f4'),
+    ('rating', '<i4'),
+    ('dem_candidates', '<i4'),
+    ('rep_candidates', '<i4'),
+]
+
+CONTEST_FIELDS = ['year', 'office', 'contest_id', 'contest_name', 'data_offset', 'dem_candidate', 'rep_candidate']
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+
+def _pad4(f):
+    f.write(b'\0' * (-f.tell() % 4))
+
+
+class ElectionBinaryWriter:
+    """Write contests to the binary container as the generator produces them
+
+    Contest data is written as each year arrives; the small string, contest and
+    feature tables are written by close(), which then fills in the header.
+    """
+
+    def __init__(self, path, features=COUNTIES):
+        self.path = path
+        self.features = list(features)
+        self.strings = {}
+        self.contests = []
+        self._file = open(path + '.tmp', 'wb')
+        self._file.write(b'\0' * HEADER.size)
+
+    def string(self, value):
+        """Index of a string in the string table, adding it if needed"""
+        if value not in self.strings:
+            self.strings[value] = len(self.strings)
+        return self.strings[value]
+
+    def add_year(self, year, block):
+        """Add every contest of one county-view year block"""
+        n = len(self.features)
+        for office_key, contests in block.items():
+            for contest_id, contest in contests.items():
+                columns = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMNS}
+                columns['dem_candidates'][:] = -1
+                columns['rep_candidates'][:] = -1
+                names = {'dem_candidate': Counter(), 'rep_candidate': Counter()}
+
+                for county_name, result in contest['results'].items():
+                    county = resolve_county(county_name)
+                    if county is None:
+                        print(f"  ⚠ {contest_id}: no feature for county {county_name!r}")
+                        continue
+                    i = county.index
+                    for name in ('dem_votes', 'rep_votes', 'other_votes', 'total_votes'):
+                        columns[name][i] = result[name]
+                    sign = {'REP': 1, 'DEM': -1}.get(result['winner'], 0)
+                    columns['margin_pct'][i] = sign * result['margin_pct']
+                    columns['rating'][i] = TIER_RATINGS[result['competitiveness']['code']]
+                    for name in ('dem_candidate', 'rep_candidate'):
+                        columns[name + 's'][i] = self.string(result[name])
+                        names[name][result[name]] += 1
+
+                offset = self._file.tell()
+                for name, _ in COLUMNS:
+                    self._file.write(columns[name].tobytes())
+                self.contests.append([
+                    int(year), self.string(office_key), self.string(contest_id),
+                    self.string(contest['contest_name']), offset,
+                    self.string(names['dem_candidate'].most_common(1)[0][0]) if names['dem_candidate'] else -1,
+                    self.string(names['rep_candidate'].most_common(1)[0][0]) if names['rep_candidate'] else -1,
+                ])
+
+    def close(self):
+        f = self._file
+        feature_names = [self.string(feature.name) for feature in self.features]
+
+        strings_offset = f.tell()
+        encoded = [value.encode('utf-8') for value in self.strings]
+        offsets = np.concatenate(([0], np.cumsum([len(text) for text in encoded]))).astype('<u4')
+        f.write(struct.pack('<I', len(encoded)))
+        f.write(offsets.tobytes())
+        f.write(b''.join(encoded))
+        _pad4(f)
+
+        contests_offset = f.tell()
+        f.write(np.array(self.contests, dtype='<i4').reshape(-1, len(CONTEST_FIELDS)).tobytes())
+
+        features_offset = f.tell()
+        f.write(np.array([feature_id(feature) for feature in self.features], dtype='<i4').tobytes())
+        f.write(np.array(feature_names, dtype='<i4').tobytes())
+
+        size = f.tell()
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), len(self.features), len(self.contests),
+                            strings_offset, contests_offset, features_offset, size))
+        f.close()
+        os.replace(self.path + '.tmp', self.path)
+
+
+def read_binary(path):
+    """Decode a container into plain Python/numpy structures (arrays are views of the file)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    (magic, version, columns, n_features, n_contests,
+     strings_offset, contests_offset, features_offset, size) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or columns != len(COLUMNS) or size != len(data):
+        raise ValueError(f"{path} is not a version {VERSION} results file")
+
+    count = struct.unpack_from('<I', data, strings_offset)[0]
+    offsets = np.frombuffer(data, dtype='<u4', count=count + 1, offset=strings_offset + 4)
+    text = strings_offset + 4 + 4 * (count + 1)
+    strings = [data[text + start:text + end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+    table = np.frombuffer(data, dtype='<i4', count=n_contests * len(CONTEST_FIELDS),
+                          offset=contests_offset).reshape(n_contests, len(CONTEST_FIELDS))
+    ids = np.frombuffer(data, dtype='<i4', count=n_features, offset=features_offset)
+    names = np.frombuffer(data, dtype='<i4', count=n_features, offset=features_offset + 4 * n_features)
+
+    def label(index):
+        return strings[index] if index >= 0 else None
+
+    contests = []
+    for row in table:
+        record = dict(zip(CONTEST_FIELDS, row.tolist()))
+        for key in ('office', 'contest_id', 'contest_name', 'dem_candidate', 'rep_candidate'):
+            record[key] = label(record[key])
+        for k, (name, dtype) in enumerate(COLUMNS):
+            record[name] = np.frombuffer(data, dtype=dtype, count=n_features,
+                                         offset=record['data_offset'] + 4 * n_features * k)
+        contests.append(record)
+
+    return {
+        'strings': strings,
+        'feature_ids': ids,
+        'feature_names': [strings[i] for i in names],
+        'contests': contests,
+    }
+
+
+def verify(binary_path, json_path):
+    """Check every county result in the JSON against the decoded binary; returns the mismatch count"""
+    decoded = read_binary(binary_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        results_by_year = json.load(f)['results_by_year']
+
+    codes = {tier[2]: tier[5] for tier in COMPETITIVENESS_TIERS}
+    strings = decoded['strings']
+    contests = {(c['year'], c['office'], c['contest_id']): c for c in decoded['contests']}
+    expected = sum(len(contests_) for year in results_by_year.values() for contests_ in year.values())
+    problems = [] if expected == len(contests) else [f"{len(contests)} contests decoded, {expected} in JSON"]
+
+    for year, offices in results_by_year.items():
+        for office_key, office_contests in offices.items():
+            for contest_id, contest in office_contests.items():
+                record = contests.get((int(year), office_key, contest_id))
+                if record is None or record['contest_name'] != contest['contest_name']:
+                    problems.append(f"{contest_id}: missing or renamed")
+                    continue
+                seen = set()
+                for county_name, result in contest['results'].items():
+                    i = resolve_county(county_name).index
+                    seen.add(i)
+                    sign = {'REP': 1, 'DEM': -1}.get(result['winner'], 0)
+                    checks = [(name, result[name], int(record[name][i]))
+                              for name in ('dem_votes', 'rep_votes', 'other_votes', 'total_votes')]
+                    checks += [
+                        ('margin_pct', float(np.float32(sign * result['margin_pct'])), float(record['margin_pct'][i])),
+                        ('rating', result['competitiveness']['code'], codes.get(int(record['rating'][i]))),
+                        ('dem_candidate', result['dem_candidate'], strings[record['dem_candidates'][i]]),
+                        ('rep_candidate', result['rep_candidate'], strings[record['rep_candidates'][i]]),
+                    ]
+                    problems += [f"{contest_id} {county_name} {name}: JSON {want!r}, binary {got!r}"
+                                 for name, want, got in checks if want != got]
+                empty = [i for i in np.flatnonzero(record['rating']) if i not in seen]
+                if empty:
+                    problems.append(f"{contest_id}: {len(empty)} counties only in the binary")
+
+    for problem in problems[:20]:
+        print(f"  ✗ {problem}")
+    return len(problems)
+
+
+if __name__ == "__main__":
+    binary_path = os.path.join(DATA_DIR, 'mn_county_elections.bin')
+    json_path = os.path.join(DATA_DIR, 'mn_county_elections.json')
+
+    if '--verify' not in sys.argv:
+        decoded = read_binary(binary_path)
+        print(f"{binary_path}: {len(decoded['contests'])} contests, "
+              f"{len(decoded['feature_ids'])} features, {len(decoded['strings'])} strings")
+        sys.exit(0)
+
+    print("=" * 60)
+    print("Verifying binary results against JSON")
+    print("=" * 60)
+    mismatches = verify(binary_path, json_path)
+    if mismatches:
+        print(f"\n✗ {mismatches} mismatches")
+        sys.exit(1)
+    print("\n✓ Binary decodes identically to the JSON")
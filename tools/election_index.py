@@ -0,0 +1,65 @@
+"""
+Index a generated election document by record so two builds can be compared
+A record is one county result, addressed by its path
+("results_by_year", year, office, contest_id, "results", county); fields above
+that depth (contest names, metadata) are records of their own. Records are
+compared by hash, so key order and formatting never show up as changes
+"""
+
+import hashlib
+import json
+
+# Path length of a county result; dicts are split into records down to here
+RECORD_DEPTH = 6
+
+
+def walk_records(node, path=(), depth=RECORD_DEPTH):
+    """Yield (path, value) for every record under node; an empty dict is a record itself"""
+    if isinstance(node, dict) and node and len(path) < depth:
+        for key, value in node.items():
+            yield from walk_records(value, path + (key,), depth)
+    else:
+        yield path, node
+
+
+def record_hash(value):
+    """Stable hash of a record's content, independent of key order"""
+    text = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def index_document(doc):
+    """Path -> (hash, value) for every record of a document"""
+    return {path: (record_hash(value), value) for path, value in walk_records(doc)}
+
+
+def diff_indexes(old, new):
+    """(added, removed, changed) record paths between two indexes, in document order"""
+    added = [path for path in new if path not in old]
+    removed = [path for path in old if path not in new]
+    changed = [path for path, (digest, _) in new.items() if path in old and old[path][0] != digest]
+    return added, removed, changed
+
+
+def outermost_missing(path, doc):
+    """Shortest prefix of path that does not exist in doc (a whole added or removed subtree)"""
+    node = doc
+    for depth, key in enumerate(path):
+        if not isinstance(node, dict) or key not in node:
+            return path[:depth + 1]
+        node = node[key]
+    return path
+
+
+def load_document(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def file_version(path):
+    """Version id of a published file: the start of its SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
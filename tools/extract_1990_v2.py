@@ -17,32 +17,6 @@ def extract_1990_races(pdf_path, output_csv):
         os.system(f'"{sys.executable}" -m pip install pdfplumber')
         import pdfplumber
     
-    # Minnesota county codes
-    county_codes = {
-        'Aitkin': '01', 'Anoka': '02', 'Becker': '03', 'Beltrami': '04',
-        'Benton': '05', 'Big Stone': '06', 'Blue Earth': '07', 'Brown': '08',
-        'Carlton': '09', 'Carver': '10', 'Cass': '11', 'Chippewa': '12',
-        'Chisago': '13', 'Clay': '14', 'Clearwater': '15', 'Cook': '16',
-        'Cottonwood': '17', 'Crow Wing': '18', 'Dakota': '19', 'Dodge': '20',
-        'Douglas': '21', 'Faribault': '22', 'Fillmore': '23', 'Freeborn': '24',
-        'Goodhue': '25', 'Grant': '26', 'Hennepin': '27', 'Houston': '28',
-        'Hubbard': '29', 'Isanti': '30', 'Itasca': '31', 'Jackson': '32',
-        'Kanabec': '33', 'Kandiyohi': '34', 'Kittson': '35', 'Koochiching': '36',
-        'Lac qui Parle': '37', 'Lake': '38', 'Lake of the Woods': '39', 'Le Sueur': '40',
-        'Lincoln': '41', 'Lyon': '42', 'McLeod': '43', 'Mahnomen': '44',
-        'Marshall': '45', 'Martin': '46', 'Mille Lacs': '47', 'Morrison': '48',
-        'Mower': '49', 'Murray': '50', 'Nicollet': '51', 'Nobles': '52',
-        'Norman': '53', 'Olmsted': '54', 'Otter Tail': '55', 'Pennington': '56',
-        'Pine': '57', 'Pipestone': '58', 'Polk': '59', 'Pope': '60',
-        'Ramsey': '62', 'Red Lake': '63', 'Redwood': '64', 'Renville': '65',
-        'Rice': '66', 'Rock': '67', 'Roseau': '68', 'St. Louis': '69',
-        'Scott': '70', 'Sherburne': '71', 'Sibley': '72', 'Stearns': '73',
-        'Steele': '74', 'Stevens': '75', 'Swift': '76', 'Todd': '77',
-        'Traverse': '78', 'Wabasha': '79', 'Wadena': '80', 'Waseca': '81',
-        'Washington': '82', 'Watonwan': '83', 'Wilkin': '84', 'Winona': '85',
-        'Wright': '86', 'Yellow Medicine': '87'
-    }
-    
     all_data = []
     
     with pdfplumber.open(pdf_path) as pdf:
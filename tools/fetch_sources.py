@@ -0,0 +1,357 @@
+"""
+Download the raw result files listed in sources.json into data/
+Every source is fetched concurrently on one asyncio loop over a small pool of
+keep-alive HTTP/1.1 connections per host, so a refresh costs one round trip
+per file rather than one connection per file. Requests are conditional: the
+ETag and Last-Modified of each saved file are kept in data/.fetch_state.json
+and sent back as If-None-Match / If-Modified-Since, so an unchanged file is a
+304 with no body. Bodies stream into <file>.part and only replace the file
+with os.replace once complete; an interrupted download is resumed with a
+Range request (guarded by If-Range, so a file that changed meanwhile starts
+over). Uses only the standard library, so any HTTP server, including a local
+test fixture, works as a source.
+
+Usage: python fetch_sources.py [--year 2024] [--sources sources.json]
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+from urllib.parse import urljoin, urlsplit
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+SOURCES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sources.json')
+STATE_FILE = '.fetch_state.json'
+
+# Open connections per host; official sites throttle clients that open many more
+CONNECTIONS_PER_HOST = 4
+CHUNK_BYTES = 64 * 1024
+TIMEOUT_SECONDS = 60
+MAX_REDIRECTS = 5
+USER_AGENT = 'MNRealignment-fetch/1.0'
+
+
+class FetchError(Exception):
+    pass
+
+
+async def read_line(reader):
+    """One line of a response head or chunk framing, within TIMEOUT_SECONDS"""
+    try:
+        return await asyncio.wait_for(reader.readline(), TIMEOUT_SECONDS)
+    except ValueError as error:
+        # StreamReader raises ValueError for a line longer than its buffer limit
+        raise FetchError(f"malformed response: {error}") from None
+
+
+class Response:
+    """Status and headers of one response; the body is read with chunks() or discard()
+
+    Every read of the body is limited to TIMEOUT_SECONDS, so a server that
+    stalls mid-body fails that source instead of hanging the fetch.
+    """
+
+    def __init__(self, conn, status, headers, method):
+        self.conn = conn
+        self.status = status
+        self.headers = headers
+        # 1xx, 204 and 304 responses and HEAD requests never carry a body
+        self.bodyless = method == 'HEAD' or status in (204, 304) or status < 200
+        self.reusable = headers.get('connection', '').lower() != 'close'
+
+    async def chunks(self):
+        reader = self.conn.reader
+        if self.bodyless:
+            return
+        if 'chunked' in self.headers.get('transfer-encoding', '').lower():
+            while True:
+                line = await read_line(reader)
+                try:
+                    size = int(line.split(b';')[0].strip(), 16)
+                except ValueError:
+                    raise FetchError(f"malformed chunk size {line[:40]!r}") from None
+                if size == 0:
+                    # Trailers end with a blank line
+                    while (await read_line(reader)).strip():
+                        pass
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), TIMEOUT_SECONDS)
+                await asyncio.wait_for(reader.readexactly(2), TIMEOUT_SECONDS)
+        elif 'content-length' in self.headers:
+            try:
+                remaining = int(self.headers['content-length'])
+            except ValueError:
+                raise FetchError(f"malformed Content-Length {self.headers['content-length']!r}") from None
+            while remaining:
+                data = await asyncio.wait_for(reader.read(min(CHUNK_BYTES, remaining)), TIMEOUT_SECONDS)
+                if not data:
+                    raise FetchError(f"connection closed with {remaining:,} bytes still to come")
+                remaining -= len(data)
+                yield data
+        else:
+            # Body delimited by the server closing the connection
+            self.reusable = False
+            while data := await asyncio.wait_for(reader.read(CHUNK_BYTES), TIMEOUT_SECONDS):
+                yield data
+
+    async def discard(self):
+        async for _ in self.chunks():
+            pass
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host, port), at most CONNECTIONS_PER_HOST in use per host"""
+
+    def __init__(self, per_host=CONNECTIONS_PER_HOST):
+        self.per_host = per_host
+        self.idle = {}
+        self.limits = {}
+        self.ssl_context = ssl.create_default_context()
+        self.opened = 0
+
+    async def acquire(self, key):
+        await self.limits.setdefault(key, asyncio.Semaphore(self.per_host)).acquire()
+        idle = self.idle.setdefault(key, [])
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                conn.reused = True
+                return conn
+            conn.close()
+        scheme, host, port = key
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self.ssl_context if scheme == 'https' else None,
+                                        limit=CHUNK_BYTES * 4),
+                TIMEOUT_SECONDS)
+        except BaseException:
+            self.limits[key].release()
+            raise
+        self.opened += 1
+        return Connection(reader, writer)
+
+    def release(self, key, conn, reusable):
+        if reusable:
+            self.idle[key].append(conn)
+        else:
+            conn.close()
+        self.limits[key].release()
+
+    def close(self):
+        for conns in self.idle.values():
+            for conn in conns:
+                conn.close()
+        self.idle.clear()
+
+
+async def read_response(conn, method):
+    status_line = await read_line(conn.reader)
+    if not status_line:
+        raise ConnectionResetError("connection closed before the response")
+    parts = status_line.decode('latin-1').split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/') or not parts[1].isdigit():
+        raise FetchError(f"malformed status line {status_line[:80]!r}")
+    headers = {}
+    while (line := await read_line(conn.reader)) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return Response(conn, int(parts[1]), headers, method)
+
+
+class Request:
+    """One request on a pooled connection; use as `async with Request(...) as response`"""
+
+    def __init__(self, pool, url, headers=None, method='GET'):
+        self.pool = pool
+        self.url = url
+        self.headers = headers or {}
+        self.method = method
+        self.response = None
+
+    async def __aenter__(self):
+        parts = urlsplit(self.url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        head = [f'{self.method} {target} HTTP/1.1', f'Host: {parts.netloc}', f'User-Agent: {USER_AGENT}',
+                'Accept-Encoding: identity', 'Connection: keep-alive']
+        head += [f'{name}: {value}' for name, value in self.headers.items()]
+        payload = ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1')
+
+        # A kept-alive connection may have been closed by the server while idle; retry once on a new one
+        for attempt in range(2):
+            conn = await self.pool.acquire(self.key)
+            try:
+                conn.writer.write(payload)
+                await conn.writer.drain()
+                self.response = await asyncio.wait_for(read_response(conn, self.method), TIMEOUT_SECONDS)
+                return self.response
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.pool.release(self.key, conn, False)
+                if not conn.reused or attempt:
+                    raise
+            except BaseException:
+                self.pool.release(self.key, conn, False)
+                raise
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # The connection goes back to the pool only when its body was read to the end
+        self.pool.release(self.key, self.response.conn, exc_type is None and self.response.reusable)
+
+
+def load_state(data_dir):
+    path = os.path.join(data_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(data_dir, state):
+    path = os.path.join(data_dir, STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def conditional_headers(entry, path, part_path):
+    """Request headers from what is already on disk: resume a partial body, or revalidate a saved file"""
+    headers = {}
+    partial = entry.get('partial')
+    if partial and os.path.exists(part_path) and os.path.getsize(part_path) > 0:
+        validator = partial.get('etag') or partial.get('last_modified')
+        if validator:
+            headers['Range'] = f'bytes={os.path.getsize(part_path)}-'
+            headers['If-Range'] = validator
+            return headers
+    if os.path.exists(path):
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+async def fetch_source(pool, source, data_dir, state):
+    """Fetch one source; returns 'unchanged', 'downloaded' or 'resumed' and the bytes transferred"""
+    name = source['file']
+    path = os.path.join(data_dir, name)
+    part_path = path + '.part'
+    entry = state.get(name, {})
+    if entry.get('url') != source['url']:
+        # A new url is a different resource; its validators do not carry over
+        entry = {}
+    headers = conditional_headers(entry, path, part_path)
+
+    url = source['url']
+    for _ in range(MAX_REDIRECTS + 1):
+        async with Request(pool, url, headers) as response:
+            status = response.status
+            if status in (301, 302, 303, 307, 308) and 'location' in response.headers:
+                await response.discard()
+                url = urljoin(url, response.headers['location'])
+                continue
+            if status == 304:
+                return 'unchanged', 0
+            if status not in (200, 206):
+                await response.discard()
+                raise FetchError(f"HTTP {status} from {url}")
+
+            offset = 0
+            if status == 206:
+                content_range = response.headers.get('content-range', '')
+                offset = int(content_range.split()[1].split('-')[0]) if content_range.startswith('bytes ') else -1
+                if offset != os.path.getsize(part_path):
+                    await response.discard()
+                    raise FetchError(f"unexpected range {content_range!r} resuming {name}")
+
+            # Record the validators first, so an interrupted body can be resumed next run
+            validators = {'etag': response.headers.get('etag'), 'last_modified': response.headers.get('last-modified')}
+            state[name] = {'url': source['url'], 'partial': validators}
+            save_state(data_dir, state)
+
+            received = 0
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                async for data in response.chunks():
+                    f.write(data)
+                    received += len(data)
+            os.replace(part_path, path)
+
+            state[name] = {'url': source['url'], **validators, 'size': os.path.getsize(path)}
+            save_state(data_dir, state)
+            return ('resumed' if offset else 'downloaded'), received
+    raise FetchError(f"more than {MAX_REDIRECTS} redirects from {source['url']}")
+
+
+async def fetch_all(sources, data_dir=DATA_DIR, per_host=CONNECTIONS_PER_HOST):
+    """Fetch every source concurrently; returns ({file: (outcome, bytes)}, connections opened), failures as 'failed: ...'"""
+    os.makedirs(data_dir, exist_ok=True)
+    state = load_state(data_dir)
+    pool = ConnectionPool(per_host)
+
+    async def run(source):
+        try:
+            return await fetch_source(pool, source, data_dir, state)
+        except (FetchError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+            return f'failed: {str(error) or type(error).__name__}', 0
+
+    try:
+        outcomes = await asyncio.gather(*(run(source) for source in sources))
+    finally:
+        pool.close()
+    return {source['file']: outcome for source, outcome in zip(sources, outcomes)}, pool.opened
+
+
+def load_sources(path=SOURCES_FILE, year=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        sources = json.load(f)['sources']
+    if year is not None:
+        sources = [source for source in sources if source['year'] == year]
+    return sources
+
+
+def main(sources_path=SOURCES_FILE, year=None, data_dir=DATA_DIR):
+    sources = load_sources(sources_path, year)
+    missing = [source for source in sources if not source.get('url')]
+    sources = [source for source in sources if source.get('url')]
+    for source in missing:
+        print(f"  ⚠ {source['file']}: no url in {os.path.basename(sources_path)}, skipped")
+
+    start = time.perf_counter()
+    results, opened = asyncio.run(fetch_all(sources, data_dir))
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for name, (outcome, transferred) in results.items():
+        if outcome.startswith('failed'):
+            failed += 1
+            print(f"  ✗ {name}: {outcome}")
+        elif outcome == 'unchanged':
+            print(f"  = {name}: unchanged")
+        else:
+            print(f"  ✓ {name}: {outcome} ({transferred:,} bytes)")
+    print(f"\n{len(results)} sources in {elapsed:.2f}s over {opened} connections, {failed} failed")
+    return failed
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Fetching raw result files")
+    print("=" * 60)
+
+    year = int(sys.argv[sys.argv.index('--year') + 1]) if '--year' in sys.argv else None
+    sources_path = sys.argv[sys.argv.index('--sources') + 1] if '--sources' in sys.argv else SOURCES_FILE
+    sys.exit(1 if main(sources_path, year) else 0)
@@ -0,0 +1,64 @@
+"""
+Write a large JSON document one member at a time
+Each member is serialized and written as soon as it is ready, so the caller
+only ever holds one member (one election year) in memory. Top-level fields
+that depend on everything written, like the metadata block, go in a footer
+written last. Output is formatted the same as json.dump(..., indent=2), or
+one member per line with indent=None
+"""
+
+import json
+import os
+
+
+class JSONObjectStream:
+    """Stream the members of one JSON object nested under `nest` keys
+
+    With nest=('results_by_year',) the file looks like
+    {"results_by_year": {<added members>}, <footer fields>}. The same text is
+    written to every path in `paths`; each file is built next to its target
+    and moved into place on close, so readers never see a partial document.
+    """
+
+    def __init__(self, paths, nest=(), indent=2):
+        self.paths = list(paths)
+        self.nest = tuple(nest)
+        self.indent = indent
+        self.count = 0
+        self._files = [open(path + '.tmp', 'w', encoding='utf-8') for path in self.paths]
+        for depth, key in enumerate(self.nest):
+            self._write('{\n' + self._pad(depth + 1) + json.dumps(key) + ': ')
+
+    def _pad(self, depth):
+        return ' ' * ((self.indent or 0) * depth)
+
+    def _write(self, text):
+        for f in self._files:
+            f.write(text)
+
+    def _dumps(self, value, depth):
+        # json.dumps escapes newlines inside strings, so every newline is layout
+        return json.dumps(value, indent=self.indent).replace('\n', '\n' + self._pad(depth))
+
+    def add(self, key, value):
+        """Write one member of the streamed object"""
+        depth = len(self.nest) + 1
+        self._write(('{' if self.count == 0 else ',') + '\n' + self._pad(depth)
+                    + json.dumps(key) + ': ' + self._dumps(value, depth))
+        self.count += 1
+
+    def close(self, footer=None):
+        """Finish the document with `footer` fields at the top level and move it into place"""
+        if footer and not self.nest:
+            raise ValueError("footer fields need a nested document (nest=...)")
+        depth = len(self.nest)
+        self._write('{}' if self.count == 0 else '\n' + self._pad(depth) + '}')
+        for depth in range(len(self.nest) - 1, -1, -1):
+            if depth == 0:
+                for key, value in (footer or {}).items():
+                    self._write(',\n' + self._pad(1) + json.dumps(key) + ': ' + self._dumps(value, 1))
+            self._write('\n' + self._pad(depth) + '}')
+        for f, path in zip(self._files, self.paths):
+            f.close()
+            os.replace(path + '.tmp', path)
+        self._files = []
@@ -0,0 +1,273 @@
+"""
+Election-night live ingest from a drop directory of SOS precinct files
+Stands in for the Secretary of State results feed: each time a wide precinct
+file in the 2024 format lands in (or is rewritten in) the drop directory, it
+is read once into a precinct x (office, party) vote matrix and diffed against
+the previous snapshot by VTD id. Only the precinct rows that changed are
+folded into the county totals, ratings are recomputed for the counties those
+rows belong to, and only the contests they touch are rewritten under
+data/live/:
+  <office>_<year>.json  one county-view contest (results by county, as in
+                        mn_county_elections.json) plus its map ratings in feature order
+  index.json            update sequence, and the sequence each contest shard was last written at
+Every file goes through a temp file and os.replace, so a reader sees either
+the previous shard or the new one, never a half-written file. Each drop is a
+full snapshot: precincts missing from it count as zero.
+
+Usage: python live_ingest.py DROP_DIR [--year 2024] [--once]
+(--once ingests the newest file in DROP_DIR and exits instead of watching)
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from candidate_lookup import get_candidate_name
+from convert_outliers import COLUMNS_2024, PRECINCT_SPECS, county_by_code
+from county_lookup import COUNTIES, feature_id
+from create_county_election_json import (contest_result, get_contest_name, normalize_candidate_name,
+                                         normalize_office_name, summarize_county)
+from precincts import PrecinctSpec
+from source_io import SOURCE_SUFFIXES, open_source, source_name
+from tally import tally_columns
+from vote_parsing import ParseLedger
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+LIVE_DIR = 'live'
+INDEX_FILE = 'index.json'
+
+# Seconds between looks at the drop directory; a file is read once its size and
+# mtime hold still for one poll, so a drop lands within two polls plus the read
+POLL_SECONDS = 0.1
+
+# Only the precinct code and name are needed to key the rows; districts, turnout
+# and district contests stay with convert_outliers
+LIVE_SPEC = PrecinctSpec(PRECINCT_SPECS[2024].code, PRECINCT_SPECS[2024].name)
+
+# GEOID -> county index, to place a VTD id in its county
+_COUNTY_OF_GEOID = {county.geoid: county.index for county in COUNTIES}
+
+
+def _write_json(path, value):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+
+
+def read_snapshot(path, columns, ledger):
+    """(VTD ids, precincts x columns vote matrix) of one drop file"""
+    parser = ledger.parser(source_name(path))
+    with open_source(path, newline='') as f:
+        tally = tally_columns(csv.DictReader(f), county_by_code('COUNTYCODE'), COLUMNS_2024, parser,
+                              precinct_spec=LIVE_SPEC)
+    ledger.report(parser.source)
+
+    precincts = tally.precincts.columns()
+    offices = precincts['offices']
+    matrix = np.zeros((len(precincts['vtd']), len(columns)), dtype=np.int64)
+    for c, (office, party) in enumerate(columns):
+        if party in offices.get(office, {}):
+            matrix[:, c] = offices[office][party]
+    return precincts['vtd'], matrix
+
+
+class LiveResults:
+    """County totals kept current from successive precinct snapshots"""
+
+    def __init__(self, year, output_dir):
+        self.year = year
+        self.output_dir = output_dir
+        self.columns = [(office, party) for office, parties in COLUMNS_2024 for party, _ in parties]
+        # office -> its column indexes, in COLUMNS_2024 order
+        self.offices = {}
+        for c, (office, _) in enumerate(self.columns):
+            self.offices.setdefault(office, []).append(c)
+
+        self.rows = {}                                       # VTD id -> precinct row
+        self.county_of_row = np.zeros(0, dtype=np.intp)
+        self.precinct_votes = np.zeros((0, len(self.columns)), dtype=np.int64)
+        self.county_votes = np.zeros((len(COUNTIES), len(self.columns)), dtype=np.int64)
+
+        # Published state per contest id: county results and ratings in feature order
+        self.contest_names = {}
+        self.results = {}
+        self.styles = {}
+        self.sequence = 0
+        self.written = {}                                    # contest id -> sequence last written
+
+    def _intern(self, vtd):
+        """Rows of `vtd`, growing the precinct arrays for ids not seen before"""
+        new = [vtd_id for vtd_id in vtd if vtd_id not in self.rows]
+        if new:
+            for vtd_id in new:
+                self.rows[vtd_id] = len(self.rows)
+            counties = [_COUNTY_OF_GEOID.get(vtd_id[:5], -1) for vtd_id in new]
+            self.county_of_row = np.concatenate([self.county_of_row, np.array(counties, dtype=np.intp)])
+            self.precinct_votes = np.vstack([self.precinct_votes,
+                                             np.zeros((len(new), len(self.columns)), dtype=np.int64)])
+        return np.array([self.rows[vtd_id] for vtd_id in vtd], dtype=np.intp)
+
+    def apply(self, vtd, matrix):
+        """Fold one snapshot in; returns {office: affected county indexes} for offices that changed"""
+        rows = self._intern(vtd)
+        current = np.zeros_like(self.precinct_votes)
+        current[rows] = matrix
+
+        delta = current - self.precinct_votes
+        changed = np.flatnonzero(delta.any(axis=1))
+        changed = changed[self.county_of_row[changed] >= 0]
+        self.precinct_votes = current
+        if not changed.size:
+            return {}
+
+        np.add.at(self.county_votes, self.county_of_row[changed], delta[changed])
+        affected = {}
+        for office, cols in self.offices.items():
+            touched = changed[delta[np.ix_(changed, cols)].any(axis=1)]
+            if touched.size:
+                affected[office] = np.unique(self.county_of_row[touched])
+        return affected
+
+    def county_entry(self, office, county_idx):
+        """Model entry (as load_year_model builds) of one county from the live totals"""
+        votes, candidates = {}, {}
+        for c in self.offices[office]:
+            party = self.columns[c][1]
+            if self.county_votes[county_idx, c] <= 0:
+                continue
+            # Like the county CSVs, parties without a vote in the county are left out
+            votes[party] = int(self.county_votes[county_idx, c])
+            candidates[party] = normalize_candidate_name(get_candidate_name(self.year, office, party))
+        return {'votes_by_party': votes, 'candidates_by_party': candidates}
+
+    def recompute(self, affected):
+        """Refresh the results and ratings of the affected counties only; returns the contest ids touched"""
+        touched = []
+        for office, counties in affected.items():
+            contest_id = f"{normalize_office_name(office)}_{self.year}"
+            contest_name = get_contest_name(office, self.year)
+            self.contest_names[contest_id] = contest_name
+            results = self.results.setdefault(contest_id, {})
+            styles = self.styles.setdefault(contest_id, [0] * len(COUNTIES))
+            for county_idx in counties.tolist():
+                county = COUNTIES[county_idx]
+                data = self.county_entry(office, county_idx)
+                if not data['votes_by_party']:
+                    results.pop(county.name, None)
+                    styles[county_idx] = 0
+                    continue
+                result = contest_result(data, contest_name, self.year)
+                results[county.name] = {'county': county.name, 'feature_id': feature_id(county), **result}
+                styles[county_idx] = summarize_county(data)['tier'][2]
+            touched.append(contest_id)
+        return touched
+
+    def publish(self, contest_ids, source):
+        """Rewrite the touched contest shards, then the index that points readers at them"""
+        self.sequence += 1
+        updated = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        for contest_id in contest_ids:
+            _write_json(os.path.join(self.output_dir, f'{contest_id}.json'), {
+                'contest_id': contest_id,
+                'contest_name': self.contest_names[contest_id],
+                'year': str(self.year),
+                'sequence': self.sequence,
+                'updated': updated,
+                'results': dict(sorted(self.results[contest_id].items())),
+                'styles': self.styles[contest_id],
+            })
+            self.written[contest_id] = self.sequence
+        # The index goes last, so it never names a shard sequence that is not on disk yet
+        _write_json(os.path.join(self.output_dir, INDEX_FILE), {
+            'year': self.year,
+            'sequence': self.sequence,
+            'updated': updated,
+            'source': source,
+            'contests': self.written,
+        })
+
+    def ingest(self, path, ledger):
+        """Read one drop file and publish what it changed; returns the contest ids rewritten"""
+        vtd, matrix = read_snapshot(path, self.columns, ledger)
+        touched = self.recompute(self.apply(vtd, matrix))
+        if touched:
+            self.publish(touched, source_name(path))
+        return touched
+
+
+def drop_files(drop_dir):
+    """{path: (mtime_ns, size)} of the precinct files in the drop directory"""
+    files = {}
+    with os.scandir(drop_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not entry.is_file() or name.endswith('.tmp'):
+                continue
+            if any(name.endswith('.csv' + suffix) for suffix in SOURCE_SUFFIXES):
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def ingest_and_report(live, path, ledger):
+    start = time.perf_counter()
+    touched = live.ingest(path, ledger)
+    elapsed = time.perf_counter() - start
+    if touched:
+        print(f"  ✓ {source_name(path)}: update {live.sequence}, {len(touched)} contests rewritten "
+              f"({', '.join(touched)}) in {elapsed:.2f}s")
+    else:
+        print(f"  - {source_name(path)}: no precinct changed ({elapsed:.2f}s)")
+
+
+def watch(drop_dir, year=2024, data_dir=DATA_DIR, once=False):
+    output_dir = os.path.join(data_dir, LIVE_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    live = LiveResults(year, output_dir)
+    ledger = ParseLedger()
+
+    if once:
+        files = drop_files(drop_dir)
+        if not files:
+            print(f"  ⚠ No precinct files in {drop_dir}")
+            return live
+        ingest_and_report(live, max(files, key=lambda path: files[path][0]), ledger)
+        return live
+
+    print(f"Watching {drop_dir} (Ctrl+C to stop)")
+    seen, done = {}, {}
+    try:
+        while True:
+            files = drop_files(drop_dir)
+            # Settled: same size and mtime as the last poll, and not ingested at that signature
+            settled = [path for path, signature in files.items()
+                       if seen.get(path) == signature and done.get(path) != signature]
+            if settled:
+                # Every drop is a full snapshot, so only the newest one matters
+                path = max(settled, key=lambda p: files[p][0])
+                for other in settled:
+                    done[other] = files[other]
+                ingest_and_report(live, path, ledger)
+            seen = files
+            time.sleep(POLL_SECONDS)
+    except KeyboardInterrupt:
+        print(f"\nStopped after {live.sequence} updates")
+    return live
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Live precinct ingest")
+    print("=" * 60)
+
+    if len(sys.argv) < 2 or sys.argv[1].startswith('--'):
+        print("Usage: python live_ingest.py DROP_DIR [--year 2024] [--once]")
+        sys.exit(1)
+    year = int(sys.argv[sys.argv.index('--year') + 1]) if '--year' in sys.argv else 2024
+    watch(sys.argv[1], year=year, once='--once' in sys.argv)
@@ -0,0 +1,131 @@
+"""
+Parse one large CSV on several cores
+The file is cut into byte ranges that end on record boundaries (newlines
+outside quoted fields), each range is parsed in a worker process into a
+partial Tally, and the partials are merged. Tally sums do not depend on row
+order, so the result is identical to a serial run
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from source_io import COMPRESSED_SUFFIXES, close_buffer, map_source, open_source, split_archive
+from vote_parsing import ParseLedger, VoteParser
+
+NEWLINE, CR, COMMA, QUOTE = (ord(c) for c in '\n\r,"')
+
+# Below this many bytes per worker the pool costs more than it saves
+MIN_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def quoted_spans(data):
+    """(start, end) byte spans of quoted fields, following the csv module's rules
+
+    A quote opens a field only at the start of a field; inside a field a doubled
+    quote is an escape and a single quote closes it. Stray quotes elsewhere are
+    literal text, so they do not flip the state the way a plain parity count would.
+    """
+    quotes = np.flatnonzero(data == QUOTE).tolist()
+    spans = []
+    opened = None
+    i = 0
+    while i < len(quotes):
+        at = quotes[i]
+        if opened is None:
+            if at == 0 or data[at - 1] in (COMMA, NEWLINE, CR):
+                opened = at
+        elif i + 1 < len(quotes) and quotes[i + 1] == at + 1:
+            i += 1  # "" inside a quoted field
+        else:
+            spans.append((opened, at))
+            opened = None
+        i += 1
+    if opened is not None:
+        spans.append((opened, len(data)))
+    return spans
+
+
+def record_ends(data):
+    """Offsets just past every newline that ends a record"""
+    newlines = np.flatnonzero(data == NEWLINE)
+    spans = quoted_spans(data)
+    if spans:
+        starts, ends = np.array(spans, dtype=np.int64).T
+        # A newline is inside a quoted field when the last span opened before it is still open
+        last = np.searchsorted(starts, newlines, side='right') - 1
+        inside = (last >= 0) & (newlines < ends[np.maximum(last, 0)])
+        newlines = newlines[~inside]
+    return newlines + 1
+
+
+def chunk_ranges(data, chunks):
+    """Header end plus `chunks` (start, end) byte ranges cut at record boundaries"""
+    ends = record_ends(data)
+    header_end = int(ends[0]) if len(ends) else len(data)
+    body = len(data) - header_end
+    cuts = [header_end]
+    for k in range(1, chunks):
+        target = header_end + body * k // chunks
+        at = np.searchsorted(ends, target)
+        if at < len(ends) and ends[at] > cuts[-1]:
+            cuts.append(int(ends[at]))
+    cuts.append(len(data))
+    return header_end, [(start, end) for start, end in zip(cuts, cuts[1:]) if end > start]
+
+
+def _text(data):
+    """Decode bytes the way open_source does (utf-8, universal newlines)"""
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+
+
+def _parse_range(path, fieldnames, start, end, tally_rows, source):
+    """Worker: tally the records in one byte range with a private ledger"""
+    buffer = map_source(path)
+    try:
+        chunk = bytes(buffer[start:end])
+    finally:
+        close_buffer(buffer)
+    parser = VoteParser(source, ParseLedger())
+    tally = tally_rows(csv.DictReader(_text(chunk), fieldnames=fieldnames), parser=parser)
+    return tally, parser.ledger
+
+
+def parallel_tally(input_file, tally_rows, parser, workers=None, min_chunk=MIN_CHUNK_BYTES):
+    """Tally a CSV with `tally_rows(rows, parser=...)` across worker processes
+
+    `tally_rows` must be picklable (a module-level function or a partial of
+    one). Small and compressed files are parsed serially in this process.
+    Rejected cells from every worker are merged into `parser`'s ledger.
+    """
+    workers = workers or os.cpu_count() or 1
+    archive, member = split_archive(input_file)
+    compressed = member is not None or archive.lower().endswith(COMPRESSED_SUFFIXES + ('.zip',))
+    size = 0 if compressed else os.path.getsize(input_file)
+    chunks = min(workers, size // min_chunk)
+
+    if chunks <= 1:
+        with open_source(input_file) as f:
+            return tally_rows(csv.DictReader(f), parser=parser)
+
+    buffer = map_source(input_file)
+    try:
+        header_end, ranges = chunk_ranges(np.frombuffer(buffer, dtype=np.uint8), chunks)
+        fieldnames = next(csv.reader(_text(bytes(buffer[:header_end]))))
+    finally:
+        close_buffer(buffer)
+
+    print(f"  Parsing {len(ranges)} chunks on {min(workers, len(ranges))} workers")
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_parse_range, input_file, fieldnames, start, end, tally_rows, parser.source)
+                   for start, end in ranges]
+        # Merge in file order so the ledger keeps the same sample values as a serial run
+        tally = None
+        for future in futures:
+            partial, ledger = future.result()
+            tally = partial if tally is None else tally.merge(partial)
+            parser.ledger.merge(ledger)
+    return tally
@@ -5,39 +5,15 @@ Parse 1990 Minnesota election text data and convert to OpenElections CSV format
 import csv
 import re
 
+from county_lookup import COUNTY_ALIASES, TEXT_PREFIXES
+from source_io import open_source
+
 def parse_1990_text_file(text_file, output_csv):
     """Parse the extracted text file and create proper CSV"""
     
-    # Minnesota county codes
-    county_codes = {
-        'Aitkin': '01', 'Anoka': '02', 'Becker': '03', 'Beltrami': '04',
-        'Benton': '05', 'BigStone': '06', 'Big Stone': '06', 'BlueEarth': '07', 'Blue Earth': '07', 
-        'Brown': '08', 'Carlton': '09', 'Carver': '10', 'Cass': '11', 'Chippewa': '12',
-        'Chisago': '13', 'Clay': '14', 'Clearwater': '15', 'Cook': '16',
-        'Cottonwood': '17', 'CrowWing': '18', 'Crow Wing': '18', 'Dakota': '19', 'Dodge': '20',
-        'Douglas': '21', 'Faribault': '22', 'Fillmore': '23', 'Freeborn': '24',
-        'Goodhue': '25', 'Grant': '26', 'Hennepin': '27', 'Houston': '28',
-        'Hubbard': '29', 'Isanti': '30', 'Itasca': '31', 'Jackson': '32',
-        'Kanabec': '33', 'Kandiyohi': '34', 'Kittson': '35', 'Koochiching': '36',
-        'LacquiParle': '37', 'Lac qui Parle': '37', 'Lake': '38', 'LakeoftheWoods': '39', 
-        'Lakeof theWoods': '39', 'Lake of the Woods': '39', 'LeSueur': '40', 'Le Sueur': '40',
-        'Lincoln': '41', 'Lyon': '42', 'McLeod': '43', 'Mahnomen': '44',
-        'Marshall': '45', 'Martin': '46', 'Meeker': '61', 'MilleLacs': '47', 'Mille Lacs': '47', 
-        'Morrison': '48', 'Mower': '49', 'Murray': '50', 'Nicollet': '51', 'Nobles': '52',
-        'Norman': '53', 'Olmsted': '54', 'OtterTail': '55', 'Otter Tail': '55', 
-        'Pennington': '56', 'Pine': '57', 'Pipestone': '58', 'Polk': '59', 'Pope': '60',
-        'Ramsey': '62', 'RedLake': '63', 'Red Lake': '63', 'Redwood': '64', 'Renville': '65',
-        'Rice': '66', 'Rock': '67', 'Roseau': '68', 'St.Louis': '69', 'St. Louis': '69', 'S1.Louis': '69',
-        'Scott': '70', 'Sherburne': '71', 'Sibley': '72', 'Stearns': '73',
-        'Steele': '74', 'Stevens': '75', 'Swift': '76', 'Todd': '77',
-        'Traverse': '78', 'Wabasha': '79', 'Wadena': '80', 'Waseca': '81',
-        'Washington': '82', 'Watonwan': '83', 'Wilkin': '84', 'Winona': '85',
-        'Wright': '86', 'YellowMedicine': '87', 'Yellow Medicine': '87'
-    }
-    
     results = []
     
-    with open(text_file, 'r', encoding='utf-8') as f:
+    with open_source(text_file) as f:
         content = f.read()
     
     # Find U.S. Senate section - get everything between "UNITED STATES SENATOR" and "GOVERNOR"
@@ -54,12 +30,12 @@ def parse_1990_text_file(text_file, output_csv):
             
             # Try to match county name at the beginning - IMPORTANT: Check longest names first
             matched = False
-            for county in sorted(county_codes.keys(), key=len, reverse=True):
+            for county in TEXT_PREFIXES:
                 if line.startswith(county):
                     matched = True
-                    code = county_codes[county]
+                    code = COUNTY_ALIASES[county].code
                     matched = True
-                    code = county_codes[county]
+                    code = COUNTY_ALIASES[county].code
                     # Extract numbers from the line
                     # Format: CountyName ... Wellstone Boschwitz Bentley
                     parts = line.split()
@@ -74,29 +50,7 @@ def parse_1990_text_file(text_file, output_csv):
                         bentley = numbers[-1]    # GRP
                         
                         # Clean county name
-                        clean_county = county
-                        if clean_county == 'BigStone':
-                            clean_county = 'Big Stone'
-                        elif clean_county == 'BlueEarth':
-                            clean_county = 'Blue Earth'
-                        elif clean_county == 'CrowWing':
-                            clean_county = 'Crow Wing'
-                        elif clean_county == 'LacquiParle':
-                            clean_county = 'Lac qui Parle'
-                        elif clean_county == 'LakeoftheWoods':
-                            clean_county = 'Lake of the Woods'
-                        elif clean_county == 'LeSueur':
-                            clean_county = 'Le Sueur'
-                        elif clean_county == 'MilleLacs':
-                            clean_county = 'Mille Lacs'
-                        elif clean_county == 'OtterTail':
-                            clean_county = 'Otter Tail'
-                        elif clean_county == 'RedLake':
-                            clean_county = 'Red Lake'
-                        elif clean_county == 'St.Louis' or clean_county == 'S1.Louis':
-                            clean_county = 'St. Louis'
-                        elif clean_county == 'YellowMedicine':
-                            clean_county = 'Yellow Medicine'
+                        clean_county = COUNTY_ALIASES[county].name
                         
                         # Calculate total and percentages
                         total = int(wellstone) + int(boschwitz) + int(bentley)
@@ -128,11 +82,11 @@ def parse_1990_text_file(text_file, output_csv):
             
             # Try to match county name at the beginning - IMPORTANT: Check longest names first
             matched = False
-            for county in sorted(county_codes.keys(), key=len, reverse=True):
+            for county in TEXT_PREFIXES:
                 if line.startswith(county):
                     matched = True
                     matched = True
-                    code = county_codes[county]
+                    code = COUNTY_ALIASES[county].code
                     # Extract numbers from the line
                     # Format: CountyName Perpich Carlson ...others...
                     parts = line.split()
@@ -146,29 +100,7 @@ def parse_1990_text_file(text_file, output_csv):
                         carlson = numbers[1]  # IR (Republican)
                         
                         # Clean county name
-                        clean_county = county
-                        if clean_county == 'BigStone':
-                            clean_county = 'Big Stone'
-                        elif clean_county == 'BlueEarth':
-                            clean_county = 'Blue Earth'
-                        elif clean_county == 'CrowWing':
-                            clean_county = 'Crow Wing'
-                        elif clean_county == 'LacquiParle':
-                            clean_county = 'Lac qui Parle'
-                        elif clean_county == 'LakeoftheWoods':
-                            clean_county = 'Lake of the Woods'
-                        elif clean_county == 'LeSueur':
-                            clean_county = 'Le Sueur'
-                        elif clean_county == 'MilleLacs':
-                            clean_county = 'Mille Lacs'
-                        elif clean_county == 'OtterTail':
-                            clean_county = 'Otter Tail'
-                        elif clean_county == 'RedLake':
-                            clean_county = 'Red Lake'
-                        elif clean_county == 'St.Louis' or clean_county == 'S1.Louis':
-                            clean_county = 'St. Louis'
-                        elif clean_county == 'YellowMedicine':
-                            clean_county = 'Yellow Medicine'
+                        clean_county = COUNTY_ALIASES[county].name
                         
                         # Calculate total and percentages
                         total = int(perpich) + int(carlson)
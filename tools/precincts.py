@@ -0,0 +1,223 @@
+"""
+Precinct-level vote columns collected in the same pass as the county tally
+Precincts are keyed by VTD id (state + county FIPS + 4-digit precinct code,
+the VTDID of the Secretary of State files), so a line's id comes from the
+county the converter already resolved plus its precinct code. Lines that share
+an id are summed. Alongside the votes a PrecinctSpec can keep each precinct's
+district codes, its turnout columns (7am registration, election-day
+registration, absentee ballots, ballots cast) and district contests (U.S.
+House, State Senate, State House), which only exist per precinct because a
+county spans several districts. write_precincts() saves one year as columnar
+JSON: one array of VTD ids and one array per party, district and turnout
+column in the same order
+"""
+
+import json
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from county_lookup import COUNTIES
+
+# Per-county GEOID, the first five digits of a VTD id
+_GEOIDS = np.array([county.geoid for county in COUNTIES])
+
+# Columns of one precinct file: precinct code and name, ((district key, column), ...),
+# ((turnout key, (columns summed, ...)), ...) and district contests as
+# ((office, ((party, column), ...)), ...), kept per precinct only
+PrecinctSpec = namedtuple('PrecinctSpec', ['code', 'name', 'districts', 'turnout', 'contests'],
+                          defaults=((), (), ()))
+
+# District contest office -> district it is counted by
+DISTRICT_OFFICES = {
+    'U.S. House': 'congressional',
+    'State Senate': 'state_senate',
+    'State House': 'state_house',
+}
+
+
+def district_number(code):
+    """Canonical district code: "08" -> "8", "03B" -> "3B"; blank or unreadable codes give ''"""
+    match = re.fullmatch(r'0*(\d+)\s*([A-Za-z]?)', code.strip())
+    return f"{match.group(1)}{match.group(2).upper()}" if match else ''
+
+
+def district_codes(districts):
+    """Canonical congressional, state senate and state house codes from a precinct file's
+    district columns; the senate district is the house district's number when the
+    file has no senate column"""
+    codes = {key: [district_number(code) for code in districts[key]]
+             for key in ('congressional', 'state_senate') if key in districts}
+    if 'legislative' in districts:
+        codes['state_house'] = [district_number(code) for code in districts['legislative']]
+        codes.setdefault('state_senate', [code.rstrip('AB') for code in codes['state_house']])
+    return codes
+
+
+def vtd_ids(county_idx, codes):
+    """VTD ids from county indexes and precinct codes ("5", "0005" and " 5" all give ...0005)"""
+    codes = np.asarray(codes, dtype=str)
+    if not codes.size:
+        return codes
+    codes = np.char.zfill(np.char.strip(codes), 4)
+    return np.char.add(_GEOIDS[np.asarray(county_idx, dtype=np.intp)], codes)
+
+
+class PrecinctTally:
+    """Vote and turnout columns per precinct, filled alongside a Tally
+
+    Columns are kept as (rows, values) chunks while files are read and only
+    summed into dense per-precinct arrays by columns(), so adding a chunk
+    costs an append.
+    """
+
+    def __init__(self):
+        self.ids = {}        # VTD id -> row
+        self.names = []      # row -> precinct name
+        self.districts = {}  # district key -> [code per row]
+        self.chunks = {}     # (office, party) -> ([row arrays], [vote arrays])
+        self.turnout = {}    # turnout key -> ([row arrays], [count arrays])
+        self.added = set()   # (office, party) columns read into this tally by add_column
+
+    def rows(self, ids, names, districts=None):
+        """Intern VTD ids and return their rows; the first name and districts seen for an id are kept"""
+        districts = districts or {}
+        for key in districts:
+            self.districts.setdefault(key, [''] * len(self.ids))
+        rows = np.empty(len(ids), dtype=np.intp)
+        for i, (vtd, name) in enumerate(zip(ids, names)):
+            row = self.ids.get(vtd)
+            if row is None:
+                row = self.ids[vtd] = len(self.ids)
+                self.names.append(name)
+                for key, codes in self.districts.items():
+                    codes.append(districts[key][i] if key in districts else '')
+            rows[i] = row
+        return rows
+
+    def add_column(self, rows, office, party, votes):
+        """Add one vote column aligned with `rows`; a file's (office, party) column is read once
+
+        A second column for the same office and party would be summed into the
+        first, so it is an error (a column listed twice in the specs) rather
+        than a silent double count. Parts combined by merge() are not checked.
+        """
+        if (office, party) in self.added:
+            raise ValueError(f"precinct column {office} / {party} read twice; it is listed twice in the column specs")
+        self.added.add((office, party))
+        self._add_chunk(rows, office, party, votes)
+
+    def _add_chunk(self, rows, office, party, votes):
+        rows_chunks, vote_chunks = self.chunks.setdefault((office, party), ([], []))
+        rows_chunks.append(np.asarray(rows, dtype=np.intp))
+        vote_chunks.append(np.asarray(votes, dtype=np.int64))
+
+    def add_turnout(self, rows, key, counts):
+        """Add one turnout column aligned with `rows`"""
+        rows_chunks, count_chunks = self.turnout.setdefault(key, ([], []))
+        rows_chunks.append(np.asarray(rows, dtype=np.intp))
+        count_chunks.append(np.asarray(counts, dtype=np.int64))
+
+    def merge(self, other):
+        """Add another precinct tally (a worker's part, or csv fallback lines) into this one"""
+        remap = self.rows(list(other.ids), other.names, other.districts)
+        for (office, party), (rows_chunks, vote_chunks) in other.chunks.items():
+            for rows, votes in zip(rows_chunks, vote_chunks):
+                self._add_chunk(remap[rows], office, party, votes)
+        for key, (rows_chunks, count_chunks) in other.turnout.items():
+            for rows, counts in zip(rows_chunks, count_chunks):
+                self.add_turnout(remap[rows], key, counts)
+        return self
+
+    def _sum(self, rows_chunks, value_chunks, order):
+        # Summed in int64 (bincount weights would go through float64)
+        summed = np.zeros(len(self.ids), dtype=np.int64)
+        np.add.at(summed, np.concatenate(rows_chunks), np.concatenate(value_chunks))
+        return summed[order]
+
+    def columns(self):
+        """Dense columns sorted by VTD id: {'vtd', 'names', 'districts': {key: codes},
+        'offices': {office: {party: votes}}, 'turnout': {key: counts}}, offices in first-seen order"""
+        order = np.argsort(list(self.ids), kind='stable')
+        offices = {}
+        for (office, party), chunks in self.chunks.items():
+            offices.setdefault(office, {})[party] = self._sum(*chunks, order)
+        return {
+            'vtd': np.array(list(self.ids))[order].tolist(),
+            'names': [self.names[i] for i in order],
+            'districts': {key: [codes[i] for i in order] for key, codes in self.districts.items()},
+            'offices': offices,
+            'turnout': {key: self._sum(*chunks, order) for key, chunks in self.turnout.items()},
+        }
+
+
+def tally_precinct_columns(county_idx, keys, spec, vote_columns, turnout_values):
+    """PrecinctTally of parsed csv rows: `keys` holds (code, name, district codes) per row,
+    `vote_columns` (office, party, values) per column and `turnout_values` one list per spec.turnout key"""
+    precincts = PrecinctTally()
+    codes, names, districts = zip(*keys) if keys else ((), (), ())
+    rows = precincts.rows(vtd_ids(county_idx, codes).tolist(), names,
+                          {key: [row[i] for row in districts] for i, (key, _) in enumerate(spec.districts)})
+    for office, party, values in vote_columns:
+        precincts.add_column(rows, office, party, values)
+    for (key, _), values in zip(spec.turnout, turnout_values):
+        precincts.add_turnout(rows, key, values)
+    return precincts
+
+
+def district_contest_columns(spec, office_columns):
+    """(office, party, column) of the spec's district contests, leaving out any office and
+    party the year already reads as a county column (2010's State Senate), whose votes
+    reach the precinct tally through that column"""
+    read = {(office, party) for office, parties in office_columns for party, _ in parties}
+    return [(office, party, column) for office, parties in spec.contests for party, column in parties
+            if (office, party) not in read]
+
+
+def precinct_key(spec, row):
+    """(precinct code, name, district codes) of a csv row"""
+    return (row.get(spec.code) or '', (row.get(spec.name) or '').strip(),
+            tuple((row.get(column) or '').strip() for _, column in spec.districts))
+
+
+def write_precincts(precincts, year, output_path, candidate_of=None):
+    """Save one year's precinct columns as compact JSON
+
+    {"year", "vtd": [ids], "names": [...], "districts": {key: [codes]},
+    "turnout": {key: [counts]}, "contests": [{"office", "parties",
+    "candidates", "votes": [[per precinct] per party]}]}; district contests
+    also name the district key they are counted by. Party columns without a
+    vote anywhere are dropped. `candidate_of(year, office, party)` fills the
+    candidate names when given.
+    """
+    columns = precincts.columns()
+    contests = []
+    for office, parties in columns['offices'].items():
+        # Like the county tally, party columns with no votes anywhere are left out
+        parties = {party: votes for party, votes in parties.items() if votes.any()}
+        if not parties:
+            continue
+        contest = {'office': office}
+        if office in DISTRICT_OFFICES:
+            contest['district'] = DISTRICT_OFFICES[office]
+        contest.update({
+            'parties': list(parties),
+            'candidates': [candidate_of(year, office, party) if candidate_of else '' for party in parties],
+            'votes': [votes.tolist() for votes in parties.values()],
+        })
+        contests.append(contest)
+    result = {
+        'year': year,
+        'vtd': columns['vtd'],
+        'names': columns['names'],
+        'districts': columns['districts'],
+        'turnout': {key: counts.tolist() for key, counts in columns['turnout'].items()},
+        'contests': contests,
+    }
+
+    with open(output_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(result, f, separators=(',', ':'))
+    os.replace(output_path + '.tmp', output_path)
+    print(f"  ✓ Created: {output_path} ({len(result['vtd'])} precincts, {len(contests)} contests)")
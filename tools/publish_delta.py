@@ -0,0 +1,156 @@
+"""
+Publish a new build of mn_elections_aggregated.json with a patch for cached copies
+Each published build gets a version (the start of its SHA-256). The page keeps
+the last version it downloaded in IndexedDB (scripts/election_cache.js); this
+script writes a patch from the previously published build to the new one and
+records it in mn_elections_manifest.json, so a returning visitor follows the
+patch chain from its cached version instead of downloading the whole file.
+
+Patches hold only the records that changed (see election_index.py):
+  {"from": <version>, "to": <version>, "ops": [{"op": "set", "path": [...], "value": ...},
+                                               {"op": "delete", "path": [...]}]}
+Deletes come first; a whole year or contest that appears or disappears is one op.
+
+Usage: python publish_delta.py [--previous OLD.json]
+(--previous diffs against a given build when there is no published snapshot yet)
+"""
+
+import json
+import os
+import shutil
+import sys
+
+from election_index import diff_indexes, file_version, index_document, load_document, outermost_missing
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+PUBLISHED_FILE = 'mn_elections_aggregated.json'
+MANIFEST_FILE = 'mn_elections_manifest.json'
+PATCH_DIR = 'patches'
+# Copy of the last published build, the base of the next patch
+RELEASE_DIR = 'releases'
+
+# Cached copies more than this many releases old download the full file instead
+MAX_CHAIN = 10
+
+
+def _value_at(doc, path):
+    for key in path:
+        doc = doc[key]
+    return doc
+
+
+def build_patch(old_doc, new_doc, old_version, new_version):
+    """Patch that turns old_doc into new_doc"""
+    added, removed, changed = diff_indexes(index_document(old_doc), index_document(new_doc))
+
+    # A removed (or added) subtree is one op at its top instead of one per record
+    deletes = list(dict.fromkeys(outermost_missing(path, new_doc) for path in removed))
+    sets = list(dict.fromkeys(outermost_missing(path, old_doc) for path in added)) + changed
+
+    ops = [{'op': 'delete', 'path': list(path)} for path in deletes]
+    ops += [{'op': 'set', 'path': list(path), 'value': _value_at(new_doc, path)} for path in sets]
+    return {'from': old_version, 'to': new_version, 'ops': ops}, (len(added), len(removed), len(changed))
+
+
+def apply_patch(doc, patch):
+    """Apply a patch in place (the same steps as applyElectionPatch in the page)"""
+    for op in patch['ops']:
+        *parents, key = op['path']
+        node = doc
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        if op['op'] == 'delete':
+            node.pop(key, None)
+        else:
+            node[key] = op['value']
+    return doc
+
+
+def _write_json(path, value):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + '.tmp', path)
+
+
+def prune_chain(patches, version):
+    """Keep the patches whose chain reaches `version` within MAX_CHAIN steps
+
+    A chain that comes back to a version it already passed never reaches
+    `version`, so its patches are dropped.
+    """
+    kept = {}
+    for start in patches:
+        at, seen = start, set()
+        while at != version and at in patches and at not in seen and len(seen) < MAX_CHAIN:
+            seen.add(at)
+            at = patches[at]['to']
+        if at == version:
+            kept[start] = patches[start]
+    return kept
+
+
+def publish(data_dir=DATA_DIR, previous=None):
+    new_path = os.path.join(data_dir, PUBLISHED_FILE)
+    manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+    release_dir = os.path.join(data_dir, RELEASE_DIR)
+    patch_dir = os.path.join(data_dir, PATCH_DIR)
+
+    version = file_version(new_path)
+    manifest = {'patches': {}}
+    if os.path.exists(manifest_path):
+        manifest = load_document(manifest_path)
+    if manifest.get('version') == version:
+        print(f"✓ {PUBLISHED_FILE} {version} is already published")
+        return manifest
+
+    if previous is None and manifest.get('version'):
+        previous = os.path.join(release_dir, f"mn_elections_{manifest['version']}.json")
+    patches = dict(manifest.get('patches', {}))
+
+    if previous and os.path.exists(previous):
+        old_version = file_version(previous)
+        patch, (added, removed, changed) = build_patch(load_document(previous), load_document(new_path),
+                                                      old_version, version)
+        os.makedirs(patch_dir, exist_ok=True)
+        patch_name = f"{PATCH_DIR}/{old_version}-{version}.json"
+        _write_json(os.path.join(data_dir, patch_name), patch)
+        size = os.path.getsize(os.path.join(data_dir, patch_name))
+        patches[old_version] = {'to': version, 'file': patch_name, 'size': size}
+        print(f"✓ Patch {old_version} -> {version}: {len(patch['ops'])} ops "
+              f"({added} added, {removed} removed, {changed} changed records), {size:,} bytes")
+    else:
+        print("⚠ No previous build to diff against; cached copies will download the full file")
+
+    kept = prune_chain(patches, version)
+    for start in set(patches) - set(kept):
+        stale = os.path.join(data_dir, patches[start]['file'])
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    # Snapshot this build as the base of the next patch
+    os.makedirs(release_dir, exist_ok=True)
+    for name in os.listdir(release_dir):
+        if name.startswith('mn_elections_') and name.endswith('.json'):
+            os.remove(os.path.join(release_dir, name))
+    shutil.copyfile(new_path, os.path.join(release_dir, f"mn_elections_{version}.json"))
+
+    manifest = {
+        'version': version,
+        'file': PUBLISHED_FILE,
+        'size': os.path.getsize(new_path),
+        'patches': kept,
+    }
+    _write_json(manifest_path, manifest)
+    print(f"✓ Published {PUBLISHED_FILE} {version} ({manifest['size']:,} bytes, {len(kept)} patches in chain)")
+    return manifest
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Publishing election data")
+    print("=" * 60)
+    previous = None
+    if '--previous' in sys.argv:
+        previous = sys.argv[sys.argv.index('--previous') + 1]
+    publish(previous=previous)
@@ -0,0 +1,285 @@
+"""
+Small read-only HTTP API over the county results
+Loads mn_county_elections.json once, indexes it by contest, county, year and
+candidate, and answers with just the slice asked for:
+  /contests                       every contest id with its year, office and name
+  /contest/{id}                   county results of one contest plus statewide totals
+  /county/{name}/history          one county's result in every contest (?office=presidential)
+  /year/{year}                    the contests of one year
+  /candidate/{name}               contests whose DFL or Republican candidate matches (case-insensitive substring)
+  /swing?from={id}&to={id}        per-county margin change between two contests, with flips
+Responses are JSON built once per distinct path and query and kept in a
+bounded LRU cache with their ETag; a client that sends the ETag back in
+If-None-Match gets a 304 with no body. Runs on asyncio streams with HTTP/1.1
+keep-alive and needs only the standard library.
+
+Usage: python query_api.py [--port 8001] [--host 127.0.0.1]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from county_lookup import resolve_county
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+ELECTIONS_FILE = 'mn_county_elections.json'
+
+# Distinct responses kept built; every response is small, so this bounds memory to a few MB
+CACHE_SIZE = 2048
+MAX_HEADER_LINES = 100
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def signed_margin(result):
+    """Margin in points, positive = Republican lead (the county JSON stores it unsigned with a winner)"""
+    if result['winner'] == 'DEM':
+        return -result['margin_pct']
+    return result['margin_pct'] if result['winner'] == 'REP' else 0.0
+
+
+class ResultsIndex:
+    """Lookups over one mn_county_elections.json document"""
+
+    def __init__(self, doc):
+        self.contests = {}                        # contest id -> {'year', 'office', 'contest_name', 'results'}
+        self.by_year = defaultdict(list)          # year -> [contest ids]
+        self.by_county = defaultdict(list)        # canonical county name -> [(contest id, result)] in year order
+        self.by_candidate = defaultdict(dict)     # lowercased candidate -> {(contest id, party): name as spelled}
+
+        for year, offices in sorted(doc['results_by_year'].items()):
+            for office, contests in offices.items():
+                for contest_id, contest in contests.items():
+                    self.contests[contest_id] = {'year': int(year), 'office': office,
+                                                 'contest_name': contest['contest_name'],
+                                                 'results': contest['results']}
+                    self.by_year[int(year)].append(contest_id)
+                    for county, result in contest['results'].items():
+                        # Some years spell a few counties differently ("Mcleod"); history follows the county
+                        record = resolve_county(county)
+                        self.by_county[record.name if record else county].append((contest_id, result))
+                        for party, key in (('DFL', 'dem_candidate'), ('R', 'rep_candidate')):
+                            if result.get(key):
+                                self.by_candidate[result[key].lower()].setdefault((contest_id, party), result[key])
+
+    def county_name(self, value):
+        county = resolve_county(value)
+        if county is None or county.name not in self.by_county:
+            raise NotFound(f"unknown county {value!r}")
+        return county.name
+
+    def contest(self, contest_id):
+        if contest_id not in self.contests:
+            raise NotFound(f"unknown contest {contest_id!r}")
+        return self.contests[contest_id]
+
+
+def canonical_results(results):
+    """Contest results keyed by canonical county name, so contests from different years line up"""
+    keyed = {}
+    for county, result in results.items():
+        record = resolve_county(county)
+        keyed[record.name if record else county] = result
+    return keyed
+
+
+def contest_summary(contest_id, contest):
+    return {'contest_id': contest_id, 'year': contest['year'], 'office': contest['office'],
+            'contest_name': contest['contest_name']}
+
+
+def statewide(results):
+    """Statewide totals and signed margin summed from the county results"""
+    totals = {key: sum(result[key] for result in results.values())
+              for key in ('dem_votes', 'rep_votes', 'other_votes', 'total_votes')}
+    two_party = totals['dem_votes'] + totals['rep_votes']
+    margin = (totals['rep_votes'] - totals['dem_votes']) / two_party * 100 if two_party else 0.0
+    return {**totals, 'margin_pct': round(margin, 2)}
+
+
+def route(index, path, query):
+    """JSON-ready value for one request path and query, or NotFound / BadRequest"""
+    parts = [unquote(part) for part in path.strip('/').split('/') if part]
+
+    if parts == ['contests']:
+        return [contest_summary(contest_id, contest) for contest_id, contest in index.contests.items()]
+
+    if len(parts) == 2 and parts[0] == 'contest':
+        contest = index.contest(parts[1])
+        return {**contest_summary(parts[1], contest), 'statewide': statewide(contest['results']),
+                'results': contest['results']}
+
+    if len(parts) == 3 and parts[0] == 'county' and parts[2] == 'history':
+        county = index.county_name(parts[1])
+        office = query.get('office')
+        history = []
+        for contest_id, result in index.by_county[county]:
+            contest = index.contests[contest_id]
+            if office and contest['office'] != office:
+                continue
+            history.append({**contest_summary(contest_id, contest), 'margin_signed': signed_margin(result),
+                            **{key: value for key, value in result.items() if key not in ('county', 'contest', 'year')}})
+        return {'county': county, 'history': history}
+
+    if len(parts) == 2 and parts[0] == 'year':
+        if not parts[1].isdigit() or int(parts[1]) not in index.by_year:
+            raise NotFound(f"no contests in {parts[1]!r}")
+        return [contest_summary(contest_id, index.contests[contest_id]) for contest_id in index.by_year[int(parts[1])]]
+
+    if len(parts) == 2 and parts[0] == 'candidate':
+        needle = parts[1].lower()
+        matches = sorted((contest_id, party, name) for key, entries in index.by_candidate.items() if needle in key
+                         for (contest_id, party), name in entries.items())
+        return [{**contest_summary(contest_id, index.contests[contest_id]), 'party': party, 'candidate': name}
+                for contest_id, party, name in matches]
+
+    if parts == ['swing']:
+        if 'from' not in query or 'to' not in query:
+            raise BadRequest("swing needs from= and to= contest ids")
+        before = canonical_results(index.contest(query['from'])['results'])
+        after = canonical_results(index.contest(query['to'])['results'])
+        counties = []
+        for county in sorted(set(before) & set(after)):
+            a, b = signed_margin(before[county]), signed_margin(after[county])
+            counties.append({'county': county, 'feature_id': after[county].get('feature_id'),
+                             'from_margin': a, 'to_margin': b, 'swing': round(b - a, 2),
+                             'flip': 'D->R' if a < 0 < b else 'R->D' if b < 0 < a else None})
+        swings = [county['swing'] for county in counties]
+        return {
+            'from': query['from'], 'to': query['to'],
+            'mean_swing': round(sum(swings) / len(swings), 2) if swings else None,
+            'toward_rep': sum(swing > 0 for swing in swings),
+            'toward_dem': sum(swing < 0 for swing in swings),
+            'flips_to_rep': sum(county['flip'] == 'D->R' for county in counties),
+            'flips_to_dem': sum(county['flip'] == 'R->D' for county in counties),
+            'counties': counties,
+        }
+
+    raise NotFound(f"no route for {path!r}")
+
+
+class QueryAPI:
+    """Route requests and cache the encoded responses"""
+
+    def __init__(self, index, cache_size=CACHE_SIZE):
+        self.index = index
+        self.respond = lru_cache(maxsize=cache_size)(self._respond)
+
+    def _respond(self, path, query):
+        """(status, body, etag) for a path and a sorted tuple of query pairs"""
+        try:
+            value, status = route(self.index, path, dict(query)), 200
+        except NotFound as error:
+            value, status = {'error': str(error)}, 404
+        except BadRequest as error:
+            value, status = {'error': str(error)}, 400
+        body = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        return status, body, etag
+
+    async def handle(self, reader, writer):
+        """Serve one keep-alive connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    headers = {}
+                    for _ in range(MAX_HEADER_LINES):
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # A request or header line longer than the stream's buffer limit
+                    writer.write(self._head(400, 0, None, keep_alive=False))
+                    await writer.drain()
+                    break
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(self._head(400, 0, None, keep_alive=False))
+                    break
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and (version == 'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'))
+                if 'transfer-encoding' in headers or headers.get('content-length', '0') not in ('', '0'):
+                    # No route reads a request body; close rather than parse the unread body as the next request
+                    keep_alive = False
+
+                if method not in ('GET', 'HEAD'):
+                    writer.write(self._head(405, 0, None, keep_alive, extra='Allow: GET, HEAD\r\n'))
+                else:
+                    url = urlsplit(target)
+                    status, body, etag = self.respond(url.path, tuple(sorted(parse_qsl(url.query))))
+                    if status == 200 and etag in headers.get('if-none-match', ''):
+                        writer.write(self._head(304, None, etag, keep_alive))
+                    else:
+                        writer.write(self._head(status, len(body), etag, keep_alive))
+                        if method == 'GET':
+                            writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _head(status, length, etag, keep_alive, extra=''):
+        reason = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed'}[status]
+        head = f'HTTP/1.1 {status} {reason}\r\n'
+        if length is not None:
+            head += f'Content-Type: application/json; charset=utf-8\r\nContent-Length: {length}\r\n'
+        if etag:
+            # Clients may keep the response but must revalidate it, which costs a 304 when unchanged
+            head += f'ETag: {etag}\r\nCache-Control: no-cache\r\n'
+        head += 'Access-Control-Allow-Origin: *\r\n'
+        head += extra + ('Connection: keep-alive\r\n' if keep_alive else 'Connection: close\r\n')
+        return (head + '\r\n').encode('latin-1')
+
+
+def load_index(data_dir=DATA_DIR):
+    with open(os.path.join(data_dir, ELECTIONS_FILE), 'r', encoding='utf-8') as f:
+        return ResultsIndex(json.load(f))
+
+
+async def serve(host='127.0.0.1', port=8001, data_dir=DATA_DIR):
+    index = load_index(data_dir)
+    api = QueryAPI(index)
+    server = await asyncio.start_server(api.handle, host, port)
+    print(f"✓ {len(index.contests)} contests, {len(index.by_county)} counties, "
+          f"{len(index.by_candidate)} candidates indexed")
+    print(f"Serving on http://{host}:{port} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Results query API")
+    print("=" * 60)
+
+    port = int(sys.argv[sys.argv.index('--port') + 1]) if '--port' in sys.argv else 8001
+    host = sys.argv[sys.argv.index('--host') + 1] if '--host' in sys.argv else '127.0.0.1'
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        print("\nStopped")
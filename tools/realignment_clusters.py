@@ -0,0 +1,156 @@
+"""
+Cluster counties by how their vote moved across every contest since 1990
+Each county becomes a vector of its margin relative to the statewide margin in
+all contests (so a county that tracks the state sits at 0 throughout); offices
+a county has no result for are filled with that county's own average. K-means
+groups the vectors and a nearest-neighbour table lists each county's most
+similar counties. Results are cached in mn_realignment_clusters.json keyed by
+the hash of mn_county_elections.bin and only recomputed when the data or the
+parameters change
+
+Usage: python realignment_clusters.py [--k CLUSTERS] [--neighbors N] [--force]
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from election_binary import read_binary
+from election_index import file_version
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+BINARY_FILE = 'mn_county_elections.bin'
+OUTPUT_FILE = 'mn_realignment_clusters.json'
+
+CLUSTERS = 6
+NEIGHBORS = 5
+RESTARTS = 20
+SEED = 1990
+
+
+def relative_margins(decoded):
+    """(contest ids, counties x contests matrix of margin minus statewide margin, missing filled)"""
+    contests = decoded['contests']
+    columns = []
+    for contest in contests:
+        dem = contest['dem_votes'].astype(np.float64)
+        rep = contest['rep_votes'].astype(np.float64)
+        statewide = (rep.sum() - dem.sum()) / (rep.sum() + dem.sum()) * 100
+        column = contest['margin_pct'].astype(np.float64) - statewide
+        column[contest['rating'] == 0] = np.nan
+        columns.append(column)
+    vectors = np.column_stack(columns)
+
+    # Missing offices take the county's average, so they neither pull it toward the state nor away
+    county_mean = np.nanmean(vectors, axis=1)
+    missing = np.isnan(vectors)
+    vectors[missing] = np.broadcast_to(county_mean[:, None], vectors.shape)[missing]
+    return [contest['contest_id'] for contest in contests], vectors
+
+
+def kmeans(vectors, k, restarts=RESTARTS, seed=SEED, iterations=100):
+    """Best of `restarts` k-means++ runs: (labels, centroids, within-cluster sum of squares)"""
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(restarts):
+        # k-means++: each new centre is drawn with probability proportional to squared distance
+        centroids = [vectors[rng.integers(len(vectors))]]
+        for _ in range(k - 1):
+            d2 = ((vectors[:, None, :] - np.array(centroids)[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+            centroids.append(vectors[rng.choice(len(vectors), p=d2 / d2.sum())])
+        centroids = np.array(centroids)
+
+        for _ in range(iterations):
+            distances = ((vectors[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            labels = distances.argmin(axis=1)
+            updated = np.array([vectors[labels == c].mean(axis=0) if (labels == c).any() else centroids[c]
+                                for c in range(k)])
+            if np.allclose(updated, centroids):
+                break
+            centroids = updated
+        inertia = distances[np.arange(len(vectors)), labels].sum()
+        if best is None or inertia < best[2]:
+            best = (labels, centroids, inertia)
+
+    # Number clusters from most Democratic-leaning to most Republican-leaning centroid
+    labels, centroids, inertia = best
+    order = np.argsort(centroids.mean(axis=1))
+    rank = np.empty(k, dtype=int)
+    rank[order] = np.arange(k)
+    return rank[labels], centroids[order], inertia
+
+
+def nearest_neighbors(vectors, n):
+    """(indexes, RMS distances) of each county's n most similar counties"""
+    distances = np.sqrt(((vectors[:, None, :] - vectors[None, :, :]) ** 2).mean(axis=2))
+    np.fill_diagonal(distances, np.inf)
+    order = np.argsort(distances, axis=1, kind='stable')[:, :n]
+    return order, np.take_along_axis(distances, order, axis=1)
+
+
+def build(data_dir=DATA_DIR, k=CLUSTERS, neighbors=NEIGHBORS, force=False):
+    binary_path = os.path.join(data_dir, BINARY_FILE)
+    output_path = os.path.join(data_dir, OUTPUT_FILE)
+    params = {'k': k, 'neighbors': neighbors, 'restarts': RESTARTS, 'seed': SEED}
+    version = file_version(binary_path)
+
+    if not force and os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('data_version') == version and cached.get('params') == params:
+            print(f"✓ {OUTPUT_FILE} is up to date for data {version}")
+            return cached
+
+    decoded = read_binary(binary_path)
+    contest_ids, vectors = relative_margins(decoded)
+    labels, centroids, inertia = kmeans(vectors, k)
+    similar, distance = nearest_neighbors(vectors, neighbors)
+    feature_ids = decoded['feature_ids'].tolist()
+    names = decoded['feature_names']
+
+    result = {
+        'data_version': version,
+        'params': params,
+        'contests': contest_ids,
+        'feature_ids': feature_ids,
+        # Relative margin (points, positive = more Republican than the state) per contest
+        'centroids': np.round(centroids, 2).tolist(),
+        'clusters': [
+            {'members': [feature_ids[i] for i in np.flatnonzero(labels == c)],
+             'mean_lean': round(float(centroids[c].mean()), 2),
+             'recent_lean': round(float(centroids[c][-1]), 2)}
+            for c in range(k)
+        ],
+        'counties': {
+            str(feature_ids[i]): {
+                'name': names[i],
+                'cluster': int(labels[i]),
+                'similar': [feature_ids[j] for j in similar[i]],
+                'similarity_distance': np.round(distance[i], 2).tolist(),
+            }
+            for i in range(len(feature_ids))
+        },
+        'inertia': round(float(inertia), 1),
+    }
+    with open(output_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(result, f, separators=(',', ':'))
+    os.replace(output_path + '.tmp', output_path)
+
+    print(f"✓ Created: {output_path} ({os.path.getsize(output_path):,} bytes)")
+    for c, cluster in enumerate(result['clusters']):
+        members = [names[feature_ids.index(fid)] for fid in cluster['members']]
+        print(f"  Cluster {c} ({len(members)} counties, mean lean {cluster['mean_lean']:+.1f}): "
+              f"{', '.join(members[:8])}{' ...' if len(members) > 8 else ''}")
+    return result
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Clustering county realignment")
+    print("=" * 60)
+    k = int(sys.argv[sys.argv.index('--k') + 1]) if '--k' in sys.argv else CLUSTERS
+    neighbors = int(sys.argv[sys.argv.index('--neighbors') + 1]) if '--neighbors' in sys.argv else NEIGHBORS
+    build(k=k, neighbors=neighbors, force='--force' in sys.argv)
@@ -0,0 +1,123 @@
+"""
+County groupings for regional rollups, read from regions.json
+Each region set assigns every county to one region, either from explicit county
+lists (counties not listed fall into the set's "remainder" region) or from the
+converters' precinct output (mn_precincts_<year>.json), where a county goes to
+the district holding the largest share of its ballots (the district of
+record). rollup() sums one contest over every region of every set in a single
+grouped reduction
+"""
+
+import json
+import os
+
+import numpy as np
+
+from county_lookup import COUNTIES, resolve_county
+
+REGIONS_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regions.json')
+
+# GEOID -> county index, to place a VTD id in its county
+_COUNTY_OF_GEOID = {county.geoid: county.index for county in COUNTIES}
+
+
+def _listed_regions(key, spec):
+    labels = list(spec['regions'])
+    assignment = [None] * len(COUNTIES)
+    for label_index, (label, names) in enumerate(spec['regions'].items()):
+        for name in names:
+            county = resolve_county(name)
+            if county is None:
+                raise ValueError(f"regions.json {key}: unknown county {name!r}")
+            assignment[county.index] = label_index
+    if None in assignment:
+        labels.append(spec.get('remainder', 'Other'))
+        assignment = [len(labels) - 1 if a is None else a for a in assignment]
+    return labels, assignment
+
+
+def _precinct_regions(key, spec, data_dir, required=False):
+    source = spec['precincts']
+    path = os.path.join(data_dir, source['file'])
+    if not os.path.exists(path):
+        if required:
+            raise FileNotFoundError(f"Region set {key} needs {path}; run convert_outliers.py first")
+        print(f"  ⚠ Region set {key}: {source['file']} not found (run convert_outliers.py), skipped")
+        return None
+
+    # The converter's precinct output already holds each precinct's district and turnout
+    with open(path, 'r', encoding='utf-8') as f:
+        precincts = json.load(f)
+    codes = np.array([code.strip() for code in precincts['districts'][source['district']]])
+    weights = np.asarray(precincts['turnout'][source['weight']], dtype=np.int64)
+    county_idx = np.array([_COUNTY_OF_GEOID.get(vtd_id[:5], -1) for vtd_id in precincts['vtd']], dtype=np.intp)
+
+    keep = (county_idx >= 0) & (codes != '')
+    districts, inverse = np.unique(codes[keep], return_inverse=True)
+    totals = np.zeros((len(COUNTIES), len(districts)), dtype=np.int64)
+    np.add.at(totals, (county_idx[keep], inverse), weights[keep])
+
+    missing = [county.name for county in COUNTIES if not totals[county.index].any()]
+    if missing:
+        raise ValueError(f"Region set {key}: no precincts for {', '.join(missing)}")
+    of_record = districts[totals.argmax(axis=1)].tolist()
+
+    # Only districts that are the district of record for some county get a region
+    districts = sorted(set(of_record), key=lambda d: (len(d), d))
+    labels = [source.get('label', '{}').format(d) for d in districts]
+    return labels, [districts.index(d) for d in of_record]
+
+
+def load_region_sets(data_dir, config_path=REGIONS_CONFIG, required=False):
+    """Region set key -> {'name', 'regions': [labels], 'counties': [region index per county]}
+
+    A set built from precinct output is skipped with a warning when that file
+    is missing, or raises FileNotFoundError with `required`.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    region_sets = {}
+    for key, spec in config.items():
+        built = (_precinct_regions(key, spec, data_dir, required) if 'precincts' in spec
+                 else _listed_regions(key, spec))
+        if built is None:
+            continue
+        labels, assignment = built
+        region_sets[key] = {'name': spec.get('name', key), 'regions': labels, 'counties': assignment}
+    return region_sets
+
+
+# Vote columns of every rollup row
+ROLLUP_COLUMNS = ['dem_votes', 'rep_votes', 'other_votes', 'total_votes']
+
+
+def rollup(votes, region_sets):
+    """
+    Totals of one contest from a (counties x ROLLUP_COLUMNS) vote matrix:
+    statewide, per region of every set, and each county's share of the
+    statewide margin (net Republican votes over the two-party total, in points,
+    positive = Republican; the shares sum to the statewide margin)
+    """
+    # One reduction over all sets: each (set, county) pair adds into its set's region slot
+    offsets = np.cumsum([0] + [len(spec['regions']) for spec in region_sets.values()])
+    groups = np.concatenate([np.asarray(spec['counties']) + offset
+                             for spec, offset in zip(region_sets.values(), offsets)]).astype(np.intp)
+    sums = np.zeros((offsets[-1], votes.shape[1]), dtype=np.int64)
+    np.add.at(sums, groups, np.tile(votes, (len(region_sets), 1)))
+
+    statewide = votes.sum(axis=0)
+    two_party = statewide[0] + statewide[1]
+    contribution = (votes[:, 1] - votes[:, 0]) / two_party * 100 if two_party else np.zeros(len(votes))
+    order = np.argsort(contribution, kind='stable')
+
+    return {
+        'statewide': statewide.tolist(),
+        'regions': {key: sums[start:end].tolist()
+                    for key, start, end in zip(region_sets, offsets[:-1], offsets[1:])},
+        'margin_contribution': np.round(contribution, 3).tolist(),
+        # County indexes from the largest Democratic to the largest Republican contribution,
+        # with the running total of the margin along that order
+        'contribution_order': order.tolist(),
+        'cumulative_contribution': np.round(np.cumsum(contribution[order]), 3).tolist(),
+    }
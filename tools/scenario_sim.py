@@ -0,0 +1,195 @@
+"""
+What-if scenarios for any contest, thousands at a time
+Starts from the county vote totals in mn_county_elections.bin and applies, per
+scenario, turnout scaling per county (or per region of a regions.json set),
+redistribution of third-party votes and a uniform two-party swing. Every
+scenario is a row of (scenarios x 87) matrices, so county winners, tiers and
+the statewide result for all scenarios come out of a few array operations
+
+Usage: python scenario_sim.py CONTEST [--runs N] [--swing PTS] [--swing-sd PTS]
+           [--turnout-sd FRAC] [--turnout-from CONTEST --region-set SET --region NAME]
+           [--third-party FRAC_MOVED --to-dem FRAC]
+  e.g. python scenario_sim.py presidential_2024 --turnout-from presidential_2008
+           --region-set metro --region "Greater Minnesota" --runs 10000 --swing-sd 2
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from election_binary import read_binary
+from regions import load_region_sets
+from tiers import tier_ratings
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+BINARY_FILE = 'mn_county_elections.bin'
+
+
+def load_contest_votes(binary_path):
+    """(county names, contest id -> (87 x 3) float array of dem, rep, other votes)"""
+    decoded = read_binary(binary_path)
+    votes = {
+        contest['contest_id']: np.column_stack([contest['dem_votes'], contest['rep_votes'],
+                                                contest['other_votes']]).astype(np.float64)
+        for contest in decoded['contests']
+    }
+    return decoded['feature_names'], votes
+
+
+def turnout_ratio(base, reference, assignment, regions=None):
+    """
+    Per-county turnout multipliers that give each region the total vote it had
+    in the reference contest. Counties outside `regions` (labels' indexes) keep 1.0
+    """
+    assignment = np.asarray(assignment)
+    groups = assignment.max() + 1
+    base_totals = np.bincount(assignment, weights=base.sum(axis=1), minlength=groups)
+    reference_totals = np.bincount(assignment, weights=reference.sum(axis=1), minlength=groups)
+    ratio = np.divide(reference_totals, base_totals, out=np.ones(groups), where=base_totals > 0)
+    if regions is not None:
+        keep = np.ones(groups, dtype=bool)
+        keep[list(regions)] = False
+        ratio[keep] = 1.0
+    return ratio[assignment]
+
+
+def turnout_draws(rng, sd, shape):
+    """
+    Random turnout multipliers with mean 1 and standard deviation `sd`, drawn
+    lognormal so even far tails stay positive (a normal draw can go below 0
+    and give a county negative votes)
+    """
+    sigma = np.sqrt(np.log1p(sd ** 2))
+    return rng.lognormal(-sigma ** 2 / 2, sigma, shape)
+
+
+def simulate(votes, swing=0.0, turnout=1.0, third_party_moved=0.0, third_party_to_dem=0.5):
+    """
+    Run scenarios on one contest's (87 x 3) dem/rep/other votes.
+
+    swing (points toward Republicans), third_party_moved (share of other votes
+    that go to the two parties) and third_party_to_dem take a scalar or one value
+    per scenario; turnout takes a scalar, one row of 87 multipliers or a
+    (scenarios x 87) matrix. Returns county margins and ratings plus the
+    statewide margin, all with one row per scenario.
+    """
+    swing = np.atleast_1d(np.asarray(swing, dtype=np.float64))
+    moved_share = np.atleast_1d(np.asarray(third_party_moved, dtype=np.float64))
+    to_dem = np.atleast_1d(np.asarray(third_party_to_dem, dtype=np.float64))
+    turnout = np.atleast_2d(np.asarray(turnout, dtype=np.float64))
+    scenarios = max(len(swing), len(moved_share), len(to_dem), turnout.shape[0])
+
+    dem = votes[:, 0] * turnout
+    rep = votes[:, 1] * turnout
+    other = votes[:, 2] * turnout
+    dem, rep, other = (np.broadcast_to(a, (scenarios, len(votes))).copy() for a in (dem, rep, other))
+
+    moved = other * moved_share[:, None]
+    dem += moved * to_dem[:, None]
+    rep += moved * (1 - to_dem[:, None])
+    other -= moved
+
+    # Uniform swing: move swing/2 points of the two-party vote from DFL to Republican
+    two_party = dem + rep
+    shift = np.clip(two_party * swing[:, None] / 200, -rep, dem)
+    dem -= shift
+    rep += shift
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        margins = np.where(two_party > 0, (rep - dem) / two_party * 100, 0.0)
+        statewide = (rep.sum(axis=1) - dem.sum(axis=1)) / two_party.sum(axis=1) * 100
+
+    return {
+        'dem': dem,
+        'rep': rep,
+        'other': other,
+        'margins': margins,
+        'ratings': tier_ratings(np.round(margins, 2)),
+        'statewide_margin': statewide,
+    }
+
+
+def tipping_points(result):
+    """
+    County index holding the median two-party voter of each scenario: with counties
+    ordered from most Democratic to most Republican, the county where the running
+    two-party vote crosses half the statewide total
+    """
+    order = np.argsort(result['margins'], axis=1, kind='stable')
+    two_party = np.take_along_axis(result['dem'] + result['rep'], order, axis=1)
+    cumulative = np.cumsum(two_party, axis=1)
+    half = cumulative[:, -1:] / 2
+    position = (cumulative < half).sum(axis=1)
+    return order[np.arange(len(order)), position]
+
+
+def summarize(result, base_margins, names):
+    """Outcome distribution, county win and flip rates and tipping-point counts"""
+    statewide = result['statewide_margin']
+    rep_wins = result['margins'] > 0
+    base_rep = base_margins > 0
+    tipping = np.bincount(tipping_points(result), minlength=len(names))
+    return {
+        'scenarios': len(statewide),
+        'rep_win_probability': float((statewide > 0).mean()),
+        'statewide_margin_percentiles': dict(zip(
+            ('p5', 'p25', 'p50', 'p75', 'p95'),
+            np.round(np.percentile(statewide, [5, 25, 50, 75, 95]), 2).tolist())),
+        'county_rep_win_probability': dict(zip(names, np.round(rep_wins.mean(axis=0), 3).tolist())),
+        'mean_counties_flipped': float((rep_wins != base_rep).sum(axis=1).mean()),
+        'tipping_points': {names[i]: int(tipping[i]) for i in np.argsort(-tipping) if tipping[i]},
+    }
+
+
+def _arg(name, default=None, cast=float):
+    if name in sys.argv:
+        return cast(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1].startswith('--'):
+        print(__doc__)
+        sys.exit(2)
+    contest_id = sys.argv[1]
+    runs = _arg('--runs', 1, int)
+    rng = np.random.default_rng(_arg('--seed', 0, int))
+
+    names, contests = load_contest_votes(os.path.join(DATA_DIR, BINARY_FILE))
+    if contest_id not in contests:
+        print(f"Unknown contest {contest_id}; choose from {', '.join(contests)}")
+        sys.exit(2)
+    votes = contests[contest_id]
+
+    turnout = np.ones(len(names))
+    reference = _arg('--turnout-from', cast=str)
+    if reference:
+        region_set = load_region_sets(DATA_DIR)[_arg('--region-set', 'metro', str)]
+        region = _arg('--region', cast=str)
+        regions = [region_set['regions'].index(region)] if region else None
+        turnout = turnout_ratio(votes, contests[reference], region_set['counties'], regions)
+    turnout_sd = _arg('--turnout-sd', 0.0)
+    turnout = turnout * turnout_draws(rng, turnout_sd, (runs, len(names))) if turnout_sd else turnout
+
+    swing = _arg('--swing', 0.0)
+    swing_sd = _arg('--swing-sd', 0.0)
+    swings = rng.normal(swing, swing_sd, runs) if swing_sd else np.full(runs, swing)
+
+    start = time.perf_counter()
+    result = simulate(votes, swings, turnout, _arg('--third-party', 0.0), _arg('--to-dem', 0.5))
+    base_margins = simulate(votes)['margins'][0]
+    summary = summarize(result, base_margins, names)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print("=" * 60)
+    print(f"{contest_id}: {summary['scenarios']:,} scenarios in {elapsed:.0f} ms")
+    print("=" * 60)
+    print(f"  Republican win probability: {summary['rep_win_probability']:.1%}")
+    print(f"  Statewide margin (R+): {summary['statewide_margin_percentiles']}")
+    print(f"  Counties flipped on average: {summary['mean_counties_flipped']:.1f}")
+    print(f"  Tipping-point counties: {dict(list(summary['tipping_points'].items())[:5])}")
+    close = sorted(summary['county_rep_win_probability'].items(), key=lambda item: abs(item[1] - 0.5))[:8]
+    print(f"  Closest counties (P[R win]): {', '.join(f'{name} {p:.0%}' for name, p in close)}")
@@ -0,0 +1,137 @@
+"""
+Open raw sources whether they sit on disk plain or compressed
+Paths ending in .gz, .xz or .zst are decompressed as they are read, and a path
+through a .zip archive ("tl_2020_27_county20.zip/tl_2020_27_county20.dbf")
+reads that member straight out of the archive, so raw data can stay
+compressed with no extract step
+"""
+
+import gzip
+import io
+import lzma
+import mmap
+import os
+import zipfile
+
+COMPRESSED_SUFFIXES = ('.gz', '.xz', '.zst')
+
+# Suffixes tried, in order, when looking for a source that may be compressed
+SOURCE_SUFFIXES = ('',) + COMPRESSED_SUFFIXES + ('.zip',)
+
+
+def split_archive(path):
+    """(archive, member) for a path through a .zip file, otherwise (path, None)
+
+    The member is None when the path names the archive itself.
+    """
+    if os.path.isfile(path):
+        return path, None
+    parts = path.replace('\\', '/').split('/')
+    for i in range(len(parts) - 1, 0, -1):
+        archive = '/'.join(parts[:i])
+        if archive.lower().endswith('.zip') and os.path.isfile(archive):
+            return archive, '/'.join(parts[i:])
+    return path, None
+
+
+def _zip_member(archive, member):
+    """Open a zip member; with no member the archive must hold exactly one file"""
+    with zipfile.ZipFile(archive) as zf:
+        if member is None:
+            names = [name for name in zf.namelist() if not name.endswith('/')]
+            if len(names) != 1:
+                raise ValueError(f"{archive} holds {len(names)} files; name one as {archive}/<member>")
+            member = names[0]
+        # The member keeps the archive file open until it is closed itself
+        return zf.open(member)
+
+
+def _zstd_open(path):
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(f"Reading {path} needs the zstandard package (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+
+
+def open_source(path, mode='r', encoding='utf-8', newline=None):
+    """Open a raw source for reading, decompressing on the fly
+
+    mode is 'r' for text (csv-ready, like the built-in open) or 'rb' for bytes.
+    """
+    archive, member = split_archive(path)
+    lower = archive.lower()
+    if lower.endswith('.zip'):
+        raw = _zip_member(archive, member)
+    elif lower.endswith('.gz'):
+        raw = gzip.open(archive, 'rb')
+    elif lower.endswith('.xz'):
+        raw = lzma.open(archive, 'rb')
+    elif lower.endswith('.zst'):
+        raw = _zstd_open(archive)
+    else:
+        raw = open(archive, 'rb')
+
+    if 'b' in mode:
+        return raw
+    return io.TextIOWrapper(io.BufferedReader(raw) if lower.endswith('.zst') else raw,
+                            encoding=encoding, newline=newline)
+
+
+def map_source(path):
+    """Whole source as a read-only buffer: an mmap for plain files, bytes otherwise
+
+    Both support slicing, count() and the buffer protocol, so callers can hand
+    either to numpy. Close the result with close_buffer().
+    """
+    archive, member = split_archive(path)
+    if member is None and not archive.lower().endswith(COMPRESSED_SUFFIXES + ('.zip',)):
+        with open(archive, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with open_source(path, 'rb') as f:
+        return f.read()
+
+
+def close_buffer(buffer):
+    """Close a buffer from map_source (a no-op for bytes)"""
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+
+
+def find_source(data_dir, filename):
+    """Path of a raw source in data_dir, plain or compressed, or None
+
+    Looks for the file as named, then with a compression suffix, then for a
+    same-named .zip archive (`<filename>.zip`). For an archive the .zip path
+    itself is returned; open_source() opens its single member.
+    """
+    base = os.path.join(data_dir, filename)
+    for suffix in SOURCE_SUFFIXES:
+        if os.path.isfile(base + suffix):
+            return base + suffix
+    return None
+
+
+def source_name(path):
+    """File name of a source without its compression suffix, for reports"""
+    archive, member = split_archive(path)
+    name = os.path.basename(member or archive)
+    for suffix in SOURCE_SUFFIXES[1:]:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def gdal_path(path):
+    """GDAL virtual file path, so geopandas can read a shapefile inside an archive"""
+    archive, member = split_archive(path)
+    lower = archive.lower()
+    if lower.endswith('.zip'):
+        return f"/vsizip/{archive}" + (f"/{member}" if member else '')
+    if lower.endswith('.gz'):
+        return f"/vsigzip/{archive}"
+    if lower.endswith(('.xz', '.zst')):
+        raise ValueError(f"GDAL cannot read {archive} in place; store shapefiles as .zip")
+    return path
@@ -0,0 +1,139 @@
+"""
+Global Moran's I and local LISA clusters of county margin for every contest
+Uses the adjacency graph from county_adjacency.py with row-standardized
+weights. The spatial lag of all contests (and of every permutation used for
+the global p-value) is one sparse product over the CSR arrays, so the whole
+history recomputes in about a second. The global I is tested by total
+randomization (all counties reshuffled); each county's local I by conditional
+randomization (the county keeps its value, its neighbours are drawn from the
+other counties). Writes mn_spatial_autocorrelation.json: per contest the
+global I with its permutation p-value and a LISA code per county in feature
+order:
+  0 not significant, 1 High-High (Republican amid Republican),
+  2 Low-Low (DFL amid DFL), 3 High-Low, 4 Low-High
+"""
+
+import json
+import os
+
+import numpy as np
+
+from election_binary import read_binary
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+BINARY_FILE = 'mn_county_elections.bin'
+ADJACENCY_FILE = 'mn_county_adjacency.npz'
+OUTPUT_FILE = 'mn_spatial_autocorrelation.json'
+
+PERMUTATIONS = 999
+SIGNIFICANCE = 0.05
+SEED = 27
+
+LISA_CODES = ['not significant', 'High-High', 'Low-Low', 'High-Low', 'Low-High']
+
+
+def load_adjacency(path):
+    """(indptr, indices, feature_ids) saved by county_adjacency.build_adjacency"""
+    saved = np.load(path)
+    return saved['indptr'], saved['indices'], saved['feature_ids']
+
+
+def spatial_lag(indptr, indices, values):
+    """Row-standardized W @ values for a (counties x columns) matrix, from CSR arrays"""
+    degree = np.diff(indptr)
+    rows = np.repeat(np.arange(len(degree)), degree)
+    lag = np.zeros(values.shape, dtype=np.float64)
+    np.add.at(lag, rows, values[indices])
+    return lag / np.maximum(degree, 1)[:, None]
+
+
+def morans_i(indptr, indices, margins, permutations=PERMUTATIONS, seed=SEED):
+    """
+    Global I, its pseudo p-value and LISA codes for a (counties x contests) margin matrix
+    (counties with no result in a contest are NaN and count as average there). The global
+    p-value comes from total randomization, the local ones from conditional randomization
+    """
+    z = margins - np.nanmean(margins, axis=0)
+    z = np.nan_to_num(z)
+    m2 = (z ** 2).mean(axis=0)
+
+    lag = spatial_lag(indptr, indices, z)
+    local = z * lag / m2
+    global_i = local.mean(axis=0)
+
+    rng = np.random.default_rng(seed)
+    n, contests = z.shape
+
+    # Global I: total randomization, every permutation reshuffles all counties, then one lag for all of them
+    order = np.argsort(rng.random((permutations, n)), axis=1)
+    shuffled = z[order].transpose(1, 0, 2)                # counties x permutations x contests
+    perm_lag = spatial_lag(indptr, indices, shuffled.reshape(n, -1)).reshape(n, permutations, contests)
+    perm_global = (shuffled * perm_lag / m2).mean(axis=0)
+
+    # Local I: conditional randomization, z_i stays put and its neighbours are drawn from the
+    # other n - 1 counties. One draw without replacement per permutation is shared by every
+    # county; indexes at or past i shift up by one to skip county i itself
+    degree = np.diff(indptr)
+    draws = np.argsort(rng.random((permutations, n - 1)), axis=1)[:, :degree.max()]
+    perm_local = np.zeros((n, permutations, contests))
+    for i in np.flatnonzero(degree):
+        neighbours = draws[:, :degree[i]]
+        neighbours = neighbours + (neighbours >= i)
+        perm_local[i] = z[i] * z[neighbours].mean(axis=1) / m2
+
+    global_p = ((np.abs(perm_global) >= np.abs(global_i)).sum(axis=0) + 1) / (permutations + 1)
+    local_p = ((np.abs(perm_local) >= np.abs(local)[:, None, :]).sum(axis=1) + 1) / (permutations + 1)
+
+    codes = np.zeros(z.shape, dtype=np.int8)
+    high, high_lag = z > 0, lag > 0
+    codes[high & high_lag] = 1
+    codes[~high & ~high_lag] = 2
+    codes[high & ~high_lag] = 3
+    codes[~high & high_lag] = 4
+    codes[local_p > SIGNIFICANCE] = 0
+    return global_i, global_p, codes
+
+
+def build(data_dir=DATA_DIR):
+    decoded = read_binary(os.path.join(data_dir, BINARY_FILE))
+    indptr, indices, adjacency_ids = load_adjacency(os.path.join(data_dir, ADJACENCY_FILE))
+    if not np.array_equal(adjacency_ids, decoded['feature_ids']):
+        raise ValueError(f"{ADJACENCY_FILE} and {BINARY_FILE} list different features; rebuild the adjacency")
+
+    contests = decoded['contests']
+    margins = np.column_stack([contest['margin_pct'].astype(np.float64) for contest in contests])
+    margins[np.column_stack([contest['rating'] == 0 for contest in contests])] = np.nan
+    global_i, global_p, codes = morans_i(indptr, indices, margins)
+
+    result = {
+        'feature_ids': decoded['feature_ids'].tolist(),
+        'lisa_codes': LISA_CODES,
+        'permutations': PERMUTATIONS,
+        'contests': {
+            contest['contest_id']: {
+                'morans_i': round(float(global_i[c]), 4),
+                'p_value': round(float(global_p[c]), 4),
+                'lisa': codes[:, c].tolist(),
+            }
+            for c, contest in enumerate(contests)
+        },
+    }
+    output_path = os.path.join(data_dir, OUTPUT_FILE)
+    with open(output_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(result, f, separators=(',', ':'))
+    os.replace(output_path + '.tmp', output_path)
+
+    print(f"✓ Created: {output_path} ({os.path.getsize(output_path):,} bytes)")
+    for contest_id, stats in list(result['contests'].items())[::6]:
+        clusters = np.bincount(stats['lisa'], minlength=len(LISA_CODES))
+        print(f"  {contest_id}: I = {stats['morans_i']:.3f} (p = {stats['p_value']:.3f}), "
+              f"{clusters[1]} High-High, {clusters[2]} Low-Low")
+    return result
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Spatial autocorrelation of county margins")
+    print("=" * 60)
+    build()
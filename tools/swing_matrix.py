@@ -0,0 +1,165 @@
+"""
+Swing and flip matrices between every pair of contests
+Loads every contest's signed county margins from mn_county_elections.bin into
+one (contests x 87) matrix and computes, for all contest pairs at once, the
+per-county swing, which counties flipped party and the largest movers. The
+results are saved so any "contest A -> contest B" comparison is a lookup:
+  mn_swing_matrix.npz   margins, packed flip masks and top movers for every pair
+  mn_swing_summary.json per-pair counts and top movers for the page
+
+Usage: python swing_matrix.py                 (build both files)
+       python swing_matrix.py FROM_ID TO_ID   (e.g. presidential_2008 presidential_2024)
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from election_binary import read_binary
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+BINARY_FILE = 'mn_county_elections.bin'
+MATRIX_FILE = 'mn_swing_matrix.npz'
+SUMMARY_FILE = 'mn_swing_summary.json'
+
+# Largest movers kept per pair and direction
+TOP_MOVERS = 5
+
+
+def load_margins(binary_path):
+    """(contest ids, feature ids, county names, margins) with margins NaN where a county has no result"""
+    decoded = read_binary(binary_path)
+    contests = decoded['contests']
+    margins = np.stack([contest['margin_pct'] for contest in contests]).astype(np.float32)
+    has_result = np.stack([contest['rating'] for contest in contests]) != 0
+    margins[~has_result] = np.nan
+    return ([contest['contest_id'] for contest in contests], decoded['feature_ids'].copy(),
+            decoded['feature_names'], margins)
+
+
+def swing_matrices(margins, top=TOP_MOVERS):
+    """
+    All-pairs swing statistics for a (contests x counties) signed margin matrix
+    (positive = Republican lead). Index [a, b] compares contest a to contest b.
+    """
+    # swing[a, b, k]: how far county k moved toward Republicans from contest a to b
+    swing = margins[None, :, :] - margins[:, None, :]
+    valid = ~np.isnan(swing)
+    party = np.sign(np.nan_to_num(margins))
+    to_rep = (party[:, None, :] < 0) & (party[None, :, :] > 0)
+    to_dem = (party[:, None, :] > 0) & (party[None, :, :] < 0)
+
+    # Missing results become -inf so they sort after every real swing
+    filled_rep = np.where(valid, swing, -np.inf)
+    filled_dem = np.where(valid, -swing, -np.inf)
+    top_rep = np.argsort(-filled_rep, axis=2, kind='stable')[:, :, :top]
+    top_dem = np.argsort(-filled_dem, axis=2, kind='stable')[:, :, :top]
+
+    with np.errstate(invalid='ignore'):
+        toward_rep = (swing > 0).sum(axis=2)
+        toward_dem = (swing < 0).sum(axis=2)
+    compared = valid.sum(axis=2)
+    mean_swing = np.where(compared > 0, np.nansum(swing, axis=2) / np.maximum(compared, 1), np.nan)
+
+    return {
+        'swing': swing,
+        'flip_to_rep': to_rep,
+        'flip_to_dem': to_dem,
+        'flips_to_rep': to_rep.sum(axis=2),
+        'flips_to_dem': to_dem.sum(axis=2),
+        'toward_rep': toward_rep,
+        'toward_dem': toward_dem,
+        'compared': compared,
+        'mean_swing': mean_swing,
+        'top_rep': top_rep,
+        'top_dem': top_dem,
+    }
+
+
+def save_matrices(path, contest_ids, feature_ids, margins, stats):
+    """
+    Compact .npz: flip masks packed to bits, movers as int16. Per-county swing
+    for a pair is one row subtraction of the saved margins, so it is not stored
+    """
+    counties = margins.shape[1]
+    np.savez_compressed(
+        path,
+        contest_ids=np.array(contest_ids),
+        feature_ids=feature_ids,
+        margins=margins,
+        flip_to_rep=np.packbits(stats['flip_to_rep'], axis=2),
+        flip_to_dem=np.packbits(stats['flip_to_dem'], axis=2),
+        counties=np.array(counties),
+        top_rep=stats['top_rep'].astype(np.int16),
+        top_dem=stats['top_dem'].astype(np.int16),
+    )
+
+
+def build_summary(contest_ids, feature_ids, stats):
+    """Per-pair counts and movers as [from][to] matrices; movers are feature ids"""
+    fids = np.asarray(feature_ids)
+    rounded = np.round(np.nan_to_num(stats['mean_swing']), 2)
+    return {
+        'contests': contest_ids,
+        'feature_ids': fids.tolist(),
+        'flips_to_rep': stats['flips_to_rep'].tolist(),
+        'flips_to_dem': stats['flips_to_dem'].tolist(),
+        'toward_rep': stats['toward_rep'].tolist(),
+        'toward_dem': stats['toward_dem'].tolist(),
+        'mean_swing': rounded.tolist(),
+        'top_rep_movers': fids[stats['top_rep']].tolist(),
+        'top_dem_movers': fids[stats['top_dem']].tolist(),
+    }
+
+
+def build(data_dir=DATA_DIR):
+    contest_ids, feature_ids, _, margins = load_margins(os.path.join(data_dir, BINARY_FILE))
+    stats = swing_matrices(margins)
+
+    matrix_path = os.path.join(data_dir, MATRIX_FILE)
+    save_matrices(matrix_path, contest_ids, feature_ids, margins, stats)
+    print(f"✓ Created: {matrix_path} ({os.path.getsize(matrix_path):,} bytes)")
+
+    summary_path = os.path.join(data_dir, SUMMARY_FILE)
+    with open(summary_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(build_summary(contest_ids, feature_ids, stats), f, separators=(',', ':'))
+    os.replace(summary_path + '.tmp', summary_path)
+    print(f"✓ Created: {summary_path} ({os.path.getsize(summary_path):,} bytes)")
+    print(f"  {len(contest_ids)} contests, {len(contest_ids) ** 2} pairs, {margins.shape[1]} counties")
+
+
+def compare(from_id, to_id, data_dir=DATA_DIR):
+    """Print one pair from the saved matrices"""
+    saved = np.load(os.path.join(data_dir, MATRIX_FILE))
+    contest_ids = saved['contest_ids'].tolist()
+    names = read_binary(os.path.join(data_dir, BINARY_FILE))['feature_names']
+    if from_id not in contest_ids or to_id not in contest_ids:
+        raise ValueError(f"Unknown contest; choose from {', '.join(contest_ids)}")
+    a, b = contest_ids.index(from_id), contest_ids.index(to_id)
+    counties = int(saved['counties'])
+    swing = saved['margins'][b] - saved['margins'][a]
+    to_rep = np.unpackbits(saved['flip_to_rep'][a, b])[:counties].astype(bool)
+    to_dem = np.unpackbits(saved['flip_to_dem'][a, b])[:counties].astype(bool)
+
+    print(f"{from_id} -> {to_id}")
+    print(f"  Flipped D -> R: {to_rep.sum()}   Flipped R -> D: {to_dem.sum()}")
+    print(f"  Moved toward R: {(swing > 0).sum()} of {(~np.isnan(swing)).sum()} counties")
+    for label, flipped in (("D -> R", to_rep), ("R -> D", to_dem)):
+        if flipped.any():
+            print(f"  {label}: {', '.join(names[i] for i in np.flatnonzero(flipped))}")
+    for label, order in (("toward R", saved['top_rep'][a, b]), ("toward D", saved['top_dem'][a, b])):
+        movers = [f"{names[i]} ({swing[i]:+.1f})" for i in order if not np.isnan(swing[i])]
+        print(f"  Largest swings {label}: {', '.join(movers)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        compare(sys.argv[1], sys.argv[2])
+        sys.exit(0)
+    print("=" * 60)
+    print("Building swing and flip matrices")
+    print("=" * 60)
+    build()
@@ -0,0 +1,197 @@
+"""
+Dense vote tally shared by the converters
+Votes live in one preallocated int64 array indexed by (county, office, party).
+Office and party keys are interned to integer indexes once, so adding a column
+of precinct votes is a single vectorized update instead of a dict walk per row
+"""
+
+import numpy as np
+
+from county_lookup import COUNTIES, resolve_county
+from precincts import PrecinctTally, district_contest_columns, precinct_key, tally_precinct_columns
+
+# County indexes in name order, the order every output file is written in
+COUNTY_NAME_ORDER = np.array(sorted(range(len(COUNTIES)), key=lambda i: COUNTIES[i].name), dtype=np.intp)
+
+
+def tally_columns(rows, county_of, office_columns, parser, precinct_spec=None):
+    """Read every row once, then add each office/party column to a Tally in bulk
+
+    Vote cells go through `parser` (a vote_parsing.VoteParser) so malformed
+    cells are recorded in its ledger rather than dropped silently. With a
+    `precinct_spec` (precincts.PrecinctSpec) the same columns, plus the
+    spec's district, turnout and district contest columns, are also kept per
+    precinct in tally.precincts; district contests never reach the county tally.
+    """
+    parse = parser.parse
+    county_idx = []
+    precinct_keys = []
+    columns = [(office, party, [], col) for office, parties in office_columns for party, col in parties]
+    district_columns = []
+    turnout = []
+    if precinct_spec is not None:
+        district_columns = [(office, party, [], col)
+                            for office, party, col in district_contest_columns(precinct_spec, office_columns)]
+        turnout = [([], cols) for _, cols in precinct_spec.turnout]
+    # Every vote column read per row, built once rather than per row
+    read_columns = columns + district_columns
+
+    for row in rows:
+        county = county_of(row)
+        if county is None:
+            continue
+        county_idx.append(county.index)
+        if precinct_spec is not None:
+            precinct_keys.append(precinct_key(precinct_spec, row))
+            for values, cols in turnout:
+                values.append(sum(parse(row.get(col), col) for col in cols))
+        for _, _, values, col in read_columns:
+            values.append(parse(row.get(col), col))
+
+    tally = Tally(offices=[office for office, _ in office_columns])
+    for office, party, values, _ in columns:
+        tally.add_column(county_idx, office, party, values)
+
+    if precinct_spec is not None:
+        tally.precincts = tally_precinct_columns(
+            county_idx, precinct_keys, precinct_spec,
+            [(office, party, values) for office, party, values, _ in read_columns],
+            [values for values, _ in turnout])
+    return tally
+
+
+def tally_precinct_rows(rows, parser):
+    """Tally OpenElections precinct rows by (office, district) and (party, candidate)"""
+    tally = Tally()
+    county_idx, office_idx, party_idx, votes = [], [], [], []
+
+    for row in rows:
+        county = resolve_county(row.get('county', '').strip())
+        if county is None:
+            continue
+        office = tally.office_index((row.get('office', '').strip(), row.get('district', '').strip()))
+        county_idx.append(county.index)
+        office_idx.append(office)
+        party_idx.append(tally.party_index(office, (row.get('party', '').strip(), row.get('candidate', '').strip())))
+        votes.append(parser.parse(row.get('votes'), 'votes'))
+
+    tally.add(county_idx, office_idx, party_idx, votes)
+    return tally
+
+
+class Tally:
+    """Vote totals by county, office and party
+
+    Office and party keys can be any sortable hashable value: converters use
+    plain strings, the precinct aggregators use (office, district) and
+    (party, candidate) tuples. Party indexes are local to their office, so the
+    party axis only needs to be as wide as the longest ballot line-up even when
+    parties are keyed by candidate. Capacity grows as new keys are interned.
+    """
+
+    def __init__(self, offices=()):
+        self.offices = {}   # office key -> office index
+        self.parties = []   # office index -> {party key -> party index}
+        self.votes = np.zeros((len(COUNTIES), max(len(offices), 4), 8), dtype=np.int64)
+        # Cells that received a value, so zero-vote rows from the source survive
+        self.seen = np.zeros(self.votes.shape, dtype=bool)
+        # Per-precinct columns (a precincts.PrecinctTally) when the converter asked for them
+        self.precincts = None
+        for office in offices:
+            self.office_index(office)
+
+    def _grow(self, axis, needed):
+        """Double the office or party axis until it holds `needed` keys"""
+        size = self.votes.shape[axis]
+        while size < needed:
+            size *= 2
+        pad = [(0, 0)] * 3
+        pad[axis] = (0, size - self.votes.shape[axis])
+        self.votes = np.pad(self.votes, pad)
+        self.seen = np.pad(self.seen, pad)
+
+    def office_index(self, office):
+        """Intern an office key and return its index"""
+        index = self.offices.get(office)
+        if index is None:
+            index = self.offices[office] = len(self.offices)
+            self.parties.append({})
+            if index >= self.votes.shape[1]:
+                self._grow(1, index + 1)
+        return index
+
+    def party_index(self, office_idx, party):
+        """Intern a party key within an office and return its index"""
+        parties = self.parties[office_idx]
+        index = parties.get(party)
+        if index is None:
+            index = parties[party] = len(parties)
+            if index >= self.votes.shape[2]:
+                self._grow(2, index + 1)
+        return index
+
+    def add(self, county_idx, office_idx, party_idx, votes):
+        """Add votes at the given indexes; each argument is a scalar or an array"""
+        index = (np.asarray(county_idx, dtype=np.intp),
+                 np.asarray(office_idx, dtype=np.intp),
+                 np.asarray(party_idx, dtype=np.intp))
+        np.add.at(self.votes, index, np.asarray(votes, dtype=np.int64))
+        self.seen[index] = True
+
+    def add_column(self, county_idx, office, party, votes):
+        """Add one vote column (aligned with county_idx); non-positive counts are skipped"""
+        votes = np.asarray(votes, dtype=np.int64)
+        positive = votes > 0
+        if positive.any():
+            office_idx = self.office_index(office)
+            self.add(np.asarray(county_idx, dtype=np.intp)[positive],
+                     office_idx, self.party_index(office_idx, party), votes[positive])
+
+    def totals(self):
+        """Total votes per (county, office), the denominator of the pct column"""
+        return self.votes.sum(axis=2)
+
+    def merge(self, other):
+        """Add another tally (e.g. a worker's partial result) into this one"""
+        for office, other_idx in other.offices.items():
+            office_idx = self.office_index(office)
+            parties = other.parties[other_idx]
+            if not parties:
+                continue
+            party_map = np.array([self.party_index(office_idx, key) for key in parties], dtype=np.intp)
+            width = len(party_map)
+            self.votes[:, office_idx, party_map] += other.votes[:, other_idx, :width]
+            self.seen[:, office_idx, party_map] |= other.seen[:, other_idx, :width]
+        if other.precincts is not None:
+            self.precincts = (self.precincts or PrecinctTally()).merge(other.precincts)
+        return self
+
+    def counties(self):
+        """Counties with at least one recorded cell"""
+        return [COUNTIES[i] for i in np.flatnonzero(self.seen.any(axis=(1, 2)))]
+
+    def rows(self):
+        """Yield (county, office, party, votes, office_total) sorted by county name, office and party"""
+        office_keys = sorted(self.offices)
+        if not office_keys:
+            return
+        office_order = np.array([self.offices[key] for key in office_keys], dtype=np.intp)
+
+        # Per office, the party indexes in key order; slots past an office's last
+        # party are padding and masked out by `valid`
+        width = self.votes.shape[2]
+        party_keys = [sorted(self.parties[index]) for index in office_order]
+        party_order = np.full((len(office_keys), width), width - 1, dtype=np.intp)
+        for row, (keys, index) in enumerate(zip(party_keys, office_order)):
+            party_order[row, :len(keys)] = [self.parties[index][key] for key in keys]
+        valid = np.arange(width) < np.array([len(keys) for keys in party_keys])[:, None]
+
+        votes = self.votes[COUNTY_NAME_ORDER][:, office_order]
+        totals = votes.sum(axis=2)
+        votes = np.take_along_axis(votes, party_order[None], axis=2)
+        seen = np.take_along_axis(self.seen[COUNTY_NAME_ORDER][:, office_order], party_order[None], axis=2) & valid
+
+        ci, oi, pi = np.nonzero(seen)
+        for c, o, p, count, total in zip(ci.tolist(), oi.tolist(), pi.tolist(),
+                                         votes[ci, oi, pi].tolist(), totals[ci, oi].tolist()):
+            yield COUNTIES[COUNTY_NAME_ORDER[c]], office_keys[o], party_keys[o][p], count, total
@@ -0,0 +1,90 @@
+"""
+Competitiveness tiers shared by the JSON generator, the binary results file
+and the map palettes
+"""
+
+import numpy as np
+
+# The 15 competitiveness tiers, strongest Republican first. Each tier starts at
+# its bound on the Republican-minus-DFL two-party margin; the bound is
+# inclusive except for Tossup, which only covers |margin| < 0.5.
+# rating is the 1-15 scale of the ratings view (15 = Annihilation Democratic).
+COMPETITIVENESS_TIERS = [
+    # (bound, inclusive, rating, category, party, code, color)
+    (40, True, 1, "Annihilation Republican", "Republican", "R_ANNIHILATION", "#67000d"),
+    (30, True, 2, "Dominant Republican", "Republican", "R_DOMINANT", "#a50f15"),
+    (20, True, 3, "Stronghold Republican", "Republican", "R_STRONGHOLD", "#cb181d"),
+    (10, True, 4, "Safe Republican", "Republican", "R_SAFE", "#ef3b2c"),
+    (5.5, True, 5, "Likely Republican", "Republican", "R_LIKELY", "#fb6a4a"),
+    (1, True, 6, "Lean Republican", "Republican", "R_LEAN", "#fcae91"),
+    (0.5, True, 7, "Tilt Republican", "Republican", "R_TILT", "#fee8c8"),
+    (-0.5, False, 8, "Tossup", "Swing", "TOSSUP", "#f7f7f7"),
+    (-1, True, 9, "Tilt Democratic", "Democratic", "D_TILT", "#e1f5fe"),
+    (-5.5, True, 10, "Lean Democratic", "Democratic", "D_LEAN", "#c6dbef"),
+    (-10, True, 11, "Likely Democratic", "Democratic", "D_LIKELY", "#9ecae1"),
+    (-20, True, 12, "Safe Democratic", "Democratic", "D_SAFE", "#6baed6"),
+    (-30, True, 13, "Stronghold Democratic", "Democratic", "D_STRONGHOLD", "#3182bd"),
+    (-40, True, 14, "Dominant Democratic", "Democratic", "D_DOMINANT", "#08519c"),
+    (None, True, 15, "Annihilation Democratic", "Democratic", "D_ANNIHILATION", "#08306b"),
+]
+
+# Tier code -> 1-15 rating
+TIER_RATINGS = {tier[5]: tier[2] for tier in COMPETITIVENESS_TIERS}
+
+# Colorblind-safe tier colors (orange/blue), as drawn by the map's accessibility mode
+COLORBLIND_COLORS = {
+    "R_ANNIHILATION": "#cc5500", "R_DOMINANT": "#ff6600", "R_STRONGHOLD": "#ff8833",
+    "R_SAFE": "#ffaa55", "R_LIKELY": "#ffcc77", "R_LEAN": "#ffdd99", "R_TILT": "#ffeecc",
+    "TOSSUP": "#cccccc",
+    "D_TILT": "#b3d9ff", "D_LEAN": "#99ccff", "D_LIKELY": "#66b3ff", "D_SAFE": "#3399ff",
+    "D_STRONGHOLD": "#0080ff", "D_DOMINANT": "#0066cc", "D_ANNIHILATION": "#004d99",
+}
+
+# Fill for a feature with no result in a contest
+NO_RESULT_COLOR = "#e0e0e0"
+
+# Map palettes indexed by rating; index 0 is the no-result fill
+PALETTES = {
+    "standard": [NO_RESULT_COLOR] + [tier[6] for tier in COMPETITIVENESS_TIERS],
+    "colorblind": [NO_RESULT_COLOR] + [COLORBLIND_COLORS[tier[5]] for tier in COMPETITIVENESS_TIERS],
+}
+
+
+def get_tier(margin_pct):
+    """Row of COMPETITIVENESS_TIERS for a margin (positive = Republican lead)"""
+    for tier in COMPETITIVENESS_TIERS:
+        bound, inclusive = tier[0], tier[1]
+        if bound is None or margin_pct > bound or (inclusive and margin_pct == bound):
+            return tier
+
+
+def tier_ratings(margins):
+    """1-15 rating for every margin in an array; the vectorized get_tier(m)[2]"""
+    margins = np.asarray(margins, dtype=np.float64)
+    ratings = np.full(margins.shape, COMPETITIVENESS_TIERS[-1][2], dtype=np.int8)
+    # Later (more Democratic) tiers first, so the first matching tier is written last
+    for bound, inclusive, rating, *_ in reversed(COMPETITIVENESS_TIERS[:-1]):
+        hit = (margins >= bound) if inclusive else (margins > bound)
+        ratings[hit] = rating
+    return ratings
+
+
+# One competitiveness dict per tier, shared by every county result in that tier
+COMPETITIVENESS = {
+    code: {
+        "category": category,
+        "party": party,
+        "code": code,
+        "color": color
+    }
+    for _, _, _, category, party, code, color in COMPETITIVENESS_TIERS
+}
+
+
+def get_competitiveness(margin_pct):
+    """
+    Determine competitiveness category based on margin percentage
+    Matches the 15-category legend with Annihilation, Dominant, Stronghold, Safe, Likely, Lean, Tilt, and Tossup
+    The returned dict is shared between results, so treat it as read-only
+    """
+    return COMPETITIVENESS[get_tier(margin_pct)[5]]
@@ -0,0 +1,125 @@
+"""
+Turnout and registration cube from the precinct turnout columns
+Reads the mn_precincts_<year>.json files convert_outliers.py writes in its
+single pass over each raw precinct file and sums their turnout columns (7am
+registration, election-day registration, absentee ballots, ballots cast) to
+statewide, county, congressional, state senate and state house level with
+one grouped reduction per level. Writes mn_turnout_cube.json, per year and
+level one array per measure in key order:
+  turnout_pct     ballots / (7am registrations + election-day registrations)
+  edr_share       election-day registrations / ballots
+  absentee_share  absentee ballots / ballots
+Counties are keyed by feature id (GEOID), districts by number ("8", "10A")
+"""
+
+import glob
+import json
+import os
+import re
+
+import numpy as np
+
+from precincts import district_codes
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+PRECINCT_PATTERN = 'mn_precincts_*.json'
+OUTPUT_FILE = 'mn_turnout_cube.json'
+
+# Counted columns, in output order
+MEASURES = ['registered', 'edr', 'signatures', 'absentee', 'ballots']
+
+# Rate -> (numerator, denominator measures); a rate is written when its inputs were reported
+RATES = {
+    'turnout_pct': (['ballots'], ['registered', 'edr']),
+    'edr_share': (['edr'], ['ballots']),
+    'absentee_share': (['absentee'], ['ballots']),
+}
+
+
+def precinct_levels(precincts):
+    """Level -> group key of every precinct ('' for a blank district); district levels need the file's columns"""
+    vtd = precincts['vtd']
+    levels = {
+        'statewide': np.full(len(vtd), 'Minnesota'),
+        'county': np.array([vtd_id[:5] for vtd_id in vtd]),
+    }
+    for level, codes in district_codes(precincts.get('districts', {})).items():
+        levels[level] = np.array(codes)
+    return levels
+
+
+def _sort_key(key):
+    number = re.match(r'\d+', key)
+    return (int(number.group()) if number else 0, key)
+
+
+def aggregate(counts, groups):
+    """(group keys, groups x measures sums) of a precincts x measures matrix; precincts with no key are left out"""
+    keep = groups != ''
+    keys, inverse = np.unique(groups[keep], return_inverse=True)
+    sums = np.zeros((len(keys), counts.shape[1]), dtype=np.int64)
+    np.add.at(sums, inverse, counts[keep])
+    order = sorted(range(len(keys)), key=lambda i: _sort_key(keys[i]))
+    return keys[order].tolist(), sums[order]
+
+
+def rates(sums, measures):
+    """Rate name -> percentages (one decimal) for the rates whose measures are all present"""
+    column = {name: i for i, name in enumerate(measures)}
+    result = {}
+    for rate, (numerator, denominator) in RATES.items():
+        if not all(name in column for name in numerator + denominator):
+            continue
+        top = sums[:, [column[name] for name in numerator]].sum(axis=1)
+        bottom = sums[:, [column[name] for name in denominator]].sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = np.where(bottom > 0, top / bottom * 100, np.nan)
+        result[rate] = [None if np.isnan(v) else round(float(v), 1) for v in values]
+    return result
+
+
+def year_cube(precincts):
+    """Level -> {'keys', measure -> sums, rate -> percentages} for one precinct file"""
+    measures = [name for name in MEASURES if name in precincts['turnout']]
+    counts = np.column_stack([np.asarray(precincts['turnout'][name], dtype=np.int64) for name in measures])
+    cube = {}
+    for level, groups in precinct_levels(precincts).items():
+        keys, sums = aggregate(counts, groups)
+        if level == 'county':
+            keys = [int(key) for key in keys]
+        entry = {'keys': keys}
+        entry.update({name: sums[:, i].tolist() for i, name in enumerate(measures)})
+        entry.update(rates(sums, measures))
+        cube[level] = entry
+    return cube
+
+
+def build(data_dir=DATA_DIR):
+    cube = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, PRECINCT_PATTERN))):
+        with open(path, 'r', encoding='utf-8') as f:
+            precincts = json.load(f)
+        if not precincts.get('turnout'):
+            print(f"  ⚠ {os.path.basename(path)}: no turnout columns, skipped")
+            continue
+        cube[str(precincts['year'])] = year_cube(precincts)
+
+    output_path = os.path.join(data_dir, OUTPUT_FILE)
+    with open(output_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'measures': MEASURES, 'rates': list(RATES), 'years': cube}, f, separators=(',', ':'))
+    os.replace(output_path + '.tmp', output_path)
+
+    print(f"✓ Created: {output_path} ({os.path.getsize(output_path):,} bytes)")
+    for year, levels in cube.items():
+        state = levels['statewide']
+        shares = ', '.join(f"{rate} {state[rate][0]}%" for rate in RATES if rate in state)
+        print(f"  {year}: {state['ballots'][0]:,} ballots, {shares}")
+    return cube
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Building turnout cube")
+    print("=" * 60)
+    build()
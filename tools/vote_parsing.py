@@ -0,0 +1,84 @@
+"""
+Exception-free vote count parsing with a ledger of rejected cells
+Cells are checked for digits before converting, so dirty columns cost no
+exceptions in the row loop; padding and thousands separators are accepted and
+anything else is counted per (file, column) instead of silently dropped
+"""
+
+from collections import Counter, defaultdict
+
+# Distinct bad values kept per column for the report
+SAMPLES_PER_COLUMN = 5
+
+
+class ParseLedger:
+    """Rejected cells per (file, column) with counts and sample values"""
+
+    def __init__(self, max_rejects=None):
+        self.max_rejects = max_rejects
+        self.rejects = Counter()          # (source, column) -> rejected cells
+        self.samples = defaultdict(list)  # (source, column) -> first distinct bad values
+
+    def parser(self, source):
+        """Parser that records its rejects against `source` (usually the file name)"""
+        return VoteParser(source, self)
+
+    def record(self, source, column, value):
+        key = (source, column)
+        self.rejects[key] += 1
+        samples = self.samples[key]
+        if len(samples) < SAMPLES_PER_COLUMN and value not in samples:
+            samples.append(value)
+
+    def merge(self, other):
+        """Add another ledger's rejects (e.g. from a worker process) to this one"""
+        for key, count in other.rejects.items():
+            self.rejects[key] += count
+            samples = self.samples[key]
+            for value in other.samples[key]:
+                if len(samples) < SAMPLES_PER_COLUMN and value not in samples:
+                    samples.append(value)
+
+    def total(self, source=None):
+        """Rejected cells in one file, or in every file when source is None"""
+        return sum(count for (src, _), count in self.rejects.items() if source is None or src == source)
+
+    def report(self, source=None):
+        """Print rejected cells for one file (or all of them)"""
+        keys = sorted(key for key in self.rejects if source is None or key[0] == source)
+        if not keys:
+            print("  ✓ No rejected vote cells")
+            return
+        print(f"  ⚠ Rejected vote cells: {self.total(source)} in {len(keys)} column(s)")
+        for key in keys:
+            src, column = key
+            label = column if source is not None else f"{src}: {column}"
+            samples = ', '.join(repr(value) for value in self.samples[key])
+            print(f"    {label}: {self.rejects[key]} (e.g. {samples})")
+
+    def exceeded(self):
+        """True when a threshold is set and the run rejected more cells than it allows"""
+        return self.max_rejects is not None and self.total() > self.max_rejects
+
+
+class VoteParser:
+    """Parse vote cells for one file, recording rejects in a ledger"""
+
+    def __init__(self, source, ledger=None):
+        self.source = source
+        self.ledger = ledger if ledger is not None else ParseLedger()
+
+    def parse(self, value, column):
+        """Vote count for a cell; blank cells are 0, malformed cells are 0 and recorded"""
+        if not value:
+            return 0
+        if value.isdigit() and value.isascii():
+            return int(value)
+        # Fixed-width padding and thousands separators ("  1,234 ")
+        text = value.strip().replace(',', '')
+        if not text:
+            return 0
+        if text.isdigit() and text.isascii():
+            return int(text)
+        self.ledger.record(self.source, column, value)
+        return 0